@@ -105,23 +105,31 @@ def angular_distance(ra1, dec1, ra2, dec2):
     ra1r, dec1r, ra2r, dec2r = map(radians, [ra1*15, dec1, ra2*15, dec2])
     return degrees(acos(sin(dec1r)*sin(dec2r) + cos(dec1r)*cos(dec2r)*cos(ra1r - ra2r)))
 
+def _separacao_lua_estrela(context, t):
+    obs, ra, dec = context
+    moon_eq = Equator(Body.Moon, t, obs, True, True)
+    return angular_distance(moon_eq.ra, moon_eq.dec, ra, dec) - 0.25
+
 def ocultacoes_estrelas(obs, tz):
     eventos = []
     t0 = Time.Now()
-    step = 1.0/1440.0  # 1 min
+    step = 1.0/48.0  # 30 min; a Lua leva cerca de 1 h para cruzar 0.5°
     for star_name, ra, dec in STARS:
-        t = t0
-        while t.ut <= t0.ut + 1.0:  # até 24h
-            moon_eq = Equator(Body.Moon, t, obs, True, True)
-            dist = angular_distance(moon_eq.ra, moon_eq.dec, ra, dec)
-            if dist <= 0.25:
-                eventos.append({
-                    "Estrela": star_name,
-                    "Hora": local_time(t, tz),
-                    "Distância°": dist
-                })
-                break
-            t = Time(t.ut + step)
+        context = (obs, ra, dec)
+        inicio = None
+        if _separacao_lua_estrela(context, t0) <= 0.0:
+            inicio = t0
+        else:
+            for evento in SearchAll(_separacao_lua_estrela, context, t0, t0.AddDays(1.0), step):  # até 24h
+                if evento.kind == SearchAllKind.Descending or (evento.kind == SearchAllKind.Minimum and evento.value <= 0.0):
+                    inicio = evento.time
+                    break
+        if inicio is not None:
+            eventos.append({
+                "Estrela": star_name,
+                "Hora": local_time(inicio, tz),
+                "Distância°": _separacao_lua_estrela(context, inicio) + 0.25
+            })
     return eventos
 
 def check_ocultacoes_planetas(body, obs, tz):
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""Precomputed almanac of lunar, seasonal, and eclipse events.
+
+Finding the next full moon or the next eclipse with astronomy.py runs a
+search every time. An application that answers such questions often can
+instead calculate every event of a range of years once, with #BuildAlmanacFile,
+and look them up afterward with #Almanac, which finds events by bisection.
+
+The almanac holds the lunar quarters, perigees and apogees, the Moon's
+ascending and descending nodes, equinoxes and solstices, lunar eclipses,
+global solar eclipses, and transits of Mercury and Venus.
+Eclipses and transits are recorded at their peak.
+
+Lookups outside the years of the file fall back to the search functions
+of astronomy.py, so they return the same events, only more slowly.
+
+The file is a small binary table: a header, the number of events of each
+kind, and then the events of each kind in chronological order, with a
+checksum to detect corruption.
+"""
+
+import bisect
+import enum
+import heapq
+import struct
+import zlib
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import astronomy
+from astronomy import Body, EclipseKind, Time
+
+# ----------------------------------------------------------
+
+@enum.unique
+class AlmanacKind(enum.Enum):
+    """The kinds of events stored in an almanac.
+
+    Values
+    ------
+    NewMoon: The Moon and Sun have the same ecliptic longitude.
+    FirstQuarter: The Moon is 90 degrees east of the Sun.
+    FullMoon: The Moon is opposite the Sun.
+    ThirdQuarter: The Moon is 270 degrees east of the Sun.
+    Perigee: The Moon is closest to the Earth.
+    Apogee: The Moon is farthest from the Earth.
+    AscendingNode: The Moon crosses the ecliptic from south to north.
+    DescendingNode: The Moon crosses the ecliptic from north to south.
+    MarchEquinox: The Sun reaches ecliptic longitude 0.
+    JuneSolstice: The Sun reaches ecliptic longitude 90.
+    SeptemberEquinox: The Sun reaches ecliptic longitude 180.
+    DecemberSolstice: The Sun reaches ecliptic longitude 270.
+    LunarEclipse: The peak of a lunar eclipse.
+    SolarEclipse: The peak of a solar eclipse somewhere on the Earth.
+    MercuryTransit: The peak of a transit of Mercury across the Sun.
+    VenusTransit: The peak of a transit of Venus across the Sun.
+    """
+    NewMoon = 0
+    FirstQuarter = 1
+    FullMoon = 2
+    ThirdQuarter = 3
+    Perigee = 4
+    Apogee = 5
+    AscendingNode = 6
+    DescendingNode = 7
+    MarchEquinox = 8
+    JuneSolstice = 9
+    SeptemberEquinox = 10
+    DecemberSolstice = 11
+    LunarEclipse = 12
+    SolarEclipse = 13
+    MercuryTransit = 14
+    VenusTransit = 15
+
+
+class AlmanacEvent:
+    """An event found in an almanac.
+
+    Attributes
+    ----------
+    kind : AlmanacKind
+        What kind of event it is.
+    time : Time
+        When the event happens. For eclipses and transits, this is the peak.
+    eclipse : EclipseKind or `None`
+        For lunar and solar eclipses, whether the eclipse is penumbral,
+        partial, annular, or total. `None` for all other events.
+    """
+    def __init__(self, kind: AlmanacKind, time: Time, eclipse: Optional[EclipseKind] = None) -> None:
+        self.kind = kind
+        self.time = time
+        self.eclipse = eclipse
+
+    def __repr__(self) -> str:
+        return 'AlmanacEvent({}, {}, {})'.format(self.kind, repr(self.time), self.eclipse)
+
+
+_ALMANAC_MAGIC = b'AEALMNC\x00'
+_ALMANAC_VERSION = 1
+_ALMANAC_HEADER = struct.Struct('<8sIiiI')
+_ALMANAC_COUNTS = struct.Struct('<{}I'.format(len(AlmanacKind)))
+_ALMANAC_RECORD = struct.Struct('<dH')     # UT, eclipse kind
+
+_QUARTER_KINDS = (AlmanacKind.NewMoon, AlmanacKind.FirstQuarter, AlmanacKind.FullMoon, AlmanacKind.ThirdQuarter)
+_SEASON_KINDS = (AlmanacKind.MarchEquinox, AlmanacKind.JuneSolstice, AlmanacKind.SeptemberEquinox, AlmanacKind.DecemberSolstice)
+_TRANSIT_BODIES = {AlmanacKind.MercuryTransit: Body.Mercury, AlmanacKind.VenusTransit: Body.Venus}
+
+# No two events of the same kind are closer together than this many days.
+_SKIP_DAYS = 1.0
+
+# A search that starts at an event may find that event again, a tiny bit later.
+# Events closer than this to the starting time are treated as the same event.
+_SAME_EVENT_DAYS = 1.0 / 86400.0
+
+
+def _YearStart(year: int) -> Time:
+    return Time.Make(year, 1, 1, 0, 0, 0)
+
+
+def _CalcEvents(startTime: Time, stopTime: Time) -> Iterator[AlmanacEvent]:
+    # Every event in [startTime, stopTime), grouped by the search that finds them.
+    for mq in astronomy.MoonQuarters(startTime, stopTime):
+        yield AlmanacEvent(_QUARTER_KINDS[mq.quarter], mq.time)
+    for apsis in astronomy.LunarApsides(startTime, stopTime):
+        kind = AlmanacKind.Perigee if apsis.kind == astronomy.ApsisKind.Pericenter else AlmanacKind.Apogee
+        yield AlmanacEvent(kind, apsis.time)
+    for node in astronomy.MoonNodes(startTime, stopTime):
+        kind = AlmanacKind.AscendingNode if node.kind == astronomy.NodeEventKind.Ascending else AlmanacKind.DescendingNode
+        yield AlmanacEvent(kind, node.time)
+    for season in astronomy.SeasonEvents(startTime.Utc().year, stopTime.Utc().year):
+        yield AlmanacEvent(_SEASON_KINDS[season.season], season.time)
+    # Eclipses and transits are chained the way NextLunarEclipse and the like expect,
+    # so that no search starts at the peak it just found.
+    lunar = astronomy.SearchLunarEclipse(startTime)
+    while lunar.peak.ut < stopTime.ut:
+        yield AlmanacEvent(AlmanacKind.LunarEclipse, lunar.peak, lunar.kind)
+        lunar = astronomy.NextLunarEclipse(lunar.peak)
+    solar = astronomy.SearchGlobalSolarEclipse(startTime)
+    while solar.peak.ut < stopTime.ut:
+        yield AlmanacEvent(AlmanacKind.SolarEclipse, solar.peak, solar.kind)
+        solar = astronomy.NextGlobalSolarEclipse(solar.peak)
+    for (kind, body) in _TRANSIT_BODIES.items():
+        transit = astronomy.SearchTransit(body, startTime)
+        while transit.peak.ut < stopTime.ut:
+            yield AlmanacEvent(kind, transit.peak)
+            transit = astronomy.NextTransit(body, transit.finish)
+
+
+def _LiveNext(kind: AlmanacKind, time: Time) -> AlmanacEvent:
+    # Searches for the first event of the given kind after `time`, without an almanac.
+    def Find(start: Time) -> AlmanacEvent:
+        if kind in _QUARTER_KINDS:
+            found = astronomy.SearchMoonPhase(90.0 * kind.value, start, 40.0)
+            if found is None:
+                raise astronomy.InternalError()
+            return AlmanacEvent(kind, found)
+        if kind in (AlmanacKind.Perigee, AlmanacKind.Apogee):
+            apsis = astronomy.SearchLunarApsis(start)
+            if (apsis.kind == astronomy.ApsisKind.Pericenter) != (kind == AlmanacKind.Perigee):
+                apsis = astronomy.NextLunarApsis(apsis)
+            return AlmanacEvent(kind, apsis.time)
+        if kind in (AlmanacKind.AscendingNode, AlmanacKind.DescendingNode):
+            node = astronomy.SearchMoonNode(start)
+            if (node.kind == astronomy.NodeEventKind.Ascending) != (kind == AlmanacKind.AscendingNode):
+                node = astronomy.NextMoonNode(node)
+            return AlmanacEvent(kind, node.time)
+        if kind in _SEASON_KINDS:
+            longitude = 90.0 * (kind.value - AlmanacKind.MarchEquinox.value)
+            days = ((longitude - astronomy.SunPosition(start).elon) % 360.0) / 0.9856
+            found = astronomy.SearchSunLongitude(longitude, start.AddDays(max(0.0, days - 5.0)), 10.0)
+            if found is None:
+                raise astronomy.InternalError()
+            return AlmanacEvent(kind, found)
+        if kind == AlmanacKind.LunarEclipse:
+            lunar = astronomy.SearchLunarEclipse(start)
+            return AlmanacEvent(kind, lunar.peak, lunar.kind)
+        if kind == AlmanacKind.SolarEclipse:
+            solar = astronomy.SearchGlobalSolarEclipse(start)
+            return AlmanacEvent(kind, solar.peak, solar.kind)
+        transit = astronomy.SearchTransit(_TRANSIT_BODIES[kind], start)
+        return AlmanacEvent(kind, transit.peak)
+
+    event = Find(time)
+    if event.time.ut <= time.ut + _SAME_EVENT_DAYS:
+        event = Find(time.AddDays(_SKIP_DAYS))
+    return event
+
+
+def _CheckOrder(ut: List[float]) -> bool:
+    # Events of one kind must be in chronological order, with no duplicates.
+    return all(ut[i+1] - ut[i] > _SKIP_DAYS for i in range(len(ut) - 1))
+
+
+def BuildAlmanacFile(filename: str, firstYear: int, lastYear: int) -> int:
+    """Calculates every almanac event from `firstYear` through `lastYear` and saves them to a file.
+
+    The events cover the times from the beginning of `firstYear`
+    to the beginning of the year after `lastYear`, in UTC.
+    This takes about 15 seconds per century.
+
+    The file is first written under a temporary name and then renamed,
+    so processes that are reading an older copy of the file are not disturbed.
+
+    Parameters
+    ----------
+    filename : str
+        The name of the file to create or overwrite.
+    firstYear : int
+        The first calendar year to include.
+    lastYear : int
+        The last calendar year to include.
+
+    Returns
+    -------
+    int
+        The number of events written.
+    """
+    if lastYear < firstYear:
+        raise astronomy.Error('Almanac years are out of order.')
+    groups: List[List[Tuple[float, int]]] = [[] for _ in AlmanacKind]
+    startTime = _YearStart(firstYear)
+    stopTime = _YearStart(lastYear + 1)
+    for event in _CalcEvents(startTime, stopTime):
+        if startTime.ut <= event.time.ut < stopTime.ut:
+            groups[event.kind.value].append((event.time.ut, event.eclipse.value if event.eclipse else 0))
+    for group in groups:
+        group.sort()
+        if not _CheckOrder([ut for (ut, _) in group]):
+            raise astronomy.InternalError()
+    body = b''.join(_ALMANAC_RECORD.pack(*record) for group in groups for record in group)
+    header = _ALMANAC_HEADER.pack(_ALMANAC_MAGIC, _ALMANAC_VERSION, firstYear, lastYear, zlib.crc32(body))
+    astronomy._ReplaceFile(filename, [header, _ALMANAC_COUNTS.pack(*(len(group) for group in groups)), body])
+    return sum(len(group) for group in groups)
+
+
+class Almanac:
+    """Answers questions about upcoming events from a file written by #BuildAlmanacFile.
+
+    The whole file is read when the object is created.
+    After that, lookups do not modify the object, so it can be shared between threads.
+
+    Attributes
+    ----------
+    firstYear : int
+        The first calendar year in the file.
+    lastYear : int
+        The last calendar year in the file.
+    startTime : Time
+        The beginning of the time range covered by the file.
+    stopTime : Time
+        The end of the time range covered by the file.
+    """
+    def __init__(self, filename: str) -> None:
+        with open(filename, 'rb') as infile:
+            data = infile.read()
+        prefix = _ALMANAC_HEADER.size + _ALMANAC_COUNTS.size
+        if len(data) < prefix:
+            raise astronomy.EphemerisFileError(filename, 'file is too short')
+        (magic, version, self.firstYear, self.lastYear, checksum) = _ALMANAC_HEADER.unpack_from(data, 0)
+        if magic != _ALMANAC_MAGIC:
+            raise astronomy.EphemerisFileError(filename, 'not an almanac file')
+        if version != _ALMANAC_VERSION:
+            raise astronomy.EphemerisFileError(filename, 'unsupported version {}'.format(version))
+        counts = _ALMANAC_COUNTS.unpack_from(data, _ALMANAC_HEADER.size)
+        size = prefix + sum(counts) * _ALMANAC_RECORD.size
+        if len(data) != size:
+            raise astronomy.EphemerisFileError(filename, 'expected {} bytes but found {}'.format(size, len(data)))
+        if zlib.crc32(data[prefix:]) != checksum:
+            raise astronomy.EphemerisFileError(filename, 'checksum mismatch')
+        self.startTime = _YearStart(self.firstYear)
+        self.stopTime = _YearStart(self.lastYear + 1)
+        # For each kind, a sorted list of UT values and the matching eclipse kinds.
+        self._ut: Dict[AlmanacKind, List[float]] = {}
+        self._eclipse: Dict[AlmanacKind, List[int]] = {}
+        offset = prefix
+        for kind in AlmanacKind:
+            end = offset + counts[kind.value] * _ALMANAC_RECORD.size
+            records = list(_ALMANAC_RECORD.iter_unpack(data[offset:end]))
+            self._ut[kind] = [ut for (ut, _) in records]
+            self._eclipse[kind] = [eclipse for (_, eclipse) in records]
+            if not _CheckOrder(self._ut[kind]):
+                raise astronomy.EphemerisFileError(filename, '{} events are out of order or duplicated'.format(kind.name))
+            offset = end
+
+    def _Event(self, kind: AlmanacKind, index: int) -> AlmanacEvent:
+        eclipse = self._eclipse[kind][index]
+        return AlmanacEvent(kind, Time(self._ut[kind][index]), EclipseKind(eclipse) if eclipse else None)
+
+    def NextEvent(self, kind: AlmanacKind, time: Time) -> AlmanacEvent:
+        """Finds the first event of a given kind after a given time.
+
+        If the answer is not in the file, because `time` is outside
+        the years it covers or the next event is after them,
+        the event is found by searching instead.
+        Either way, an event less than a second after `time`
+        is treated as the one at `time`, and skipped.
+
+        Parameters
+        ----------
+        kind : AlmanacKind
+            The kind of event to find.
+        time : Time
+            The event must happen after this time.
+
+        Returns
+        -------
+        AlmanacEvent
+        """
+        if self.startTime.ut <= time.ut < self.stopTime.ut:
+            ut = self._ut[kind]
+            index = bisect.bisect_right(ut, time.ut + _SAME_EVENT_DAYS)
+            if index < len(ut):
+                return self._Event(kind, index)
+        return _LiveNext(kind, time)
+
+    def EventsBetween(self, startTime: Time, stopTime: Time, kinds: Optional[Iterable[AlmanacKind]] = None) -> List[AlmanacEvent]:
+        """Returns every event in a range of time, in chronological order.
+
+        Parts of the range outside the years covered by the file are searched instead.
+
+        Parameters
+        ----------
+        startTime : Time
+            The beginning of the range, inclusive.
+        stopTime : Time
+            The end of the range, exclusive.
+        kinds : iterable of AlmanacKind, optional
+            The kinds of events to include. By default, all of them.
+
+        Returns
+        -------
+        list of AlmanacEvent
+        """
+        streams = []
+        for kind in (AlmanacKind if kinds is None else kinds):
+            streams.append(self._KindBetween(kind, startTime, stopTime))
+        return list(heapq.merge(*streams, key=lambda event: event.time.ut))
+
+    def _KindBetween(self, kind: AlmanacKind, startTime: Time, stopTime: Time) -> Iterator[AlmanacEvent]:
+        # The events of one kind in [startTime, stopTime): searched before the file, from the file, searched after it.
+        if startTime.ut < self.startTime.ut:
+            yield from _LiveBetween(kind, startTime, self.startTime if stopTime.ut > self.startTime.ut else stopTime)
+        ut = self._ut[kind]
+        first = bisect.bisect_left(ut, max(startTime.ut, self.startTime.ut))
+        last = bisect.bisect_left(ut, min(stopTime.ut, self.stopTime.ut))
+        for index in range(first, last):
+            yield self._Event(kind, index)
+        if stopTime.ut > self.stopTime.ut:
+            yield from _LiveBetween(kind, self.stopTime if startTime.ut < self.stopTime.ut else startTime, stopTime)
+
+
+def _LiveBetween(kind: AlmanacKind, startTime: Time, stopTime: Time) -> Iterator[AlmanacEvent]:
+    # Events of one kind in [startTime, stopTime), found by searching.
+    event = _LiveNext(kind, startTime.AddDays(-2.0 * _SAME_EVENT_DAYS))
+    while event.time.ut < stopTime.ut:
+        if event.time.ut >= startTime.ut:
+            yield event
+        event = _LiveNext(kind, event.time.AddDays(_SKIP_DAYS))
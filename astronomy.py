@@ -32,11 +32,27 @@ https://github.com/cosinekitty/astronomy
 """
 
 import math
+import os
+import sys
+import mmap
+import zlib
 import datetime
 import enum
 import re
 import abc
-from typing import Any, List, Tuple, Optional, Union, Callable, Dict
+import struct
+import tempfile
+import bisect
+import collections
+import threading
+import concurrent.futures
+from typing import Any, List, Tuple, Optional, Union, Callable, Dict, Iterable, Iterator
+
+try:
+    # NumPy is optional. It is needed only by the batch (array) functions.
+    import numpy as _np
+except ImportError:
+    _np = None
 
 def _cbrt(x: float) -> float:
     '''Returns the cube root of x.'''
@@ -258,12 +274,228 @@ def DeltaT_EspenakMeeus(ut: float) -> float:
     return -20 + (32 * u*u)
 
 
-_DeltaT = DeltaT_EspenakMeeus
+def DeltaT_EspenakMeeusArray(ut: Any) -> Any:
+    """Vectorized form of #DeltaT_EspenakMeeus.
+
+    Evaluates the Espenak-Meeus piecewise polynomials over a whole array
+    of times at once, selecting each polynomial's samples with a mask.
+    The results are the same as calling #DeltaT_EspenakMeeus on each element.
+
+    This function requires the NumPy package.
+
+    Parameters
+    ----------
+    ut: array_like
+        The floating point numbers of days since noon UTC on January 1, 2000.
+
+    Returns
+    -------
+    numpy.ndarray
+        The estimated differences TT-UT on the given dates, expressed in seconds.
+    """
+    _RequireNumpy()
+    y = 2000 + ((_np.asarray(ut, dtype=_np.float64) - 14) / _DAYS_PER_TROPICAL_YEAR)
+    dt = _np.empty_like(y)
+
+    m = (y < -500) | (y >= 2150)
+    u = (y[m] - 1820) / 100
+    dt[m] = -20 + (32 * u*u)
+
+    m = (-500 <= y) & (y < 500)
+    u = y[m] / 100
+    u2 = u*u; u3 = u*u2; u4 = u2*u2; u5 = u2*u3; u6 = u3*u3
+    dt[m] = 10583.6 - 1014.41*u + 33.78311*u2 - 5.952053*u3 - 0.1798452*u4 + 0.022174192*u5 + 0.0090316521*u6
+
+    m = (500 <= y) & (y < 1600)
+    u = (y[m] - 1000) / 100
+    u2 = u*u; u3 = u*u2; u4 = u2*u2; u5 = u2*u3; u6 = u3*u3
+    dt[m] = 1574.2 - 556.01*u + 71.23472*u2 + 0.319781*u3 - 0.8503463*u4 - 0.005050998*u5 + 0.0083572073*u6
+
+    m = (1600 <= y) & (y < 1700)
+    u = y[m] - 1600
+    u2 = u*u; u3 = u*u2
+    dt[m] = 120 - 0.9808*u - 0.01532*u2 + u3/7129.0
+
+    m = (1700 <= y) & (y < 1800)
+    u = y[m] - 1700
+    u2 = u*u; u3 = u*u2; u4 = u2*u2
+    dt[m] = 8.83 + 0.1603*u - 0.0059285*u2 + 0.00013336*u3 - u4/1174000
+
+    m = (1800 <= y) & (y < 1860)
+    u = y[m] - 1800
+    u2 = u*u; u3 = u*u2; u4 = u2*u2; u5 = u2*u3; u6 = u3*u3; u7 = u3*u4
+    dt[m] = 13.72 - 0.332447*u + 0.0068612*u2 + 0.0041116*u3 - 0.00037436*u4 + 0.0000121272*u5 - 0.0000001699*u6 + 0.000000000875*u7
+
+    m = (1860 <= y) & (y < 1900)
+    u = y[m] - 1860
+    u2 = u*u; u3 = u*u2; u4 = u2*u2; u5 = u2*u3
+    dt[m] = 7.62 + 0.5737*u - 0.251754*u2 + 0.01680668*u3 - 0.0004473624*u4 + u5/233174
+
+    m = (1900 <= y) & (y < 1920)
+    u = y[m] - 1900
+    u2 = u*u; u3 = u*u2; u4 = u2*u2
+    dt[m] = -2.79 + 1.494119*u - 0.0598939*u2 + 0.0061966*u3 - 0.000197*u4
+
+    m = (1920 <= y) & (y < 1941)
+    u = y[m] - 1920
+    u2 = u*u; u3 = u*u2
+    dt[m] = 21.20 + 0.84493*u - 0.076100*u2 + 0.0020936*u3
+
+    m = (1941 <= y) & (y < 1961)
+    u = y[m] - 1950
+    u2 = u*u; u3 = u*u2
+    dt[m] = 29.07 + 0.407*u - u2/233 + u3/2547
+
+    m = (1961 <= y) & (y < 1986)
+    u = y[m] - 1975
+    u2 = u*u; u3 = u*u2
+    dt[m] = 45.45 + 1.067*u - u2/260 - u3/718
+
+    m = (1986 <= y) & (y < 2005)
+    u = y[m] - 2000
+    u2 = u*u; u3 = u*u2; u4 = u2*u2; u5 = u2*u3
+    dt[m] = 63.86 + 0.3345*u - 0.060374*u2 + 0.0017275*u3 + 0.000651814*u4 + 0.00002373599*u5
+
+    m = (2005 <= y) & (y < 2050)
+    u = y[m] - 2000
+    dt[m] = 62.92 + 0.32217*u + 0.005589*u*u
+
+    m = (2050 <= y) & (y < 2150)
+    ym = y[m]
+    u = (ym-1820)/100
+    dt[m] = -20 + 32*u*u - 0.5628*(2150 - ym)
+
+    return dt
+
+
+class DeltaTTable:
+    """A Delta T model interpolated from a table of observed or predicted values.
+
+    The table is loaded from a local text file, so that applications can use
+    published Delta T values (for example from the IERS or USNO) instead of the
+    Espenak-Meeus polynomials. Between table entries, Delta T is interpolated
+    linearly; the bracketing entries are found by binary search.
+    Outside the range of the table, #DeltaT_EspenakMeeus is used.
+
+    Blank lines and text after a `#` character are ignored.
+    Each remaining line holds either two columns (a decimal year and Delta T in seconds)
+    or four columns (year, month, day, Delta T in seconds), separated by
+    whitespace or commas. Rows may appear in any order, but no two rows may
+    have the same date.
+
+    An instance is callable like #DeltaT_EspenakMeeus, so it can be passed to #SetDeltaTFunction.
+
+    Parameters
+    ----------
+    filename : str
+        The name of the file that contains the Delta T table.
+    """
+    def __init__(self, filename: str) -> None:
+        rows: List[Tuple[float, float, int]] = []
+        with open(filename, 'rt') as infile:
+            for (lnum, line) in enumerate(infile, 1):
+                fields = line.split('#', 1)[0].replace(',', ' ').split()
+                if not fields:
+                    continue
+                try:
+                    if len(fields) == 2:
+                        ut = 14.0 + (float(fields[0]) - 2000.0)*_DAYS_PER_TROPICAL_YEAR
+                    elif len(fields) == 4:
+                        ut = Time.Make(int(fields[0]), int(fields[1]), int(fields[2]), 0, 0, 0.0).ut
+                    else:
+                        raise ValueError()
+                    rows.append((ut, float(fields[-1]), lnum))
+                except ValueError:
+                    raise Error('Invalid Delta T table entry in {} line {}'.format(filename, lnum))
+        if len(rows) < 2:
+            raise Error('Delta T table {} must contain at least 2 entries.'.format(filename))
+        rows.sort()
+        for (prev, row) in zip(rows, rows[1:]):
+            if row[0] == prev[0]:
+                raise Error('Duplicate Delta T table entry in {} lines {} and {}'.format(filename, min(prev[2], row[2]), max(prev[2], row[2])))
+        self.filename = filename
+        self.ut = [r[0] for r in rows]
+        self.dt = [r[1] for r in rows]
+
+    def __repr__(self) -> str:
+        return 'DeltaTTable({})'.format(repr(self.filename))
+
+    def __call__(self, ut: float) -> float:
+        if not (self.ut[0] <= ut <= self.ut[-1]):
+            return DeltaT_EspenakMeeus(ut)
+        i = min(bisect.bisect_right(self.ut, ut), len(self.ut) - 1)
+        frac = (ut - self.ut[i-1]) / (self.ut[i] - self.ut[i-1])
+        return self.dt[i-1] + frac*(self.dt[i] - self.dt[i-1])
+
+    def Array(self, ut: Any) -> Any:
+        """Evaluates the table for an array of times.
+
+        This is the vectorized form of calling the table object.
+        It requires the NumPy package.
+
+        Parameters
+        ----------
+        ut: array_like
+            The floating point numbers of days since noon UTC on January 1, 2000.
+
+        Returns
+        -------
+        numpy.ndarray
+            The estimated differences TT-UT on the given dates, expressed in seconds.
+        """
+        _RequireNumpy()
+        ut = _np.asarray(ut, dtype=_np.float64)
+        xp = _np.asarray(self.ut)
+        fp = _np.asarray(self.dt)
+        i = _np.clip(_np.searchsorted(xp, ut, side='right'), 1, len(xp) - 1)
+        frac = (ut - xp[i-1]) / (xp[i] - xp[i-1])
+        dt = fp[i-1] + frac*(fp[i] - fp[i-1])
+        outside = (ut < xp[0]) | (ut > xp[-1])
+        if _np.any(outside):
+            dt[outside] = DeltaT_EspenakMeeusArray(ut[outside])
+        return dt
+
+
+_DeltaT: Callable[[float], float] = DeltaT_EspenakMeeus
+_DeltaTArray: Optional[Callable[[Any], Any]] = DeltaT_EspenakMeeusArray
+
+
+def SetDeltaTFunction(func: Callable[[float], float], arrayfunc: Optional[Callable[[Any], Any]] = None) -> None:
+    """Selects the Delta T model used to convert between UT and TT.
+
+    By default, Astronomy Engine uses #DeltaT_EspenakMeeus.
+    This function allows an application to substitute a different model,
+    such as a #DeltaTTable loaded from a file of published values.
+    Only #Time objects created after the call are affected.
+
+    Parameters
+    ----------
+    func : function(float) -> float
+        A function that takes a UT day value and returns Delta T = TT-UT in seconds.
+    arrayfunc : function(numpy.ndarray) -> numpy.ndarray, optional
+        The vectorized form of `func`, used by #TimeArray.
+        If omitted, the vectorized form is found automatically for
+        #DeltaT_EspenakMeeus and #DeltaTTable; for any other function,
+        `func` is called once per array element.
+    """
+    global _DeltaT, _DeltaTArray
+    if arrayfunc is None:
+        if func is DeltaT_EspenakMeeus:
+            arrayfunc = DeltaT_EspenakMeeusArray
+        elif isinstance(func, DeltaTTable):
+            arrayfunc = func.Array
+    _DeltaT = func
+    _DeltaTArray = arrayfunc
 
 
 def _TerrestrialTime(ut: float) -> float:
     return ut + _DeltaT(ut) / 86400.0
 
+def _TerrestrialTimeArray(ut: Any) -> Any:
+    if _DeltaTArray is None:
+        return ut + _np.fromiter((_DeltaT(u) for u in ut.tolist()), _np.float64, len(ut)) / 86400.0
+    return ut + _DeltaTArray(ut) / 86400.0
+
 def _UniversalTime(tt: float) -> float:
     # This is the inverse function of _TerrestrialTime.
     # This is an iterative numerical solver, but because
@@ -278,8 +510,243 @@ def _UniversalTime(tt: float) -> float:
             return ut
         dt += err
 
+def _UniversalTimeArray(tt: Any) -> Any:
+    # Vectorized form of _UniversalTime.
+    # Each element stops iterating as soon as it converges,
+    # so only the stragglers are re-evaluated on later passes.
+    # Far from J2000 the spacing of float64 values exceeds the 1.0e-12 tolerance,
+    # so an element can flip between two adjacent values forever.
+    # Cap the number of passes; by then any remaining error is in the last bit.
+    ut = tt - (_TerrestrialTimeArray(tt) - tt)
+    active = _np.arange(len(tt))
+    for _ in range(10):
+        if len(active) == 0:
+            break
+        err = _TerrestrialTimeArray(ut[active]) - tt[active]
+        moving = _np.abs(err) >= 1.0e-12
+        active = active[moving]
+        ut[active] -= err[moving]
+    return ut
+
 _TimeRegex = re.compile(r'^([\+\-]?[0-9]+)-([0-9]{2})-([0-9]{2})(T([0-9]{2}):([0-9]{2})(:([0-9]{2}(\.[0-9]+)?))?Z)?$')
 
+def _ValidTimeFields(month: int, day: int, hour: int, minute: int, second: float) -> bool:
+    return (1 <= month <= 12) and (1 <= day <= 31) and (0 <= hour <= 23) and (0 <= minute <= 59) and (0.0 <= second < 60.0)
+
+def _ParseTimeFields(text: str) -> Tuple[int, int, int, int, int, float]:
+    m = _TimeRegex.match(text)
+    if m is None:
+        raise DateTimeFormatError(text)
+    year = int(m.group(1))
+    month = int(m.group(2))
+    day = int(m.group(3))
+    hour = int(m.group(5) or '0')
+    minute = int(m.group(6) or '0')
+    second = float(m.group(8) or '0')
+    if not _ValidTimeFields(month, day, hour, minute, second):
+        raise DateTimeFormatError(text)
+    return (year, month, day, hour, minute, second)
+
+def _ParseFixedTimes(texts: List[str], length: int) -> Tuple[Any, Any]:
+    # Fast path for many strings of the same length in the layout
+    # 'yyyy-mm-ddThh:mm:ssZ' or 'yyyy-mm-ddThh:mm:ss.fffZ'.
+    # Decodes all of them at once by treating the characters as a 2D array of code points.
+    # Returns a boolean mask of strings that fit the layout, and the decoded fields.
+    codes = _np.array(texts, dtype='<U{}'.format(length)).view(_np.uint32).reshape(-1, length).astype(_np.int64)
+    c = codes - ord('0')
+    ndigits = length - 21       # number of digits after the decimal point
+    digits = [0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15, 17, 18] + list(range(20, length-1))
+    ok = _np.all((c[:, digits] >= 0) & (c[:, digits] <= 9), axis=1)
+    ok &= (codes[:, 4] == ord('-')) & (codes[:, 7] == ord('-')) & (codes[:, 10] == ord('T'))
+    ok &= (codes[:, 13] == ord(':')) & (codes[:, 16] == ord(':')) & (codes[:, -1] == ord('Z'))
+    if ndigits > 0:
+        ok &= (codes[:, 19] == ord('.'))
+    year = 1000*c[:, 0] + 100*c[:, 1] + 10*c[:, 2] + c[:, 3]
+    month = 10*c[:, 5] + c[:, 6]
+    day = 10*c[:, 8] + c[:, 9]
+    hour = 10*c[:, 11] + c[:, 12]
+    minute = 10*c[:, 14] + c[:, 15]
+    # Build the seconds as an integer count of the smallest unit, then divide once,
+    # so the result is rounded exactly like float() rounds the decimal string.
+    units = 10*c[:, 17] + c[:, 18]
+    for k in range(20, length-1):
+        units = 10*units + c[:, k]
+    second = units / (10.0 ** max(0, ndigits))
+    ok &= (month >= 1) & (month <= 12) & (day >= 1) & (day <= 31) & (hour <= 23) & (minute <= 59) & (second < 60.0)
+    return ok, (year, month, day, hour, minute, second)
+
+# Time.ParseMany parses this many strings at a time.
+_PARSE_CHUNK_ROWS = 65536
+
+def _ParseTimeChunk(chunk: List[Any], offset: int, rejected: List[Tuple[int, str]]) -> "TimeArray":
+    # Parses one chunk of the strings given to Time.ParseMany.
+    # `offset` is the index of the chunk's first string in the whole input.
+    # Strings that cannot be parsed are appended to `rejected` and become NaN.
+    # Sort the strings into groups that might fit the fixed layout, keyed by length,
+    # and everything else, which must go through the regular expression.
+    fixed: Dict[int, Tuple[List[int], List[str]]] = {}
+    others: List[Tuple[int, Any]] = []
+    count = 0
+    for text in chunk:
+        if isinstance(text, str) and (20 <= len(text) <= 36) and (len(text) != 21) and text[10] == 'T':
+            group = fixed.setdefault(len(text), ([], []))
+            group[0].append(count)
+            group[1].append(text)
+        else:
+            others.append((count, text))
+        count += 1
+
+    year = _np.full(count, 2000, dtype=_np.int64)
+    month = _np.ones(count, dtype=_np.int64)
+    day = _np.ones(count, dtype=_np.int64)
+    hour = _np.zeros(count, dtype=_np.int64)
+    minute = _np.zeros(count, dtype=_np.int64)
+    second = _np.zeros(count, dtype=_np.float64)
+    for (length, (indexes, strings)) in fixed.items():
+        (ok, f) = _ParseFixedTimes(strings, length)
+        where = _np.asarray(indexes)[ok]
+        year[where] = f[0][ok]
+        month[where] = f[1][ok]
+        day[where] = f[2][ok]
+        hour[where] = f[3][ok]
+        minute[where] = f[4][ok]
+        second[where] = f[5][ok]
+        for i in _np.flatnonzero(~ok).tolist():
+            others.append((indexes[i], strings[i]))
+
+    others.sort(key=lambda pair: pair[0])
+    for (index, text) in others:
+        try:
+            (year[index], month[index], day[index], hour[index], minute[index], second[index]) = _ParseTimeFields(text)
+        except (DateTimeFormatError, TypeError):
+            rejected.append((offset + index, text))
+            second[index] = math.nan
+    return TimeArray.Make(year, month, day, hour, minute, second)
+
+class CacheInfo:
+    """Usage statistics for one of the process-wide calculation caches.
+
+    Astronomy Engine keeps a few bounded, least-recently-used caches of
+    expensive intermediate results, keyed by the time they were calculated for.
+    They allow distinct #Time objects that represent the same instant to share
+    work such as precession/nutation, sidereal time, the Earth's
+    heliocentric position and velocity, and the lunar theory.
+    Call #GetCacheInfo to obtain these statistics.
+
+    Attributes
+    ----------
+    name : string
+        The name of the cache.
+    hits : int
+        The number of lookups that found a cached result.
+    misses : int
+        The number of lookups that had to calculate the result.
+    size : int
+        The number of results currently held in the cache.
+    maxsize : int
+        The maximum number of results the cache holds before discarding the least recently used.
+    """
+    def __init__(self, name: str, hits: int, misses: int, size: int, maxsize: int) -> None:
+        self.name = name
+        self.hits = hits
+        self.misses = misses
+        self.size = size
+        self.maxsize = maxsize
+
+    def __repr__(self) -> str:
+        return 'CacheInfo(name={}, hits={}, misses={}, size={}, maxsize={})'.format(
+            repr(self.name), self.hits, self.misses, self.size, self.maxsize)
+
+
+class _InstantCache:
+    '''A bounded, thread-safe LRU cache of results keyed by time values.'''
+    def __init__(self, name: str, maxsize: int) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.table: collections.OrderedDict = collections.OrderedDict()
+        self.lock = threading.Lock()
+        _InstantCacheTable[name] = self
+
+    def get(self, key: Any) -> Any:
+        with self.lock:
+            value = self.table.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.table.move_to_end(key)
+            return value
+
+    def put(self, key: Any, value: Any) -> None:
+        with self.lock:
+            if self.maxsize > 0:
+                self.table[key] = value
+                if len(self.table) > self.maxsize:
+                    self.table.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.table.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def resize(self, maxsize: int) -> None:
+        with self.lock:
+            self.maxsize = maxsize
+            while len(self.table) > max(0, maxsize):
+                self.table.popitem(last=False)
+
+    def info(self) -> CacheInfo:
+        with self.lock:
+            return CacheInfo(self.name, self.hits, self.misses, len(self.table), self.maxsize)
+
+
+_InstantCacheTable: Dict[str, _InstantCache] = {}
+_EarthTiltCache = _InstantCache('EarthTilt', 4096)
+_SiderealTimeCache = _InstantCache('SiderealTime', 4096)
+
+
+def GetCacheInfo() -> Dict[str, CacheInfo]:
+    """Returns usage statistics for the process-wide calculation caches.
+
+    See #CacheInfo for more information about the caches.
+
+    Returns
+    -------
+    dict
+        A dictionary that maps each cache name to its #CacheInfo.
+    """
+    return dict((name, cache.info()) for (name, cache) in _InstantCacheTable.items())
+
+
+def ResetCaches() -> None:
+    """Empties all the process-wide calculation caches and zeroes their statistics."""
+    for cache in _InstantCacheTable.values():
+        cache.clear()
+
+
+def SetCacheSize(maxsize: int, name: Optional[str] = None) -> None:
+    """Changes the capacity of the process-wide calculation caches.
+
+    Parameters
+    ----------
+    maxsize : int
+        The maximum number of results to keep. A value of 0 disables caching.
+    name : string, optional
+        The name of the cache to resize, as reported by #GetCacheInfo.
+        If omitted, all the caches are resized.
+    """
+    if name is None:
+        for cache in _InstantCacheTable.values():
+            cache.resize(maxsize)
+    elif name in _InstantCacheTable:
+        _InstantCacheTable[name].resize(maxsize)
+    else:
+        raise Error('Unknown cache name: {}'.format(repr(name)))
+
+
 class Time:
     """Represents a date and time used for performing astronomy calculations.
 
@@ -324,6 +791,8 @@ class Time:
         such as the orbits of planets around the Sun, or the Moon around the Earth.
         Historically, Terrestrial Time has also been known by the term *Ephemeris Time* (ET).
     """
+    __slots__ = ('ut', 'tt', '_et', '_st')
+
     def __init__(self, ut : Union[float, str], tt: Optional[float] = None):
         if isinstance(ut, str):
             # Undocumented hack, to make repr(time) reversible.
@@ -378,26 +847,56 @@ class Time:
         -------
         Time
         """
-        m = _TimeRegex.match(text)
-        if m is None:
-            raise DateTimeFormatError(text)
-        year = int(m.group(1))
-        month = int(m.group(2))
-        if not (1 <= month <= 12):
-            raise DateTimeFormatError(text)
-        day = int(m.group(3))
-        if not (1 <= day <= 31):
-            raise DateTimeFormatError(text)
-        hour = int(m.group(5) or '0')
-        if not (0 <= hour <= 23):
-            raise DateTimeFormatError(text)
-        minute = int(m.group(6) or '0')
-        if not (0 <= minute <= 59):
-            raise DateTimeFormatError(text)
-        second = float(m.group(8) or '0')
-        if not (0.0 <= second < 60.0):
-            raise DateTimeFormatError(text)
-        return Time.Make(year, month, day, hour, minute, second)
+        return Time.Make(*_ParseTimeFields(text))
+
+    @staticmethod
+    def ParseMany(texts: Iterable[str]) -> Tuple["TimeArray", List[Tuple[int, str]]]:
+        """Parses a stream of UTC date/time strings into a #TimeArray.
+
+        This is the bulk form of #Time.Parse, intended for ingesting large logs.
+        Strings in the fixed layout `yyyy-mm-ddThh:mm:ssZ` or `yyyy-mm-ddThh:mm:ss.sssZ`
+        are decoded by a fast path that slices the string at known offsets.
+        Any other string is checked with the same rules as #Time.Parse.
+
+        An invalid string does not stop the batch. Instead, its slot in the
+        returned #TimeArray is filled with NaN, and its index and text
+        are reported in the returned list of rejected rows.
+
+        This function requires the NumPy package.
+
+        Parameters
+        ----------
+        texts : iterable of string
+            The date/time strings to parse. The iterable is consumed once, in order.
+            It is read a chunk at a time, so it need not fit in memory as a list of strings.
+
+        Returns
+        -------
+        (TimeArray, list of (int, string))
+            The parsed times, one per input string, and the zero-based
+            index and text of every string that could not be parsed.
+        """
+        _RequireNumpy()
+        # Parse a fixed number of rows at a time, so that only one chunk of
+        # strings is held at once, whatever the length of the input.
+        ut: List[Any] = []
+        tt: List[Any] = []
+        rejected: List[Tuple[int, str]] = []
+        chunk: List[Any] = []
+        offset = 0
+        for text in texts:
+            chunk.append(text)
+            if len(chunk) == _PARSE_CHUNK_ROWS:
+                times = _ParseTimeChunk(chunk, offset, rejected)
+                ut.append(times.ut)
+                tt.append(times.tt)
+                offset += len(chunk)
+                chunk = []
+        if chunk or not ut:
+            times = _ParseTimeChunk(chunk, offset, rejected)
+            ut.append(times.ut)
+            tt.append(times.tt)
+        return TimeArray(_np.concatenate(ut), _np.concatenate(tt)), rejected
 
     @staticmethod
     def Make(year: int, month: int, day: int, hour: int, minute: int, second: float) -> "Time":
@@ -479,6 +978,11 @@ class Time:
         """
         return Time(self.ut + days)
 
+    def __reduce__(self) -> Tuple[Any, Tuple[float, float]]:
+        # Pickle only the two time scales, not the lazy caches,
+        # so that times are cheap to send between processes.
+        return (Time, (self.ut, self.tt))
+
     def __repr__(self) -> str:
         return 'Time(\'' + str(self) + '\')'
 
@@ -541,9 +1045,14 @@ class Time:
     def _etilt(self) -> "_e_tilt":
         # Calculates precession and nutation of the Earth's axis.
         # The calculations are very expensive, so lazy-evaluate and cache
-        # the result inside this Time object.
+        # the result inside this Time object. Other Time objects for the
+        # same instant share the result through the process-wide cache.
         if self._et is None:
-            self._et = _e_tilt(self)
+            et = _EarthTiltCache.get(self.tt)
+            if et is None:
+                et = _e_tilt(self)
+                _EarthTiltCache.put(self.tt, et)
+            self._et = et
         return self._et
 
     def __lt__(self, other: "Time") -> bool:
@@ -569,6 +1078,223 @@ class Time:
         return self.tt >= other.tt
 
 
+class TimeArray:
+    """Represents an ordered collection of dates and times stored as contiguous arrays.
+
+    A `TimeArray` holds the same information as a list of #Time objects,
+    but stores the Universal Time and Terrestrial Time values as two
+    contiguous NumPy `float64` arrays. This makes it practical to work with
+    millions of samples without creating one Python object per sample.
+
+    A `TimeArray` is the input type for the batch variants of the position
+    functions, such as #HelioVectorArray and #GeoVectorArray.
+    Indexing a `TimeArray` with an integer returns the corresponding #Time object.
+    Indexing it with a slice or an index array returns a new `TimeArray`.
+
+    This class requires the NumPy package.
+
+    Parameters
+    ----------
+    ut : array_like
+        UT1/UTC number of days since noon on January 1, 2000, one value per sample.
+    tt : array_like or `None`
+        Terrestrial Time days since noon on January 1, 2000, one value per sample.
+        If `None`, the values are calculated from `ut`.
+
+    Attributes
+    ----------
+    ut : numpy.ndarray
+        The Universal Time of each sample. See #Time for more details.
+    tt : numpy.ndarray
+        The Terrestrial Time of each sample. See #Time for more details.
+    """
+    def __init__(self, ut: Any, tt: Any = None) -> None:
+        _RequireNumpy()
+        self.ut: Any = _np.ascontiguousarray(ut, dtype=_np.float64).reshape(-1)
+        if tt is None:
+            self.tt: Any = _TerrestrialTimeArray(self.ut)
+        else:
+            self.tt = _np.ascontiguousarray(tt, dtype=_np.float64).reshape(-1)
+            if self.tt.shape != self.ut.shape:
+                raise Error('TimeArray ut and tt must have the same length.')
+
+    @staticmethod
+    def FromTerrestrialTime(tt: Any) -> "TimeArray":
+        """Creates a #TimeArray from an array of Terrestrial Time day values.
+
+        Parameters
+        ----------
+        tt : array_like
+            The number of days after the J2000 epoch, one value per sample.
+
+        Returns
+        -------
+        TimeArray
+        """
+        _RequireNumpy()
+        tt = _np.ascontiguousarray(tt, dtype=_np.float64).reshape(-1)
+        return TimeArray(_UniversalTimeArray(tt), tt)
+
+    @staticmethod
+    def FromTimes(times: Iterable[Time]) -> "TimeArray":
+        """Creates a #TimeArray from a sequence of #Time objects.
+
+        Parameters
+        ----------
+        times : iterable of Time
+            The times to be packed into the array.
+
+        Returns
+        -------
+        TimeArray
+        """
+        _RequireNumpy()
+        tlist = list(times)
+        ut = _np.fromiter((t.ut for t in tlist), _np.float64, len(tlist))
+        tt = _np.fromiter((t.tt for t in tlist), _np.float64, len(tlist))
+        return TimeArray(ut, tt)
+
+    @staticmethod
+    def Make(year: Any, month: Any, day: Any, hour: Any = 0, minute: Any = 0, second: Any = 0.0) -> "TimeArray":
+        """Creates a #TimeArray from arrays of UTC calendar dates and times.
+
+        This is the vectorized form of #Time.Make.
+        Each parameter may be an array or a scalar; scalars are broadcast
+        across all the samples.
+
+        Parameters
+        ----------
+        year : array_like of int
+            The UTC year values, e.g. 2019.
+        month : array_like of int
+            The UTC months in the range 1..12.
+        day : array_like of int
+            The UTC days of the month, in the range 1..31.
+        hour : array_like of int
+            The UTC hours, in the range 0..23.
+        minute : array_like of int
+            The UTC minutes, in the range 0..59.
+        second : array_like of float
+            The real-valued UTC seconds, in the range [0, 60).
+
+        Returns
+        -------
+        TimeArray
+        """
+        _RequireNumpy()
+        (y, m, d, hr, mi, sec) = _np.broadcast_arrays(
+            _np.asarray(year, dtype=_np.int64),
+            _np.asarray(month, dtype=_np.int64),
+            _np.asarray(day, dtype=_np.int64),
+            _np.asarray(hour, dtype=_np.float64),
+            _np.asarray(minute, dtype=_np.float64),
+            _np.asarray(second, dtype=_np.float64)
+        )
+        # Same NOVAS-derived formula as Time.Make. All the numerators are
+        # positive for the supported year range, so floor division matches _cdiv.
+        f = (14 - m) // 12
+        y2000 = (
+            (d - 365972956)
+            + (1461 * (y + 1000000 - f)) // 4
+            + (367 * (m - 2 + f*12)) // 12
+            - (3 * ((y + 1000100 - f) // 100)) // 4
+        )
+        ut = (y2000 - 0.5) + (hr / 24.0) + (mi / 1440.0) + (sec / 86400.0)
+        return TimeArray(ut)
+
+    @staticmethod
+    def FromDatetimes(dates: Any) -> "TimeArray":
+        """Creates a #TimeArray from a sequence of datetimes.
+
+        Accepts either a NumPy `datetime64` array or an iterable of
+        Python `datetime` objects. Naive datetimes are assumed to be UTC;
+        timezone-aware datetimes are converted to UTC.
+
+        Parameters
+        ----------
+        dates : array_like of datetime64, or iterable of datetime
+            The UTC dates and times of the samples.
+
+        Returns
+        -------
+        TimeArray
+        """
+        _RequireNumpy()
+        if isinstance(dates, _np.ndarray) and _np.issubdtype(dates.dtype, _np.datetime64):
+            micro = (dates.astype('datetime64[us]') - _np.datetime64('2000-01-01T12:00:00', 'us')).astype(_np.int64)
+            return TimeArray(micro / (_SECONDS_PER_DAY * 1.0e+6))
+        ut = []
+        for d in dates:
+            if d.tzinfo is None:
+                d = d.replace(tzinfo=datetime.timezone.utc)
+            ut.append((d - _EPOCH).total_seconds() / _SECONDS_PER_DAY)
+        return TimeArray(ut)
+
+    @staticmethod
+    def Range(startTime: Time, stopTime: Time, stepDays: float) -> "TimeArray":
+        """Creates a #TimeArray of evenly spaced Universal Times.
+
+        The samples start at `startTime` and advance by `stepDays`
+        up to, but not including, `stopTime`.
+
+        Parameters
+        ----------
+        startTime : Time
+            The first time in the array.
+        stopTime : Time
+            The exclusive upper bound of the array.
+        stepDays : float
+            The positive number of days between consecutive samples.
+
+        Returns
+        -------
+        TimeArray
+        """
+        _RequireNumpy()
+        if stepDays <= 0.0:
+            raise Error('TimeArray.Range step must be positive.')
+        count = max(0, int(math.ceil((stopTime.ut - startTime.ut) / stepDays)))
+        return TimeArray(startTime.ut + stepDays * _np.arange(count, dtype=_np.float64))
+
+    def AddDays(self, days: Any) -> "TimeArray":
+        """Calculates the sum or difference of every time in the array with a number of days.
+
+        This is the vectorized form of #Time.AddDays.
+        The calling object is not modified.
+
+        Parameters
+        ----------
+        days : float or array_like
+            The number of days to add to each time. May be negative, 0, or positive.
+
+        Returns
+        -------
+        TimeArray
+        """
+        return TimeArray(self.ut + days)
+
+    def Times(self) -> List[Time]:
+        """Returns the contents of the array as a list of #Time objects."""
+        return [Time(ut, tt) for (ut, tt) in zip(self.ut.tolist(), self.tt.tolist())]
+
+    def __len__(self) -> int:
+        return len(self.ut)
+
+    def __iter__(self) -> Iterator[Time]:
+        for (ut, tt) in zip(self.ut.tolist(), self.tt.tolist()):
+            yield Time(ut, tt)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, (int, _np.integer)):
+            return Time(float(self.ut[index]), float(self.tt[index]))
+        return TimeArray(self.ut[index], self.tt[index])
+
+    def __repr__(self) -> str:
+        if len(self.ut) == 0:
+            return 'TimeArray([])'
+        return 'TimeArray(len={}, first={}, last={})'.format(len(self.ut), repr(self[0]), repr(self[-1]))
+
+
 class Vector:
     """A Cartesian vector with 3 space coordinates and 1 time coordinate.
 
@@ -587,6 +1313,8 @@ class Vector:
     t : Time
         The date and time at which the coordinate is valid.
     """
+    __slots__ = ('x', 'y', 'z', 't')
+
     def __init__(self, x: float, y: float, z: float, t: Time) -> None:
         self.x = x
         self.y = y
@@ -619,6 +1347,69 @@ class Vector:
         layout = '({:' + coord_format + '}, {:' + coord_format + '}, {:' + coord_format + '}, {})'
         return layout.format(self.x, self.y, self.z, str(self.t))
 
+class VectorArray:
+    """A collection of Cartesian vectors, one for each time in a #TimeArray.
+
+    This is the batch counterpart of #Vector, returned by the batch
+    position functions such as #HelioVectorArray.
+    The coordinates are stored as contiguous NumPy arrays.
+    Indexing a `VectorArray` with an integer returns the corresponding #Vector.
+
+    Attributes
+    ----------
+    x : numpy.ndarray
+        The x-coordinates of the vectors, measured in AU.
+    y : numpy.ndarray
+        The y-coordinates of the vectors, measured in AU.
+    z : numpy.ndarray
+        The z-coordinates of the vectors, measured in AU.
+    t : TimeArray
+        The dates and times at which the coordinates are valid.
+    """
+    def __init__(self, x: Any, y: Any, z: Any, t: TimeArray) -> None:
+        self.x = x
+        self.y = y
+        self.z = z
+        self.t = t
+
+    def __repr__(self) -> str:
+        return 'VectorArray(len={}, t={})'.format(len(self.x), repr(self.t))
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, (int, _np.integer)):
+            return Vector(float(self.x[index]), float(self.y[index]), float(self.z[index]), self.t[index])
+        return VectorArray(self.x[index], self.y[index], self.z[index], self.t[index])
+
+    def Length(self) -> Any:
+        """Returns an array of the lengths of the vectors in AU."""
+        return _np.sqrt(self.x**2 + self.y**2 + self.z**2)
+
+    def __add__(self, other: "VectorArray") -> "VectorArray":
+        return VectorArray(self.x + other.x, self.y + other.y, self.z + other.z, self.t)
+
+    def __sub__(self, other: "VectorArray") -> "VectorArray":
+        return VectorArray(self.x - other.x, self.y - other.y, self.z - other.z, self.t)
+
+    def __neg__(self) -> "VectorArray":
+        return VectorArray(-self.x, -self.y, -self.z, self.t)
+
+
+def _VectorArrayFromFunc(times: TimeArray, func: Callable[[Time], Vector]) -> VectorArray:
+    # Fills a VectorArray by calling a scalar position function once per sample.
+    n = len(times)
+    x = _np.empty(n)
+    y = _np.empty(n)
+    z = _np.empty(n)
+    for (i, time) in enumerate(times):
+        vec = func(time)
+        x[i] = vec.x
+        y[i] = vec.y
+        z[i] = vec.z
+    return VectorArray(x, y, z, times)
+
 class StateVector:
     """A combination of a position vector, a velocity vector, and a time.
 
@@ -644,6 +1435,8 @@ class StateVector:
     t : Time
         The date and time at which the position and velocity vectors are valid.
     """
+    __slots__ = ('x', 'y', 'z', 'vx', 'vy', 'vz', 't')
+
     def __init__(self, x: float, y: float, z: float, vx: float, vy: float, vz: float, t: Time) -> None:
         self.x = x
         self.y = y
@@ -689,6 +1482,67 @@ class StateVector:
         """Extracts a velocity vector from this state vector."""
         return Vector(self.vx, self.vy, self.vz, self.t)
 
+
+class StateVectorArray:
+    """A collection of position and velocity vectors, one for each time in a #TimeArray.
+
+    This is the batch counterpart of #StateVector, returned by the batch
+    state functions such as #HelioStateArray.
+    The components are stored as contiguous NumPy arrays.
+    Indexing a `StateVectorArray` with an integer returns the corresponding #StateVector.
+
+    Attributes
+    ----------
+    x, y, z : numpy.ndarray
+        The position components, measured in AU.
+    vx, vy, vz : numpy.ndarray
+        The velocity components, measured in AU/day.
+    t : TimeArray
+        The dates and times at which the position and velocity vectors are valid.
+    """
+    def __init__(self, x: Any, y: Any, z: Any, vx: Any, vy: Any, vz: Any, t: TimeArray) -> None:
+        self.x = x
+        self.y = y
+        self.z = z
+        self.vx = vx
+        self.vy = vy
+        self.vz = vz
+        self.t = t
+
+    def __repr__(self) -> str:
+        return 'StateVectorArray(len={}, t={})'.format(len(self.x), repr(self.t))
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, (int, _np.integer)):
+            return StateVector(
+                float(self.x[index]), float(self.y[index]), float(self.z[index]),
+                float(self.vx[index]), float(self.vy[index]), float(self.vz[index]),
+                self.t[index]
+            )
+        return StateVectorArray(self.x[index], self.y[index], self.z[index], self.vx[index], self.vy[index], self.vz[index], self.t[index])
+
+    def Position(self) -> VectorArray:
+        """Extracts the position vectors from this state vector array."""
+        return VectorArray(self.x, self.y, self.z, self.t)
+
+    def Velocity(self) -> VectorArray:
+        """Extracts the velocity vectors from this state vector array."""
+        return VectorArray(self.vx, self.vy, self.vz, self.t)
+
+
+def _StateVectorArrayFromFunc(times: TimeArray, func: Callable[[Time], StateVector]) -> StateVectorArray:
+    # Fills a StateVectorArray by calling a scalar state function once per sample.
+    n = len(times)
+    comp = _np.empty((6, n))
+    for (i, time) in enumerate(times):
+        s = func(time)
+        comp[:, i] = (s.x, s.y, s.z, s.vx, s.vy, s.vz)
+    return StateVectorArray(comp[0], comp[1], comp[2], comp[3], comp[4], comp[5], times)
+
+
 @enum.unique
 class Body(enum.Enum):
     """The celestial bodies supported by Astronomy Engine calculations.
@@ -930,6 +1784,15 @@ class NoConvergeError(Error):
     def __init__(self) -> None:
         Error.__init__(self, 'Numeric solver did not converge - please report issue at https://github.com/cosinekitty/astronomy/issues')
 
+class NumpyRequiredError(Error):
+    """The function needs the optional NumPy package, but it is not installed."""
+    def __init__(self) -> None:
+        Error.__init__(self, 'This function requires NumPy. Install it with: pip install numpy')
+
+def _RequireNumpy() -> None:
+    if _np is None:
+        raise NumpyRequiredError()
+
 def PlanetOrbitalPeriod(body: Body) -> float:
     """Returns the average number of days it takes for a planet to orbit the Sun.
 
@@ -1004,6 +1867,9 @@ class Observer:
         self.longitude = longitude
         self.height = height
 
+    def __reduce__(self) -> Tuple[Any, Tuple[float, float, float]]:
+        return (Observer, (self.latitude, self.longitude, self.height))
+
     def __repr__(self) -> str:
         return 'Observer(latitude={}, longitude={}, height={})'.format(self.latitude, self.longitude, self.height)
 
@@ -1044,6 +1910,8 @@ class Spherical:
     dist : float
         Distance in AU.
     """
+    __slots__ = ('lat', 'lon', 'dist')
+
     def __init__(self, lat: float, lon: float, dist: float) -> None:
         self.lat = lat
         self.lon = lon
@@ -1126,8 +1994,30 @@ def _ecl2equ_vec(time: Time, ecl: List[float]) -> List[float]:
     return _obl_ecl2equ_vec(_mean_obliq(time.tt), ecl)
 
 def _precession_rot(time: Time, direction: _PrecessDir) -> RotationMatrix:
+    (xx, yx, zx, xy, yy, zy, xz, yz, zz) = _precession_elements(time.tt, math.sin, math.cos)
+    if direction == _PrecessDir.Into2000:
+        # Perform rotation from other epoch to J2000.0.
+        return RotationMatrix([
+            [xx, yx, zx],
+            [xy, yy, zy],
+            [xz, yz, zz]
+        ])
+
+    if direction == _PrecessDir.From2000:
+        # Perform rotation from J2000.0 to other epoch.
+        return RotationMatrix([
+            [xx, xy, xz],
+            [yx, yy, yz],
+            [zx, zy, zz]
+        ])
+
+    raise Error('Inalid precession direction')
+
+def _precession_elements(tt: Any, sin: Callable[[Any], Any], cos: Callable[[Any], Any]) -> Tuple[Any, ...]:
+    # Calculates the elements of the precession rotation for a TT value, or for
+    # a NumPy array of them when `sin` and `cos` are the NumPy functions.
     eps0 = 84381.406
-    t = time.tt / 36525
+    t = tt / 36525
 
     psia  = (((((-    0.0000000951  * t
                  +    0.000132851 ) * t
@@ -1154,12 +2044,12 @@ def _precession_rot(time: Time, direction: _PrecessDir) -> RotationMatrix:
 
     sa = math.sin(eps0)
     ca = math.cos(eps0)
-    sb = math.sin(-psia)
-    cb = math.cos(-psia)
-    sc = math.sin(-omegaa)
-    cc = math.cos(-omegaa)
-    sd = math.sin(chia)
-    cd = math.cos(chia)
+    sb = sin(-psia)
+    cb = cos(-psia)
+    sc = sin(-omegaa)
+    cc = cos(-omegaa)
+    sd = sin(chia)
+    cd = cos(chia)
 
     xx =  cd * cb - sb * sd * cc
     yx =  cd * sb * ca + sd * cc * cb * ca - sa * sd * sc
@@ -1170,23 +2060,7 @@ def _precession_rot(time: Time, direction: _PrecessDir) -> RotationMatrix:
     xz =  sb * sc
     yz = -sc * cb * ca - sa * cc
     zz = -sc * cb * sa + cc * ca
-    if direction == _PrecessDir.Into2000:
-        # Perform rotation from other epoch to J2000.0.
-        return RotationMatrix([
-            [xx, yx, zx],
-            [xy, yy, zy],
-            [xz, yz, zz]
-        ])
-
-    if direction == _PrecessDir.From2000:
-        # Perform rotation from J2000.0 to other epoch.
-        return RotationMatrix([
-            [xx, xy, xz],
-            [yx, yy, yz],
-            [zx, zy, zz]
-        ])
-
-    raise Error('Inalid precession direction')
+    return (xx, yx, zx, xy, yy, zy, xz, yz, zz)
 
 def _rotate(rot: RotationMatrix, vec: List[float]) -> List[float]:
     return [
@@ -1207,6 +2081,8 @@ def _precession_posvel(state: StateVector, time: Time, direction: _PrecessDir) -
 class _TerseVector:
     '''A 3D vector that is not attached to a time. Used privately inside this module for conciseness.'''
 
+    __slots__ = ('x', 'y', 'z')
+
     def __init__(self, x: float, y: float, z: float) -> None:
         self.x = x
         self.y = y
@@ -1272,6 +2148,8 @@ class Equatorial:
         y = direction of the June solstice,
         z = north.
     """
+    __slots__ = ('ra', 'dec', 'dist', 'vec')
+
     def __init__(self, ra: float, dec: float, dist: float, vec: Vector) -> None:
         self.ra = ra
         self.dec = dec
@@ -1383,12 +2261,16 @@ def SiderealTime(time: Time) -> float:
         The date and time for which to find GAST.
         As an optimization, this function caches the sidereal time value in `time`,
         unless it has already been cached, in which case the cached value is reused.
+        Other #Time objects for the same instant also reuse the value,
+        through a process-wide cache (see #GetCacheInfo).
 
     Returns
     -------
     float
         GAST expressed in sidereal hours.
     """
+    if time._st is None:
+        time._st = _SiderealTimeCache.get((time.ut, time.tt))
     if time._st is None:
         t = time.tt / 36525.0
         eqeq = 15.0 * time._etilt().ee    # Replace with eqeq=0 to get GMST instead of GAST (if we ever need it)
@@ -1403,6 +2285,7 @@ def SiderealTime(time: Time) -> float:
         if gst < 0.0:
             gst += 24.0
         time._st = gst
+        _SiderealTimeCache.put((time.ut, time.tt), gst)
     # return sidereal hours in the half-open range [0, 24).
     return time._st
 
@@ -1512,21 +2395,182 @@ def _spin(angle: float, pos1: List[float]) -> List[float]:
 #----------------------------------------------------------------------------
 # BEGIN CalcMoon
 
-def _Array1(xmin: int, xmax: int) -> Dict[int, complex]:
-    return dict((key, 0j) for key in range(xmin, 1+xmax))
-
-def _Array2(xmin: int, xmax: int, ymin: int, ymax: int) -> Dict[int, Dict[int, complex]]:
-    return dict((key, _Array1(ymin, ymax)) for key in range(xmin, 1+xmax))
-
 class _moonpos:
     def __init__(self, lon: float, lat: float, dist: float) -> None:
         self.geo_eclip_lon = lon
         self.geo_eclip_lat = lat
         self.distance_au = dist
 
-def _CalcMoon(time: Time) -> _moonpos:
-    T = time.tt / 36525
-    ex = _Array2(-6, 6, 1, 4)
+# Searches for eclipses, apsides, and lunar phases evaluate the lunar theory
+# through several different functions for the same instant, so remember recent results.
+# The cached _moonpos objects are shared and must be treated as read-only.
+_MoonPositionCache = _InstantCache('MoonPosition', 4096)
+
+def _CalcMoon(time: Time) -> _moonpos:
+    moon = _MoonPositionCache.get(time.tt)
+    if moon is None:
+        moon = _CalcMoonTheory(time)
+        _MoonPositionCache.put(time.tt, moon)
+    return moon
+
+# The solar perturbation terms of the lunar theory.
+# Each row is (DLAM, DS, GAM1C, SINPI, p, q, r, s): the coefficients of the
+# perturbations in longitude, in the argument of latitude, in the latitude
+# factor, and in the parallax, for the argument p*L + q*LS + r*F + s*D.
+_MoonSolarTerms: List[Tuple[float, float, float, float, int, int, int, int]] = [
+    (    13.902,      14.06,     -0.001,     0.2607,  0,  0,  0,  4),
+    (     0.403,      -4.01,      0.394,     0.0023,  0,  0,  0,  3),
+    (  2369.912,    2373.36,      0.601,    28.2333,  0,  0,  0,  2),
+    (  -125.154,    -112.79,     -0.725,    -0.9781,  0,  0,  0,  1),
+    (     1.979,       6.98,     -0.445,     0.0433,  1,  0,  0,  4),
+    (   191.953,     192.72,      0.029,     3.0861,  1,  0,  0,  2),
+    (    -8.466,     -13.51,      0.455,    -0.1093,  1,  0,  0,  1),
+    (   22639.5,   22609.07,      0.079,   186.5398,  1,  0,  0,  0),
+    (    18.609,       3.59,     -0.094,     0.0118,  1,  0,  0, -1),
+    ( -4586.465,   -4578.13,     -0.077,    34.3117,  1,  0,  0, -2),
+    (     3.215,       5.44,      0.192,    -0.0386,  1,  0,  0, -3),
+    (   -38.428,     -38.64,      0.001,     0.6008,  1,  0,  0, -4),
+    (    -0.393,      -1.43,     -0.092,     0.0086,  1,  0,  0, -6),
+    (    -0.289,      -1.59,      0.123,    -0.0053,  0,  1,  0,  4),
+    (    -24.42,      -25.1,       0.04,       -0.3,  0,  1,  0,  2),
+    (    18.023,      17.93,      0.007,     0.1494,  0,  1,  0,  1),
+    (  -668.146,    -126.98,     -1.302,    -0.3997,  0,  1,  0,  0),
+    (      0.56,       0.32,     -0.001,    -0.0037,  0,  1,  0, -1),
+    (  -165.145,    -165.06,      0.054,     1.9178,  0,  1,  0, -2),
+    (    -1.877,      -6.46,     -0.416,     0.0339,  0,  1,  0, -4),
+    (     0.213,       1.02,     -0.074,     0.0054,  2,  0,  0,  4),
+    (    14.387,      14.78,     -0.017,     0.2833,  2,  0,  0,  2),
+    (    -0.586,       -1.2,      0.054,      -0.01,  2,  0,  0,  1),
+    (   769.016,     767.96,      0.107,    10.1657,  2,  0,  0,  0),
+    (      1.75,       2.01,     -0.018,     0.0155,  2,  0,  0, -1),
+    (  -211.656,    -152.53,      5.679,    -0.3039,  2,  0,  0, -2),
+    (     1.225,       0.91,      -0.03,    -0.0088,  2,  0,  0, -3),
+    (   -30.773,     -34.07,     -0.308,     0.3722,  2,  0,  0, -4),
+    (     -0.57,       -1.4,     -0.074,     0.0109,  2,  0,  0, -6),
+    (    -2.921,     -11.75,      0.787,    -0.0484,  1,  1,  0,  2),
+    (     1.267,       1.52,     -0.022,     0.0164,  1,  1,  0,  1),
+    (  -109.673,    -115.18,      0.461,     -0.949,  1,  1,  0,  0),
+    (  -205.962,    -182.36,      2.056,     1.4437,  1,  1,  0, -2),
+    (     0.233,       0.36,      0.012,    -0.0025,  1,  1,  0, -3),
+    (    -4.391,      -9.66,     -0.471,     0.0673,  1,  1,  0, -4),
+    (     0.283,       1.53,     -0.111,      0.006,  1, -1,  0,  4),
+    (    14.577,       31.7,      -1.54,     0.2302,  1, -1,  0,  2),
+    (   147.687,     138.76,      0.679,     1.1528,  1, -1,  0,  0),
+    (    -1.089,       0.55,      0.021,        0.0,  1, -1,  0, -1),
+    (    28.475,      23.59,     -0.443,    -0.2257,  1, -1,  0, -2),
+    (    -0.276,      -0.38,     -0.006,    -0.0036,  1, -1,  0, -3),
+    (     0.636,       2.27,      0.146,    -0.0102,  1, -1,  0, -4),
+    (    -0.189,      -1.68,      0.131,    -0.0028,  0,  2,  0,  2),
+    (    -7.486,      -0.66,     -0.037,    -0.0086,  0,  2,  0,  0),
+    (    -8.096,     -16.35,      -0.74,     0.0918,  0,  2,  0, -2),
+    (    -5.741,      -0.04,        0.0,    -0.0009,  0,  0,  2,  2),
+    (     0.255,        0.0,        0.0,        0.0,  0,  0,  2,  1),
+    (  -411.608,       -0.2,        0.0,    -0.0124,  0,  0,  2,  0),
+    (     0.584,       0.84,        0.0,     0.0071,  0,  0,  2, -1),
+    (   -55.173,     -52.14,        0.0,    -0.1052,  0,  0,  2, -2),
+    (     0.254,       0.25,        0.0,    -0.0017,  0,  0,  2, -3),
+    (     0.025,      -1.67,        0.0,     0.0031,  0,  0,  2, -4),
+    (      1.06,       2.96,     -0.166,     0.0243,  3,  0,  0,  2),
+    (    36.124,      50.64,       -1.3,     0.6215,  3,  0,  0,  0),
+    (   -13.193,      -16.4,      0.258,    -0.1187,  3,  0,  0, -2),
+    (    -1.187,      -0.74,      0.042,     0.0074,  3,  0,  0, -4),
+    (    -0.293,      -0.31,     -0.002,     0.0046,  3,  0,  0, -6),
+    (     -0.29,      -1.45,      0.116,    -0.0051,  2,  1,  0,  2),
+    (    -7.649,     -10.56,      0.259,    -0.1038,  2,  1,  0,  0),
+    (    -8.627,      -7.59,      0.078,    -0.0192,  2,  1,  0, -2),
+    (     -2.74,      -2.54,      0.022,     0.0324,  2,  1,  0, -4),
+    (     1.181,       3.32,     -0.212,     0.0213,  2, -1,  0,  2),
+    (     9.703,      11.67,     -0.151,     0.1268,  2, -1,  0,  0),
+    (    -0.352,      -0.37,      0.001,    -0.0028,  2, -1,  0, -1),
+    (    -2.494,      -1.17,     -0.003,    -0.0017,  2, -1,  0, -2),
+    (      0.36,        0.2,     -0.012,    -0.0043,  2, -1,  0, -4),
+    (    -1.167,      -1.25,      0.008,    -0.0106,  1,  2,  0,  0),
+    (    -7.412,      -6.12,      0.117,     0.0484,  1,  2,  0, -2),
+    (    -0.311,      -0.65,     -0.032,     0.0044,  1,  2,  0, -4),
+    (     0.757,       1.82,     -0.105,     0.0112,  1, -2,  0,  2),
+    (      2.58,       2.32,      0.027,     0.0196,  1, -2,  0,  0),
+    (     2.533,        2.4,     -0.014,    -0.0212,  1, -2,  0, -2),
+    (    -0.344,      -0.57,     -0.025,     0.0036,  0,  3,  0, -2),
+    (    -0.992,      -0.02,        0.0,        0.0,  1,  0,  2,  2),
+    (   -45.099,      -0.02,        0.0,     -0.001,  1,  0,  2,  0),
+    (    -0.179,      -9.52,        0.0,    -0.0833,  1,  0,  2, -2),
+    (    -0.301,      -0.33,        0.0,     0.0014,  1,  0,  2, -4),
+    (    -6.382,      -3.37,        0.0,    -0.0481,  1,  0, -2,  2),
+    (    39.528,      85.13,        0.0,    -0.7136,  1,  0, -2,  0),
+    (     9.366,       0.71,        0.0,    -0.0112,  1,  0, -2, -2),
+    (     0.202,       0.02,        0.0,        0.0,  1,  0, -2, -4),
+    (     0.415,        0.1,        0.0,     0.0013,  0,  1,  2,  0),
+    (    -2.152,      -2.26,        0.0,    -0.0066,  0,  1,  2, -2),
+    (     -1.44,       -1.3,        0.0,     0.0014,  0,  1, -2,  2),
+    (     0.384,      -0.04,        0.0,        0.0,  0,  1, -2, -2),
+    (     1.938,        3.6,     -0.145,     0.0401,  4,  0,  0,  0),
+    (    -0.952,      -1.58,      0.052,     -0.013,  4,  0,  0, -2),
+    (    -0.551,      -0.94,      0.032,    -0.0097,  3,  1,  0,  0),
+    (    -0.482,      -0.57,      0.005,    -0.0045,  3,  1,  0, -2),
+    (     0.681,       0.96,     -0.026,     0.0115,  3, -1,  0,  0),
+    (    -0.297,      -0.27,      0.002,    -0.0009,  2,  2,  0, -2),
+    (     0.254,       0.21,     -0.003,        0.0,  2, -2,  0, -2),
+    (     -0.25,      -0.22,      0.004,     0.0014,  1,  3,  0, -2),
+    (    -3.996,        0.0,        0.0,     0.0004,  2,  0,  2,  0),
+    (     0.557,      -0.75,        0.0,     -0.009,  2,  0,  2, -2),
+    (    -0.459,      -0.38,        0.0,    -0.0053,  2,  0, -2,  2),
+    (    -1.298,       0.74,        0.0,     0.0004,  2,  0, -2,  0),
+    (     0.538,       1.14,        0.0,    -0.0141,  2,  0, -2, -2),
+    (     0.263,       0.02,        0.0,        0.0,  1,  1,  2,  0),
+    (     0.426,       0.07,        0.0,    -0.0006,  1,  1, -2, -2),
+    (    -0.304,       0.03,        0.0,     0.0003,  1, -1,  2,  0),
+    (    -0.372,      -0.19,        0.0,    -0.0027,  1, -1, -2,  2),
+    (     0.418,        0.0,        0.0,        0.0,  0,  0,  4,  0),
+    (     -0.33,      -0.04,        0.0,        0.0,  3,  0,  2,  0),
+]
+
+# The N terms of the latitude, as (coefficient, p, q, r, s).
+_MoonLatitudeTerms: List[Tuple[float, int, int, int, int]] = [
+    ( -526.069,  0,  0,  1, -2),
+    (   -3.352,  0,  0,  1, -4),
+    (   44.297,  1,  0,  1, -2),
+    (     -6.0,  1,  0,  1, -4),
+    (   20.599, -1,  0,  1,  0),
+    (  -30.598, -1,  0,  1, -2),
+    (  -24.649, -2,  0,  1,  0),
+    (     -2.0, -2,  0,  1, -2),
+    (  -22.571,  0,  1,  1, -2),
+    (   10.985,  0, -1,  1, -2),
+]
+
+# Additional long-period terms of the longitude, as (coefficient, a, b) for coefficient*Sine(a + b*T).
+_MoonLongitudeTerms: List[Tuple[float, float, float]] = [
+    (0.82, 0.7736,   -62.5512), (0.31, 0.0466,  -125.1025),
+    (0.35, 0.5785,   -25.1042), (0.66, 0.4591, +1335.8075),
+    (0.64, 0.3130,   -91.5680), (1.14, 0.1480, +1331.2898),
+    (0.21, 0.5918, +1056.5859), (0.44, 0.5784, +1322.8595),
+    (0.24, 0.2275,    -5.7374), (0.28, 0.2965,    +2.6929),
+    (0.33, 0.3132,    +6.3368),
+]
+
+# _CalcMoonTheory keeps the powers ex[p][i] = (FAC[i] * exp(j*ARG[i]))**p, for p = -6..+6
+# and i = 1..4, in one flat list of complex numbers. A row whose multiple is zero
+# refers to the constant 1 stored at ex[0][1], so every row is a product of four factors.
+_MOON_EX_SIZE = 4 * 13
+
+def _MoonExSlot(p: int, i: int) -> int:
+    if p == 0:
+        i = 1
+    return 13*(i - 1) + (p + 6)
+
+_MoonSolarTable = [
+    (dlam, ds, gam1c, sinpi, _MoonExSlot(p, 1), _MoonExSlot(q, 2), _MoonExSlot(r, 3), _MoonExSlot(s, 4))
+    for (dlam, ds, gam1c, sinpi, p, q, r, s) in _MoonSolarTerms
+]
+
+_MoonLatitudeTable = [
+    (coeff, _MoonExSlot(p, 1), _MoonExSlot(q, 2), _MoonExSlot(r, 3), _MoonExSlot(s, 4))
+    for (coeff, p, q, r, s) in _MoonLatitudeTerms
+]
+
+def _CalcMoonTheory(time: Time) -> _moonpos:
+    T = time.tt / 36525
+    ex = [0j] * _MOON_EX_SIZE
 
     def Sine(phi: float) -> float:
         return math.sin(_PI2 * phi)
@@ -1572,737 +2616,297 @@ def _CalcMoon(time: Time) -> _moonpos:
         else:
             ARG=D; MAX=6; FAC=1.0
 
-        ex[0][I] = complex(1, 0)
-        ex[1][I] = complex(FAC * math.cos(ARG), FAC * math.sin(ARG))
+        base = 13*(I - 1) + 6
+        ex[base] = complex(1, 0)
+        ex[base+1] = complex(FAC * math.cos(ARG), FAC * math.sin(ARG))
 
         J = 2
         while J <= MAX:
-            ex[J][I] = ex[J-1][I] * ex[1][I]
+            ex[base+J] = ex[base+J-1] * ex[base+1]
             J += 1
 
         J = 1
         while J <= MAX:
-            ex[-J][I] = ex[J][I].conjugate()
+            ex[base-J] = ex[base+J].conjugate()
             J += 1
 
         I += 1
 
+    for (dlam, ds, gam1c, sinpi, a, b, c, d) in _MoonSolarTable:
+        z = ex[a] * ex[b] * ex[c] * ex[d]
+        DLAM  += dlam * z.imag
+        DS    += ds * z.imag
+        GAM1C += gam1c * z.real
+        SINPI += sinpi * z.real
+
+    N = sum(coeff * (ex[a] * ex[b] * ex[c] * ex[d]).imag for (coeff, a, b, c, d) in _MoonLatitudeTable)
+
+    DLAM += sum(coeff*Sine(a + b*T) for (coeff, a, b) in _MoonLongitudeTerms)
+    S = F + DS/_ARC
+    lat_seconds = (1.000002708 + 139.978*DGAM)*(18518.511+1.189+GAM1C)*math.sin(S) - 6.24*math.sin(3*S) + N
+    return _moonpos(
+        _PI2 * Frac((L0+DLAM/_ARC) / _PI2),
+        (math.pi / (180 * 3600)) * lat_seconds,
+        (_ARC * _EARTH_EQUATORIAL_RADIUS_AU) / (0.999953253 * SINPI)
+    )
+
+def _MoonSineRate(T: float, a: float, b: float) -> Tuple[float, float]:
+    # Returns Sine(a + b*T) and its derivative with respect to T.
+    phi = _PI2 * (a + b*T)
+    return (math.sin(phi), _PI2 * b * math.cos(phi))
+
+def _MoonTheoryPowers(T: float) -> Tuple[List[complex], List[complex], float, float, float, float, float, float]:
+    # The part of _CalcMoonTheoryRates shared with _MoonDistanceRates: the fundamental arguments
+    # at T Julian centuries after J2000, the powers ex[] of their unit phasors, and the relative
+    # rates w[] of those powers. Also returns L0, F, DGAM and their rates with respect to T.
+    ex = [0j] * _MOON_EX_SIZE
+    w = [0j] * _MOON_EX_SIZE
+
+    def Frac(x: float) -> float:
+        return x - math.floor(x)
+
+    T2 = T*T
+    (S1, dS1) = _MoonSineRate(T, 0.19833, +0.05611)
+    (S2, dS2) = _MoonSineRate(T, 0.27869, +0.04508)
+    (S3, dS3) = _MoonSineRate(T, 0.16827, -0.36903)
+    (S4, dS4) = _MoonSineRate(T, 0.34734, -5.37261)
+    (S5, dS5) = _MoonSineRate(T, 0.10498, -5.37899)
+    (S6, dS6) = _MoonSineRate(T, 0.42681, -0.41855)
+    (S7, dS7) = _MoonSineRate(T, 0.14943, -5.37511)
+    DL0 = 0.84*S1+0.31*S2+14.27*S3+ 7.26*S4+ 0.28*S5+0.24*S6
+    DL  = 2.94*S1+0.31*S2+14.27*S3+ 9.34*S4+ 1.12*S5+0.83*S6
+    DLS =-6.40*S1                                   -1.89*S6
+    DF  = 0.21*S1+0.31*S2+14.27*S3-88.70*S4-15.30*S5+0.24*S6-1.86*S7
+    DD  = DL0-DLS
+    dDL0 = 0.84*dS1+0.31*dS2+14.27*dS3+ 7.26*dS4+ 0.28*dS5+0.24*dS6
+    dDL  = 2.94*dS1+0.31*dS2+14.27*dS3+ 9.34*dS4+ 1.12*dS5+0.83*dS6
+    dDLS =-6.40*dS1                                    -1.89*dS6
+    dDF  = 0.21*dS1+0.31*dS2+14.27*dS3-88.70*dS4-15.30*dS5+0.24*dS6-1.86*dS7
+    dDD  = dDL0-dDLS
+    (G1, dG1) = _MoonSineRate(T, 0.59734, -5.37261)
+    (G2, dG2) = _MoonSineRate(T, 0.35498, -5.37899)
+    (G3, dG3) = _MoonSineRate(T, 0.39943, -5.37511)
+    DGAM  = -3332E-9*G1 - 539E-9*G2 - 64E-9*G3
+    dDGAM = -3332E-9*dG1 - 539E-9*dG2 - 64E-9*dG3
+
+    L0 = _PI2*Frac(0.60643382+1336.85522467*T-0.00000313*T2) + DL0/_ARC
+    L  = _PI2*Frac(0.37489701+1325.55240982*T+0.00002565*T2) + DL /_ARC
+    LS = _PI2*Frac(0.99312619+  99.99735956*T-0.00000044*T2) + DLS/_ARC
+    F  = _PI2*Frac(0.25909118+1342.22782980*T-0.00000892*T2) + DF /_ARC
+    D  = _PI2*Frac(0.82736186+1236.85308708*T-0.00000397*T2) + DD /_ARC
+    dL0 = _PI2*(1336.85522467-2*0.00000313*T) + dDL0/_ARC
+    dL  = _PI2*(1325.55240982+2*0.00002565*T) + dDL /_ARC
+    dLS = _PI2*(  99.99735956-2*0.00000044*T) + dDLS/_ARC
+    dF  = _PI2*(1342.22782980-2*0.00000892*T) + dDF /_ARC
+    dD  = _PI2*(1236.85308708-2*0.00000397*T) + dDD /_ARC
+
+    # Relative rates of change of FAC for I=2 and I=3; FAC is constant for I=1 and I=4.
+    FAC2 = 0.997504612-0.002495388*T
+    FAC3 = 1.000002708+139.978*DGAM
+    lam2 = -0.002495388 / FAC2
+    lam3 = 139.978*dDGAM / FAC3
+
+    for (I, ARG, MAX, FAC, lam, dARG) in (
+            (1, L,  4, 1.000002208, 0.0,  dL),
+            (2, LS, 3, FAC2,        lam2, dLS),
+            (3, F,  4, FAC3,        lam3, dF),
+            (4, D,  6, 1.0,         0.0,  dD)):
+        base = 13*(I - 1) + 6
+        ex[base] = complex(1, 0)
+        ex[base+1] = complex(FAC * math.cos(ARG), FAC * math.sin(ARG))
+        for J in range(2, MAX+1):
+            ex[base+J] = ex[base+J-1] * ex[base+1]
+        for J in range(1, MAX+1):
+            ex[base-J] = ex[base+J].conjugate()
+            w[base+J] = complex(J*lam, J*dARG)
+            w[base-J] = complex(J*lam, -J*dARG)
+
+    return (ex, w, L0, dL0, F, dF, DGAM, dDGAM)
+
+def _CalcMoonTheoryRates(time: Time) -> Tuple[_moonpos, float, float, float]:
+    # Evaluates the lunar theory exactly like _CalcMoonTheory, and at the same time
+    # its derivatives: the rates of change of the ecliptic longitude and latitude
+    # in radians/day, and of the distance in AU/day.
+    # Every power ex[p][i] = (FAC[i] * exp(j*ARG[i]))**p has the derivative
+    # w[p][i] * ex[p][i], where w[p][i] = |p|*FAC'[i]/FAC[i] + j*p*ARG'[i].
+    # So the derivative of a product of powers is the product times the sum of their w values.
+    T = time.tt / 36525
+    (ex, w, L0, dL0, F, dF, DGAM, dDGAM) = _MoonTheoryPowers(T)
+
+    def Frac(x: float) -> float:
+        return x - math.floor(x)
 
+    DLAM = DS = GAM1C = 0.0
+    SINPI = 3422.7000
+    dDLAM = dDS = dGAM1C = dSINPI = 0.0
+    for (dlam, ds, gam1c, sinpi, a, b, c, d) in _MoonSolarTable:
+        z = ex[a] * ex[b] * ex[c] * ex[d]
+        dz = z * (w[a] + w[b] + w[c] + w[d])
+        DLAM   += dlam * z.imag
+        DS     += ds * z.imag
+        GAM1C  += gam1c * z.real
+        SINPI  += sinpi * z.real
+        dDLAM  += dlam * dz.imag
+        dDS    += ds * dz.imag
+        dGAM1C += gam1c * dz.real
+        dSINPI += sinpi * dz.real
+
+    N = 0.0
+    dN = 0.0
+    for (coeff, a, b, c, d) in _MoonLatitudeTable:
+        z = ex[a] * ex[b] * ex[c] * ex[d]
+        N  += coeff * z.imag
+        dN += coeff * (z * (w[a] + w[b] + w[c] + w[d])).imag
+
+    extra = dextra = 0.0
+    for (coeff, a, b) in _MoonLongitudeTerms:
+        (sine, rate) = _MoonSineRate(T, a, b)
+        extra  += coeff * sine
+        dextra += coeff * rate
+    DLAM  += extra
+    dDLAM += dextra
 
-    # AddSol(13.902000, 14.060000, -0.001000, 0.260700, 0.000000, 0.000000, 0.000000, 4.000000)
-    z = ex[4][4]
-    DLAM  += 13.902 * z.imag
-    DS    += 14.06 * z.imag
-    GAM1C += -0.001 * z.real
-    SINPI += 0.2607 * z.real
-
-    # AddSol(0.403000, -4.010000, 0.394000, 0.002300, 0.000000, 0.000000, 0.000000, 3.000000)
-    z = ex[3][4]
-    DLAM  += 0.403 * z.imag
-    DS    += -4.01 * z.imag
-    GAM1C += 0.394 * z.real
-    SINPI += 0.0023 * z.real
-
-    # AddSol(2369.912000, 2373.360000, 0.601000, 28.233300, 0.000000, 0.000000, 0.000000, 2.000000)
-    z = ex[2][4]
-    DLAM  += 2369.912 * z.imag
-    DS    += 2373.36 * z.imag
-    GAM1C += 0.601 * z.real
-    SINPI += 28.2333 * z.real
-
-    # AddSol(-125.154000, -112.790000, -0.725000, -0.978100, 0.000000, 0.000000, 0.000000, 1.000000)
-    z = ex[1][4]
-    DLAM  += -125.154 * z.imag
-    DS    += -112.79 * z.imag
-    GAM1C += -0.725 * z.real
-    SINPI += -0.9781 * z.real
-
-    # AddSol(1.979000, 6.980000, -0.445000, 0.043300, 1.000000, 0.000000, 0.000000, 4.000000)
-    z = ex[1][1] * ex[4][4]
-    DLAM  += 1.979 * z.imag
-    DS    += 6.98 * z.imag
-    GAM1C += -0.445 * z.real
-    SINPI += 0.0433 * z.real
-
-    # AddSol(191.953000, 192.720000, 0.029000, 3.086100, 1.000000, 0.000000, 0.000000, 2.000000)
-    z = ex[1][1] * ex[2][4]
-    DLAM  += 191.953 * z.imag
-    DS    += 192.72 * z.imag
-    GAM1C += 0.029 * z.real
-    SINPI += 3.0861 * z.real
-
-    # AddSol(-8.466000, -13.510000, 0.455000, -0.109300, 1.000000, 0.000000, 0.000000, 1.000000)
-    z = ex[1][1] * ex[1][4]
-    DLAM  += -8.466 * z.imag
-    DS    += -13.51 * z.imag
-    GAM1C += 0.455 * z.real
-    SINPI += -0.1093 * z.real
-
-    # AddSol(22639.500000, 22609.070000, 0.079000, 186.539800, 1.000000, 0.000000, 0.000000, 0.000000)
-    z = ex[1][1]
-    DLAM  += 22639.500 * z.imag
-    DS    += 22609.07 * z.imag
-    GAM1C += 0.079 * z.real
-    SINPI += 186.5398 * z.real
-
-    # AddSol(18.609000, 3.590000, -0.094000, 0.011800, 1.000000, 0.000000, 0.000000, -1.000000)
-    z = ex[1][1] * ex[-1][4]
-    DLAM  += 18.609 * z.imag
-    DS    += 3.59 * z.imag
-    GAM1C += -0.094 * z.real
-    SINPI += 0.0118 * z.real
-
-    # AddSol(-4586.465000, -4578.130000, -0.077000, 34.311700, 1.000000, 0.000000, 0.000000, -2.000000)
-    z = ex[1][1] * ex[-2][4]
-    DLAM  += -4586.465 * z.imag
-    DS    += -4578.13 * z.imag
-    GAM1C += -0.077 * z.real
-    SINPI += 34.3117 * z.real
-
-    # AddSol(3.215000, 5.440000, 0.192000, -0.038600, 1.000000, 0.000000, 0.000000, -3.000000)
-    z = ex[1][1] * ex[-3][4]
-    DLAM  += 3.215 * z.imag
-    DS    += 5.44 * z.imag
-    GAM1C += 0.192 * z.real
-    SINPI += -0.0386 * z.real
-
-    # AddSol(-38.428000, -38.640000, 0.001000, 0.600800, 1.000000, 0.000000, 0.000000, -4.000000)
-    z = ex[1][1] * ex[-4][4]
-    DLAM  += -38.428 * z.imag
-    DS    += -38.64 * z.imag
-    GAM1C += 0.001 * z.real
-    SINPI += 0.6008 * z.real
-
-    # AddSol(-0.393000, -1.430000, -0.092000, 0.008600, 1.000000, 0.000000, 0.000000, -6.000000)
-    z = ex[1][1] * ex[-6][4]
-    DLAM  += -0.393 * z.imag
-    DS    += -1.43 * z.imag
-    GAM1C += -0.092 * z.real
-    SINPI += 0.0086 * z.real
-
-    # AddSol(-0.289000, -1.590000, 0.123000, -0.005300, 0.000000, 1.000000, 0.000000, 4.000000)
-    z = ex[1][2] * ex[4][4]
-    DLAM  += -0.289 * z.imag
-    DS    += -1.59 * z.imag
-    GAM1C += 0.123 * z.real
-    SINPI += -0.0053 * z.real
-
-    # AddSol(-24.420000, -25.100000, 0.040000, -0.300000, 0.000000, 1.000000, 0.000000, 2.000000)
-    z = ex[1][2] * ex[2][4]
-    DLAM  += -24.420 * z.imag
-    DS    += -25.10 * z.imag
-    GAM1C += 0.040 * z.real
-    SINPI += -0.3000 * z.real
-
-    # AddSol(18.023000, 17.930000, 0.007000, 0.149400, 0.000000, 1.000000, 0.000000, 1.000000)
-    z = ex[1][2] * ex[1][4]
-    DLAM  += 18.023 * z.imag
-    DS    += 17.93 * z.imag
-    GAM1C += 0.007 * z.real
-    SINPI += 0.1494 * z.real
-
-    # AddSol(-668.146000, -126.980000, -1.302000, -0.399700, 0.000000, 1.000000, 0.000000, 0.000000)
-    z = ex[1][2]
-    DLAM  += -668.146 * z.imag
-    DS    += -126.98 * z.imag
-    GAM1C += -1.302 * z.real
-    SINPI += -0.3997 * z.real
-
-    # AddSol(0.560000, 0.320000, -0.001000, -0.003700, 0.000000, 1.000000, 0.000000, -1.000000)
-    z = ex[1][2] * ex[-1][4]
-    DLAM  += 0.560 * z.imag
-    DS    += 0.32 * z.imag
-    GAM1C += -0.001 * z.real
-    SINPI += -0.0037 * z.real
-
-    # AddSol(-165.145000, -165.060000, 0.054000, 1.917800, 0.000000, 1.000000, 0.000000, -2.000000)
-    z = ex[1][2] * ex[-2][4]
-    DLAM  += -165.145 * z.imag
-    DS    += -165.06 * z.imag
-    GAM1C += 0.054 * z.real
-    SINPI += 1.9178 * z.real
-
-    # AddSol(-1.877000, -6.460000, -0.416000, 0.033900, 0.000000, 1.000000, 0.000000, -4.000000)
-    z = ex[1][2] * ex[-4][4]
-    DLAM  += -1.877 * z.imag
-    DS    += -6.46 * z.imag
-    GAM1C += -0.416 * z.real
-    SINPI += 0.0339 * z.real
-
-    # AddSol(0.213000, 1.020000, -0.074000, 0.005400, 2.000000, 0.000000, 0.000000, 4.000000)
-    z = ex[2][1] * ex[4][4]
-    DLAM  += 0.213 * z.imag
-    DS    += 1.02 * z.imag
-    GAM1C += -0.074 * z.real
-    SINPI += 0.0054 * z.real
-
-    # AddSol(14.387000, 14.780000, -0.017000, 0.283300, 2.000000, 0.000000, 0.000000, 2.000000)
-    z = ex[2][1] * ex[2][4]
-    DLAM  += 14.387 * z.imag
-    DS    += 14.78 * z.imag
-    GAM1C += -0.017 * z.real
-    SINPI += 0.2833 * z.real
-
-    # AddSol(-0.586000, -1.200000, 0.054000, -0.010000, 2.000000, 0.000000, 0.000000, 1.000000)
-    z = ex[2][1] * ex[1][4]
-    DLAM  += -0.586 * z.imag
-    DS    += -1.20 * z.imag
-    GAM1C += 0.054 * z.real
-    SINPI += -0.0100 * z.real
-
-    # AddSol(769.016000, 767.960000, 0.107000, 10.165700, 2.000000, 0.000000, 0.000000, 0.000000)
-    z = ex[2][1]
-    DLAM  += 769.016 * z.imag
-    DS    += 767.96 * z.imag
-    GAM1C += 0.107 * z.real
-    SINPI += 10.1657 * z.real
-
-    # AddSol(1.750000, 2.010000, -0.018000, 0.015500, 2.000000, 0.000000, 0.000000, -1.000000)
-    z = ex[2][1] * ex[-1][4]
-    DLAM  += 1.750 * z.imag
-    DS    += 2.01 * z.imag
-    GAM1C += -0.018 * z.real
-    SINPI += 0.0155 * z.real
-
-    # AddSol(-211.656000, -152.530000, 5.679000, -0.303900, 2.000000, 0.000000, 0.000000, -2.000000)
-    z = ex[2][1] * ex[-2][4]
-    DLAM  += -211.656 * z.imag
-    DS    += -152.53 * z.imag
-    GAM1C += 5.679 * z.real
-    SINPI += -0.3039 * z.real
-
-    # AddSol(1.225000, 0.910000, -0.030000, -0.008800, 2.000000, 0.000000, 0.000000, -3.000000)
-    z = ex[2][1] * ex[-3][4]
-    DLAM  += 1.225 * z.imag
-    DS    += 0.91 * z.imag
-    GAM1C += -0.030 * z.real
-    SINPI += -0.0088 * z.real
-
-    # AddSol(-30.773000, -34.070000, -0.308000, 0.372200, 2.000000, 0.000000, 0.000000, -4.000000)
-    z = ex[2][1] * ex[-4][4]
-    DLAM  += -30.773 * z.imag
-    DS    += -34.07 * z.imag
-    GAM1C += -0.308 * z.real
-    SINPI += 0.3722 * z.real
-
-    # AddSol(-0.570000, -1.400000, -0.074000, 0.010900, 2.000000, 0.000000, 0.000000, -6.000000)
-    z = ex[2][1] * ex[-6][4]
-    DLAM  += -0.570 * z.imag
-    DS    += -1.40 * z.imag
-    GAM1C += -0.074 * z.real
-    SINPI += 0.0109 * z.real
-
-    # AddSol(-2.921000, -11.750000, 0.787000, -0.048400, 1.000000, 1.000000, 0.000000, 2.000000)
-    z = ex[1][1] * ex[1][2] * ex[2][4]
-    DLAM  += -2.921 * z.imag
-    DS    += -11.75 * z.imag
-    GAM1C += 0.787 * z.real
-    SINPI += -0.0484 * z.real
-
-    # AddSol(1.267000, 1.520000, -0.022000, 0.016400, 1.000000, 1.000000, 0.000000, 1.000000)
-    z = ex[1][1] * ex[1][2] * ex[1][4]
-    DLAM  += 1.267 * z.imag
-    DS    += 1.52 * z.imag
-    GAM1C += -0.022 * z.real
-    SINPI += 0.0164 * z.real
-
-    # AddSol(-109.673000, -115.180000, 0.461000, -0.949000, 1.000000, 1.000000, 0.000000, 0.000000)
-    z = ex[1][1] * ex[1][2]
-    DLAM  += -109.673 * z.imag
-    DS    += -115.18 * z.imag
-    GAM1C += 0.461 * z.real
-    SINPI += -0.9490 * z.real
-
-    # AddSol(-205.962000, -182.360000, 2.056000, 1.443700, 1.000000, 1.000000, 0.000000, -2.000000)
-    z = ex[1][1] * ex[1][2] * ex[-2][4]
-    DLAM  += -205.962 * z.imag
-    DS    += -182.36 * z.imag
-    GAM1C += 2.056 * z.real
-    SINPI += 1.4437 * z.real
-
-    # AddSol(0.233000, 0.360000, 0.012000, -0.002500, 1.000000, 1.000000, 0.000000, -3.000000)
-    z = ex[1][1] * ex[1][2] * ex[-3][4]
-    DLAM  += 0.233 * z.imag
-    DS    += 0.36 * z.imag
-    GAM1C += 0.012 * z.real
-    SINPI += -0.0025 * z.real
-
-    # AddSol(-4.391000, -9.660000, -0.471000, 0.067300, 1.000000, 1.000000, 0.000000, -4.000000)
-    z = ex[1][1] * ex[1][2] * ex[-4][4]
-    DLAM  += -4.391 * z.imag
-    DS    += -9.66 * z.imag
-    GAM1C += -0.471 * z.real
-    SINPI += 0.0673 * z.real
-
-    # AddSol(0.283000, 1.530000, -0.111000, 0.006000, 1.000000, -1.000000, 0.000000, 4.000000)
-    z = ex[1][1] * ex[-1][2] * ex[4][4]
-    DLAM  += 0.283 * z.imag
-    DS    += 1.53 * z.imag
-    GAM1C += -0.111 * z.real
-    SINPI += 0.0060 * z.real
-
-    # AddSol(14.577000, 31.700000, -1.540000, 0.230200, 1.000000, -1.000000, 0.000000, 2.000000)
-    z = ex[1][1] * ex[-1][2] * ex[2][4]
-    DLAM  += 14.577 * z.imag
-    DS    += 31.70 * z.imag
-    GAM1C += -1.540 * z.real
-    SINPI += 0.2302 * z.real
-
-    # AddSol(147.687000, 138.760000, 0.679000, 1.152800, 1.000000, -1.000000, 0.000000, 0.000000)
-    z = ex[1][1] * ex[-1][2]
-    DLAM  += 147.687 * z.imag
-    DS    += 138.76 * z.imag
-    GAM1C += 0.679 * z.real
-    SINPI += 1.1528 * z.real
-
-    # AddSol(-1.089000, 0.550000, 0.021000, 0.000000, 1.000000, -1.000000, 0.000000, -1.000000)
-    z = ex[1][1] * ex[-1][2] * ex[-1][4]
-    DLAM  += -1.089 * z.imag
-    DS    += 0.55 * z.imag
-    GAM1C += 0.021 * z.real
-
-    # AddSol(28.475000, 23.590000, -0.443000, -0.225700, 1.000000, -1.000000, 0.000000, -2.000000)
-    z = ex[1][1] * ex[-1][2] * ex[-2][4]
-    DLAM  += 28.475 * z.imag
-    DS    += 23.59 * z.imag
-    GAM1C += -0.443 * z.real
-    SINPI += -0.2257 * z.real
-
-    # AddSol(-0.276000, -0.380000, -0.006000, -0.003600, 1.000000, -1.000000, 0.000000, -3.000000)
-    z = ex[1][1] * ex[-1][2] * ex[-3][4]
-    DLAM  += -0.276 * z.imag
-    DS    += -0.38 * z.imag
-    GAM1C += -0.006 * z.real
-    SINPI += -0.0036 * z.real
-
-    # AddSol(0.636000, 2.270000, 0.146000, -0.010200, 1.000000, -1.000000, 0.000000, -4.000000)
-    z = ex[1][1] * ex[-1][2] * ex[-4][4]
-    DLAM  += 0.636 * z.imag
-    DS    += 2.27 * z.imag
-    GAM1C += 0.146 * z.real
-    SINPI += -0.0102 * z.real
-
-    # AddSol(-0.189000, -1.680000, 0.131000, -0.002800, 0.000000, 2.000000, 0.000000, 2.000000)
-    z = ex[2][2] * ex[2][4]
-    DLAM  += -0.189 * z.imag
-    DS    += -1.68 * z.imag
-    GAM1C += 0.131 * z.real
-    SINPI += -0.0028 * z.real
-
-    # AddSol(-7.486000, -0.660000, -0.037000, -0.008600, 0.000000, 2.000000, 0.000000, 0.000000)
-    z = ex[2][2]
-    DLAM  += -7.486 * z.imag
-    DS    += -0.66 * z.imag
-    GAM1C += -0.037 * z.real
-    SINPI += -0.0086 * z.real
-
-    # AddSol(-8.096000, -16.350000, -0.740000, 0.091800, 0.000000, 2.000000, 0.000000, -2.000000)
-    z = ex[2][2] * ex[-2][4]
-    DLAM  += -8.096 * z.imag
-    DS    += -16.35 * z.imag
-    GAM1C += -0.740 * z.real
-    SINPI += 0.0918 * z.real
-
-    # AddSol(-5.741000, -0.040000, 0.000000, -0.000900, 0.000000, 0.000000, 2.000000, 2.000000)
-    z = ex[2][3] * ex[2][4]
-    DLAM  += -5.741 * z.imag
-    DS    += -0.04 * z.imag
-    SINPI += -0.0009 * z.real
-
-    # AddSol(0.255000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 2.000000, 1.000000)
-    z = ex[2][3] * ex[1][4]
-    DLAM  += 0.255 * z.imag
-
-    # AddSol(-411.608000, -0.200000, 0.000000, -0.012400, 0.000000, 0.000000, 2.000000, 0.000000)
-    z = ex[2][3]
-    DLAM  += -411.608 * z.imag
-    DS    += -0.20 * z.imag
-    SINPI += -0.0124 * z.real
-
-    # AddSol(0.584000, 0.840000, 0.000000, 0.007100, 0.000000, 0.000000, 2.000000, -1.000000)
-    z = ex[2][3] * ex[-1][4]
-    DLAM  += 0.584 * z.imag
-    DS    += 0.84 * z.imag
-    SINPI += 0.0071 * z.real
-
-    # AddSol(-55.173000, -52.140000, 0.000000, -0.105200, 0.000000, 0.000000, 2.000000, -2.000000)
-    z = ex[2][3] * ex[-2][4]
-    DLAM  += -55.173 * z.imag
-    DS    += -52.14 * z.imag
-    SINPI += -0.1052 * z.real
-
-    # AddSol(0.254000, 0.250000, 0.000000, -0.001700, 0.000000, 0.000000, 2.000000, -3.000000)
-    z = ex[2][3] * ex[-3][4]
-    DLAM  += 0.254 * z.imag
-    DS    += 0.25 * z.imag
-    SINPI += -0.0017 * z.real
-
-    # AddSol(0.025000, -1.670000, 0.000000, 0.003100, 0.000000, 0.000000, 2.000000, -4.000000)
-    z = ex[2][3] * ex[-4][4]
-    DLAM  += 0.025 * z.imag
-    DS    += -1.67 * z.imag
-    SINPI += 0.0031 * z.real
-
-    # AddSol(1.060000, 2.960000, -0.166000, 0.024300, 3.000000, 0.000000, 0.000000, 2.000000)
-    z = ex[3][1] * ex[2][4]
-    DLAM  += 1.060 * z.imag
-    DS    += 2.96 * z.imag
-    GAM1C += -0.166 * z.real
-    SINPI += 0.0243 * z.real
-
-    # AddSol(36.124000, 50.640000, -1.300000, 0.621500, 3.000000, 0.000000, 0.000000, 0.000000)
-    z = ex[3][1]
-    DLAM  += 36.124 * z.imag
-    DS    += 50.64 * z.imag
-    GAM1C += -1.300 * z.real
-    SINPI += 0.6215 * z.real
-
-    # AddSol(-13.193000, -16.400000, 0.258000, -0.118700, 3.000000, 0.000000, 0.000000, -2.000000)
-    z = ex[3][1] * ex[-2][4]
-    DLAM  += -13.193 * z.imag
-    DS    += -16.40 * z.imag
-    GAM1C += 0.258 * z.real
-    SINPI += -0.1187 * z.real
-
-    # AddSol(-1.187000, -0.740000, 0.042000, 0.007400, 3.000000, 0.000000, 0.000000, -4.000000)
-    z = ex[3][1] * ex[-4][4]
-    DLAM  += -1.187 * z.imag
-    DS    += -0.74 * z.imag
-    GAM1C += 0.042 * z.real
-    SINPI += 0.0074 * z.real
-
-    # AddSol(-0.293000, -0.310000, -0.002000, 0.004600, 3.000000, 0.000000, 0.000000, -6.000000)
-    z = ex[3][1] * ex[-6][4]
-    DLAM  += -0.293 * z.imag
-    DS    += -0.31 * z.imag
-    GAM1C += -0.002 * z.real
-    SINPI += 0.0046 * z.real
-
-    # AddSol(-0.290000, -1.450000, 0.116000, -0.005100, 2.000000, 1.000000, 0.000000, 2.000000)
-    z = ex[2][1] * ex[1][2] * ex[2][4]
-    DLAM  += -0.290 * z.imag
-    DS    += -1.45 * z.imag
-    GAM1C += 0.116 * z.real
-    SINPI += -0.0051 * z.real
-
-    # AddSol(-7.649000, -10.560000, 0.259000, -0.103800, 2.000000, 1.000000, 0.000000, 0.000000)
-    z = ex[2][1] * ex[1][2]
-    DLAM  += -7.649 * z.imag
-    DS    += -10.56 * z.imag
-    GAM1C += 0.259 * z.real
-    SINPI += -0.1038 * z.real
-
-    # AddSol(-8.627000, -7.590000, 0.078000, -0.019200, 2.000000, 1.000000, 0.000000, -2.000000)
-    z = ex[2][1] * ex[1][2] * ex[-2][4]
-    DLAM  += -8.627 * z.imag
-    DS    += -7.59 * z.imag
-    GAM1C += 0.078 * z.real
-    SINPI += -0.0192 * z.real
-
-    # AddSol(-2.740000, -2.540000, 0.022000, 0.032400, 2.000000, 1.000000, 0.000000, -4.000000)
-    z = ex[2][1] * ex[1][2] * ex[-4][4]
-    DLAM  += -2.740 * z.imag
-    DS    += -2.54 * z.imag
-    GAM1C += 0.022 * z.real
-    SINPI += 0.0324 * z.real
-
-    # AddSol(1.181000, 3.320000, -0.212000, 0.021300, 2.000000, -1.000000, 0.000000, 2.000000)
-    z = ex[2][1] * ex[-1][2] * ex[2][4]
-    DLAM  += 1.181 * z.imag
-    DS    += 3.32 * z.imag
-    GAM1C += -0.212 * z.real
-    SINPI += 0.0213 * z.real
-
-    # AddSol(9.703000, 11.670000, -0.151000, 0.126800, 2.000000, -1.000000, 0.000000, 0.000000)
-    z = ex[2][1] * ex[-1][2]
-    DLAM  += 9.703 * z.imag
-    DS    += 11.67 * z.imag
-    GAM1C += -0.151 * z.real
-    SINPI += 0.1268 * z.real
-
-    # AddSol(-0.352000, -0.370000, 0.001000, -0.002800, 2.000000, -1.000000, 0.000000, -1.000000)
-    z = ex[2][1] * ex[-1][2] * ex[-1][4]
-    DLAM  += -0.352 * z.imag
-    DS    += -0.37 * z.imag
-    GAM1C += 0.001 * z.real
-    SINPI += -0.0028 * z.real
-
-    # AddSol(-2.494000, -1.170000, -0.003000, -0.001700, 2.000000, -1.000000, 0.000000, -2.000000)
-    z = ex[2][1] * ex[-1][2] * ex[-2][4]
-    DLAM  += -2.494 * z.imag
-    DS    += -1.17 * z.imag
-    GAM1C += -0.003 * z.real
-    SINPI += -0.0017 * z.real
-
-    # AddSol(0.360000, 0.200000, -0.012000, -0.004300, 2.000000, -1.000000, 0.000000, -4.000000)
-    z = ex[2][1] * ex[-1][2] * ex[-4][4]
-    DLAM  += 0.360 * z.imag
-    DS    += 0.20 * z.imag
-    GAM1C += -0.012 * z.real
-    SINPI += -0.0043 * z.real
-
-    # AddSol(-1.167000, -1.250000, 0.008000, -0.010600, 1.000000, 2.000000, 0.000000, 0.000000)
-    z = ex[1][1] * ex[2][2]
-    DLAM  += -1.167 * z.imag
-    DS    += -1.25 * z.imag
-    GAM1C += 0.008 * z.real
-    SINPI += -0.0106 * z.real
-
-    # AddSol(-7.412000, -6.120000, 0.117000, 0.048400, 1.000000, 2.000000, 0.000000, -2.000000)
-    z = ex[1][1] * ex[2][2] * ex[-2][4]
-    DLAM  += -7.412 * z.imag
-    DS    += -6.12 * z.imag
-    GAM1C += 0.117 * z.real
-    SINPI += 0.0484 * z.real
-
-    # AddSol(-0.311000, -0.650000, -0.032000, 0.004400, 1.000000, 2.000000, 0.000000, -4.000000)
-    z = ex[1][1] * ex[2][2] * ex[-4][4]
-    DLAM  += -0.311 * z.imag
-    DS    += -0.65 * z.imag
-    GAM1C += -0.032 * z.real
-    SINPI += 0.0044 * z.real
-
-    # AddSol(0.757000, 1.820000, -0.105000, 0.011200, 1.000000, -2.000000, 0.000000, 2.000000)
-    z = ex[1][1] * ex[-2][2] * ex[2][4]
-    DLAM  += 0.757 * z.imag
-    DS    += 1.82 * z.imag
-    GAM1C += -0.105 * z.real
-    SINPI += 0.0112 * z.real
-
-    # AddSol(2.580000, 2.320000, 0.027000, 0.019600, 1.000000, -2.000000, 0.000000, 0.000000)
-    z = ex[1][1] * ex[-2][2]
-    DLAM  += 2.580 * z.imag
-    DS    += 2.32 * z.imag
-    GAM1C += 0.027 * z.real
-    SINPI += 0.0196 * z.real
-
-    # AddSol(2.533000, 2.400000, -0.014000, -0.021200, 1.000000, -2.000000, 0.000000, -2.000000)
-    z = ex[1][1] * ex[-2][2] * ex[-2][4]
-    DLAM  += 2.533 * z.imag
-    DS    += 2.40 * z.imag
-    GAM1C += -0.014 * z.real
-    SINPI += -0.0212 * z.real
-
-    # AddSol(-0.344000, -0.570000, -0.025000, 0.003600, 0.000000, 3.000000, 0.000000, -2.000000)
-    z = ex[3][2] * ex[-2][4]
-    DLAM  += -0.344 * z.imag
-    DS    += -0.57 * z.imag
-    GAM1C += -0.025 * z.real
-    SINPI += 0.0036 * z.real
-
-    # AddSol(-0.992000, -0.020000, 0.000000, 0.000000, 1.000000, 0.000000, 2.000000, 2.000000)
-    z = ex[1][1] * ex[2][3] * ex[2][4]
-    DLAM  += -0.992 * z.imag
-    DS    += -0.02 * z.imag
-
-    # AddSol(-45.099000, -0.020000, 0.000000, -0.001000, 1.000000, 0.000000, 2.000000, 0.000000)
-    z = ex[1][1] * ex[2][3]
-    DLAM  += -45.099 * z.imag
-    DS    += -0.02 * z.imag
-    SINPI += -0.0010 * z.real
-
-    # AddSol(-0.179000, -9.520000, 0.000000, -0.083300, 1.000000, 0.000000, 2.000000, -2.000000)
-    z = ex[1][1] * ex[2][3] * ex[-2][4]
-    DLAM  += -0.179 * z.imag
-    DS    += -9.52 * z.imag
-    SINPI += -0.0833 * z.real
-
-    # AddSol(-0.301000, -0.330000, 0.000000, 0.001400, 1.000000, 0.000000, 2.000000, -4.000000)
-    z = ex[1][1] * ex[2][3] * ex[-4][4]
-    DLAM  += -0.301 * z.imag
-    DS    += -0.33 * z.imag
-    SINPI += 0.0014 * z.real
-
-    # AddSol(-6.382000, -3.370000, 0.000000, -0.048100, 1.000000, 0.000000, -2.000000, 2.000000)
-    z = ex[1][1] * ex[-2][3] * ex[2][4]
-    DLAM  += -6.382 * z.imag
-    DS    += -3.37 * z.imag
-    SINPI += -0.0481 * z.real
-
-    # AddSol(39.528000, 85.130000, 0.000000, -0.713600, 1.000000, 0.000000, -2.000000, 0.000000)
-    z = ex[1][1] * ex[-2][3]
-    DLAM  += 39.528 * z.imag
-    DS    += 85.13 * z.imag
-    SINPI += -0.7136 * z.real
-
-    # AddSol(9.366000, 0.710000, 0.000000, -0.011200, 1.000000, 0.000000, -2.000000, -2.000000)
-    z = ex[1][1] * ex[-2][3] * ex[-2][4]
-    DLAM  += 9.366 * z.imag
-    DS    += 0.71 * z.imag
-    SINPI += -0.0112 * z.real
-
-    # AddSol(0.202000, 0.020000, 0.000000, 0.000000, 1.000000, 0.000000, -2.000000, -4.000000)
-    z = ex[1][1] * ex[-2][3] * ex[-4][4]
-    DLAM  += 0.202 * z.imag
-    DS    += 0.02 * z.imag
-
-    # AddSol(0.415000, 0.100000, 0.000000, 0.001300, 0.000000, 1.000000, 2.000000, 0.000000)
-    z = ex[1][2] * ex[2][3]
-    DLAM  += 0.415 * z.imag
-    DS    += 0.10 * z.imag
-    SINPI += 0.0013 * z.real
-
-    # AddSol(-2.152000, -2.260000, 0.000000, -0.006600, 0.000000, 1.000000, 2.000000, -2.000000)
-    z = ex[1][2] * ex[2][3] * ex[-2][4]
-    DLAM  += -2.152 * z.imag
-    DS    += -2.26 * z.imag
-    SINPI += -0.0066 * z.real
-
-    # AddSol(-1.440000, -1.300000, 0.000000, 0.001400, 0.000000, 1.000000, -2.000000, 2.000000)
-    z = ex[1][2] * ex[-2][3] * ex[2][4]
-    DLAM  += -1.440 * z.imag
-    DS    += -1.30 * z.imag
-    SINPI += 0.0014 * z.real
-
-    # AddSol(0.384000, -0.040000, 0.000000, 0.000000, 0.000000, 1.000000, -2.000000, -2.000000)
-    z = ex[1][2] * ex[-2][3] * ex[-2][4]
-    DLAM  += 0.384 * z.imag
-    DS    += -0.04 * z.imag
-
-    # AddSol(1.938000, 3.600000, -0.145000, 0.040100, 4.000000, 0.000000, 0.000000, 0.000000)
-    z = ex[4][1]
-    DLAM  += 1.938 * z.imag
-    DS    += 3.60 * z.imag
-    GAM1C += -0.145 * z.real
-    SINPI += 0.0401 * z.real
-
-    # AddSol(-0.952000, -1.580000, 0.052000, -0.013000, 4.000000, 0.000000, 0.000000, -2.000000)
-    z = ex[4][1] * ex[-2][4]
-    DLAM  += -0.952 * z.imag
-    DS    += -1.58 * z.imag
-    GAM1C += 0.052 * z.real
-    SINPI += -0.0130 * z.real
-
-    # AddSol(-0.551000, -0.940000, 0.032000, -0.009700, 3.000000, 1.000000, 0.000000, 0.000000)
-    z = ex[3][1] * ex[1][2]
-    DLAM  += -0.551 * z.imag
-    DS    += -0.94 * z.imag
-    GAM1C += 0.032 * z.real
-    SINPI += -0.0097 * z.real
-
-    # AddSol(-0.482000, -0.570000, 0.005000, -0.004500, 3.000000, 1.000000, 0.000000, -2.000000)
-    z = ex[3][1] * ex[1][2] * ex[-2][4]
-    DLAM  += -0.482 * z.imag
-    DS    += -0.57 * z.imag
-    GAM1C += 0.005 * z.real
-    SINPI += -0.0045 * z.real
-
-    # AddSol(0.681000, 0.960000, -0.026000, 0.011500, 3.000000, -1.000000, 0.000000, 0.000000)
-    z = ex[3][1] * ex[-1][2]
-    DLAM  += 0.681 * z.imag
-    DS    += 0.96 * z.imag
-    GAM1C += -0.026 * z.real
-    SINPI += 0.0115 * z.real
-
-    # AddSol(-0.297000, -0.270000, 0.002000, -0.000900, 2.000000, 2.000000, 0.000000, -2.000000)
-    z = ex[2][1] * ex[2][2] * ex[-2][4]
-    DLAM  += -0.297 * z.imag
-    DS    += -0.27 * z.imag
-    GAM1C += 0.002 * z.real
-    SINPI += -0.0009 * z.real
-
-    # AddSol(0.254000, 0.210000, -0.003000, 0.000000, 2.000000, -2.000000, 0.000000, -2.000000)
-    z = ex[2][1] * ex[-2][2] * ex[-2][4]
-    DLAM  += 0.254 * z.imag
-    DS    += 0.21 * z.imag
-    GAM1C += -0.003 * z.real
-
-    # AddSol(-0.250000, -0.220000, 0.004000, 0.001400, 1.000000, 3.000000, 0.000000, -2.000000)
-    z = ex[1][1] * ex[3][2] * ex[-2][4]
-    DLAM  += -0.250 * z.imag
-    DS    += -0.22 * z.imag
-    GAM1C += 0.004 * z.real
-    SINPI += 0.0014 * z.real
-
-    # AddSol(-3.996000, 0.000000, 0.000000, 0.000400, 2.000000, 0.000000, 2.000000, 0.000000)
-    z = ex[2][1] * ex[2][3]
-    DLAM  += -3.996 * z.imag
-    SINPI += 0.0004 * z.real
-
-    # AddSol(0.557000, -0.750000, 0.000000, -0.009000, 2.000000, 0.000000, 2.000000, -2.000000)
-    z = ex[2][1] * ex[2][3] * ex[-2][4]
-    DLAM  += 0.557 * z.imag
-    DS    += -0.75 * z.imag
-    SINPI += -0.0090 * z.real
-
-    # AddSol(-0.459000, -0.380000, 0.000000, -0.005300, 2.000000, 0.000000, -2.000000, 2.000000)
-    z = ex[2][1] * ex[-2][3] * ex[2][4]
-    DLAM  += -0.459 * z.imag
-    DS    += -0.38 * z.imag
-    SINPI += -0.0053 * z.real
-
-    # AddSol(-1.298000, 0.740000, 0.000000, 0.000400, 2.000000, 0.000000, -2.000000, 0.000000)
-    z = ex[2][1] * ex[-2][3]
-    DLAM  += -1.298 * z.imag
-    DS    += 0.74 * z.imag
-    SINPI += 0.0004 * z.real
-
-    # AddSol(0.538000, 1.140000, 0.000000, -0.014100, 2.000000, 0.000000, -2.000000, -2.000000)
-    z = ex[2][1] * ex[-2][3] * ex[-2][4]
-    DLAM  += 0.538 * z.imag
-    DS    += 1.14 * z.imag
-    SINPI += -0.0141 * z.real
-
-    # AddSol(0.263000, 0.020000, 0.000000, 0.000000, 1.000000, 1.000000, 2.000000, 0.000000)
-    z = ex[1][1] * ex[1][2] * ex[2][3]
-    DLAM  += 0.263 * z.imag
-    DS    += 0.02 * z.imag
-
-    # AddSol(0.426000, 0.070000, 0.000000, -0.000600, 1.000000, 1.000000, -2.000000, -2.000000)
-    z = ex[1][1] * ex[1][2] * ex[-2][3] * ex[-2][4]
-    DLAM  += 0.426 * z.imag
-    DS    += 0.07 * z.imag
-    SINPI += -0.0006 * z.real
-
-    # AddSol(-0.304000, 0.030000, 0.000000, 0.000300, 1.000000, -1.000000, 2.000000, 0.000000)
-    z = ex[1][1] * ex[-1][2] * ex[2][3]
-    DLAM  += -0.304 * z.imag
-    DS    += 0.03 * z.imag
-    SINPI += 0.0003 * z.real
-
-    # AddSol(-0.372000, -0.190000, 0.000000, -0.002700, 1.000000, -1.000000, -2.000000, 2.000000)
-    z = ex[1][1] * ex[-1][2] * ex[-2][3] * ex[2][4]
-    DLAM  += -0.372 * z.imag
-    DS    += -0.19 * z.imag
-    SINPI += -0.0027 * z.real
-
-    # AddSol(0.418000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 4.000000, 0.000000)
-    z = ex[4][3]
-    DLAM  += 0.418 * z.imag
-
-    # AddSol(-0.330000, -0.040000, 0.000000, 0.000000, 3.000000, 0.000000, 2.000000, 0.000000)
-    z = ex[3][1] * ex[2][3]
-    DLAM  += -0.330 * z.imag
-    DS    += -0.04 * z.imag
-
-
-    def ADDN(coeffn: float, p: int, q: int, r: int, s: int) -> float:
-        return coeffn * (ex[p][1] * ex[q][2] * ex[r][3] * ex[s][4]).imag
-
-    N = (
-        ADDN(-526.069, 0, 0,1,-2) +
-        ADDN(  -3.352, 0, 0,1,-4) +
-        ADDN( +44.297,+1, 0,1,-2) +
-        ADDN(  -6.000,+1, 0,1,-4) +
-        ADDN( +20.599,-1, 0,1, 0) +
-        ADDN( -30.598,-1, 0,1,-2) +
-        ADDN( -24.649,-2, 0,1, 0) +
-        ADDN(  -2.000,-2, 0,1,-2) +
-        ADDN( -22.571, 0,+1,1,-2) +
-        ADDN( +10.985, 0,-1,1,-2)
+    S = F + DS/_ARC
+    dS = dF + dDS/_ARC
+    A = 1.000002708 + 139.978*DGAM
+    B = 18518.511+1.189+GAM1C
+    sinS = math.sin(S)
+    lat_seconds = A*B*sinS - 6.24*math.sin(3*S) + N
+    dlat_seconds = (139.978*dDGAM*B + A*dGAM1C)*sinS + A*B*math.cos(S)*dS - 3*6.24*math.cos(3*S)*dS + dN
+    moon = _moonpos(
+        _PI2 * Frac((L0+DLAM/_ARC) / _PI2),
+        (math.pi / (180 * 3600)) * lat_seconds,
+        (_ARC * _EARTH_EQUATORIAL_RADIUS_AU) / (0.999953253 * SINPI)
+    )
+    # Convert the rates from per-century to per-day.
+    return (
+        moon,
+        (dL0 + dDLAM/_ARC) / 36525,
+        (math.pi / (180 * 3600)) * dlat_seconds / 36525,
+        -moon.distance_au * (dSINPI / SINPI) / 36525
     )
 
-    DLAM += (
-        +0.82*Sine(0.7736  -62.5512*T)+0.31*Sine(0.0466 -125.1025*T)
-        +0.35*Sine(0.5785  -25.1042*T)+0.66*Sine(0.4591+1335.8075*T)
-        +0.64*Sine(0.3130  -91.5680*T)+1.14*Sine(0.1480+1331.2898*T)
-        +0.21*Sine(0.5918+1056.5859*T)+0.44*Sine(0.5784+1322.8595*T)
-        +0.24*Sine(0.2275   -5.7374*T)+0.28*Sine(0.2965   +2.6929*T)
-        +0.33*Sine(0.3132   +6.3368*T)
+# The rows of _MoonSolarTable that contribute to the Moon's distance.
+_MoonDistanceTable = [(sinpi, a, b, c, d) for (_, _, _, sinpi, a, b, c, d) in _MoonSolarTable if sinpi != 0.0]
+
+def _MoonDistanceRates(time: Time) -> Tuple[float, float, float]:
+    # Returns the Moon's geocentric distance in AU, with its first and second
+    # derivatives in AU/day and AU/day^2. Only the parallax series is evaluated.
+    # The second derivative of a product of powers is the product times the square
+    # of the sum of their w values: the w values change so slowly that their own
+    # derivatives are negligible.
+    T = time.tt / 36525
+    (ex, w, _, _, _, _, _, _) = _MoonTheoryPowers(T)
+    SINPI = 3422.7000
+    dSINPI = ddSINPI = 0.0
+    for (sinpi, a, b, c, d) in _MoonDistanceTable:
+        z = ex[a] * ex[b] * ex[c] * ex[d]
+        s = w[a] + w[b] + w[c] + w[d]
+        dz = z * s
+        SINPI   += sinpi * z.real
+        dSINPI  += sinpi * dz.real
+        ddSINPI += sinpi * (dz * s).real
+    dist = (_ARC * _EARTH_EQUATORIAL_RADIUS_AU) / (0.999953253 * SINPI)
+    # The distance is inversely proportional to SINPI.
+    # Convert the rates from per-century to per-day.
+    ratio = dSINPI / SINPI
+    return (
+        dist,
+        -dist * ratio / 36525,
+        dist * (2*ratio*ratio - ddSINPI/SINPI) / (36525 * 36525)
     )
+
+# Batch evaluation of the lunar theory for many times.
+# The same term tables drive a NumPy version of _CalcMoonTheory: each power ex[p][i]
+# becomes a row of complex values, one per time, and each group of terms is
+# summed with a matrix product. Times are processed in chunks to bound memory.
+
+_MOON_CHUNK_TIMES = 4096
+_moon_packed: Optional[Tuple[Any, ...]] = None
+
+def _MoonPacked() -> Tuple[Any, ...]:
+    global _moon_packed
+    if _moon_packed is None:
+        _moon_packed = (
+            _np.array([row[0:4] for row in _MoonSolarTable]).T.copy(),
+            _np.array([row[4:8] for row in _MoonSolarTable]).T.copy(),
+            _np.array([row[0] for row in _MoonLatitudeTable]),
+            _np.array([row[1:5] for row in _MoonLatitudeTable]).T.copy()
+        )
+    return _moon_packed
+
+def _CalcMoonArray(tt: Any) -> Tuple[Any, Any, Any]:
+    # Vectorized form of _CalcMoonTheory. Returns arrays of geocentric ecliptic
+    # longitude and latitude in radians, and distance in AU, all in mean equinox of date.
+    n = len(tt)
+    lon = _np.empty(n)
+    lat = _np.empty(n)
+    dist = _np.empty(n)
+    for start in range(0, n, _MOON_CHUNK_TIMES):
+        stop = min(n, start + _MOON_CHUNK_TIMES)
+        (lon[start:stop], lat[start:stop], dist[start:stop]) = _CalcMoonArrayChunk(tt[start:stop])
+    return (lon, lat, dist)
+
+def _CalcMoonArrayChunk(tt: Any) -> Tuple[Any, Any, Any]:
+    (solar_coeff, solar_slots, lat_coeff, lat_slots) = _MoonPacked()
+    T = tt / 36525
+
+    def Sine(phi: Any) -> Any:
+        return _np.sin(_PI2 * phi)
+
+    def Frac(x: Any) -> Any:
+        return x - _np.floor(x)
+
+    T2 = T*T
+    S1 = Sine(0.19833+0.05611*T)
+    S2 = Sine(0.27869+0.04508*T)
+    S3 = Sine(0.16827-0.36903*T)
+    S4 = Sine(0.34734-5.37261*T)
+    S5 = Sine(0.10498-5.37899*T)
+    S6 = Sine(0.42681-0.41855*T)
+    S7 = Sine(0.14943-5.37511*T)
+    DL0 = 0.84*S1+0.31*S2+14.27*S3+ 7.26*S4+ 0.28*S5+0.24*S6
+    DL  = 2.94*S1+0.31*S2+14.27*S3+ 9.34*S4+ 1.12*S5+0.83*S6
+    DLS =-6.40*S1                                   -1.89*S6
+    DF  = 0.21*S1+0.31*S2+14.27*S3-88.70*S4-15.30*S5+0.24*S6-1.86*S7
+    DD  = DL0-DLS
+    DGAM  = ((-3332E-9 * Sine(0.59734-5.37261*T)
+               -539E-9 * Sine(0.35498-5.37899*T)
+                -64E-9 * Sine(0.39943-5.37511*T)))
+
+    L0 = _PI2*Frac(0.60643382+1336.85522467*T-0.00000313*T2) + DL0/_ARC
+    L  = _PI2*Frac(0.37489701+1325.55240982*T+0.00002565*T2) + DL /_ARC
+    LS = _PI2*Frac(0.99312619+  99.99735956*T-0.00000044*T2) + DLS/_ARC
+    F  = _PI2*Frac(0.25909118+1342.22782980*T-0.00000892*T2) + DF /_ARC
+    D  = _PI2*Frac(0.82736186+1236.85308708*T-0.00000397*T2) + DD /_ARC
+
+    ex = _np.zeros((_MOON_EX_SIZE, len(tt)), dtype=_np.complex128)
+    for (I, ARG, MAX, FAC) in (
+            (1, L,  4, 1.000002208),
+            (2, LS, 3, 0.997504612-0.002495388*T),
+            (3, F,  4, 1.000002708+139.978*DGAM),
+            (4, D,  6, 1.0)):
+        base = 13*(I - 1) + 6
+        ex[base] = 1.0
+        ex[base+1] = FAC * _np.exp(1j * ARG)
+        for J in range(2, MAX+1):
+            ex[base+J] = ex[base+J-1] * ex[base+1]
+        for J in range(1, MAX+1):
+            ex[base-J] = _np.conj(ex[base+J])
+
+    z = ex[solar_slots[0]] * ex[solar_slots[1]] * ex[solar_slots[2]] * ex[solar_slots[3]]
+    DLAM  = solar_coeff[0] @ z.imag
+    DS    = solar_coeff[1] @ z.imag
+    GAM1C = solar_coeff[2] @ z.real
+    SINPI = 3422.7000 + (solar_coeff[3] @ z.real)
+
+    z = ex[lat_slots[0]] * ex[lat_slots[1]] * ex[lat_slots[2]] * ex[lat_slots[3]]
+    N = lat_coeff @ z.imag
+
+    DLAM += sum(coeff*Sine(a + b*T) for (coeff, a, b) in _MoonLongitudeTerms)
     S = F + DS/_ARC
-    lat_seconds = (1.000002708 + 139.978*DGAM)*(18518.511+1.189+GAM1C)*math.sin(S) - 6.24*math.sin(3*S) + N
-    return _moonpos(
+    lat_seconds = (1.000002708 + 139.978*DGAM)*(18518.511+1.189+GAM1C)*_np.sin(S) - 6.24*_np.sin(3*S) + N
+    return (
         _PI2 * Frac((L0+DLAM/_ARC) / _PI2),
         (math.pi / (180 * 3600)) * lat_seconds,
         (_ARC * _EARTH_EQUATORIAL_RADIUS_AU) / (0.999953253 * SINPI)
@@ -2351,6 +2955,45 @@ def GeoMoon(time: Time) -> Vector:
     return Vector(mpos2[0], mpos2[1], mpos2[2], time)
 
 
+def GeoMoonArray(times: TimeArray) -> VectorArray:
+    """Calculates equatorial geocentric positions of the Moon for every time in a #TimeArray.
+
+    This is the batch variant of #GeoMoon.
+
+    Parameters
+    ----------
+    times : TimeArray
+        The dates and times for which to calculate the Moon's position.
+
+    Returns
+    -------
+    VectorArray
+        The Moon's positions as vectors in J2000 Cartesian equatorial coordinates (EQJ).
+    """
+    _RequireNumpy()
+    (lon, lat, dist) = _CalcMoonArray(times.tt)
+    # Convert geocentric ecliptic spherical coordinates to Cartesian coordinates.
+    dist_cos_lat = dist * _np.cos(lat)
+    ex = dist_cos_lat * _np.cos(lon)
+    ey = dist_cos_lat * _np.sin(lon)
+    ez = dist * _np.sin(lat)
+    # Convert ecliptic coordinates to equatorial coordinates, both in mean equinox of date.
+    obl_rad = _np.radians(_mean_obliq(times.tt))
+    cos_obl = _np.cos(obl_rad)
+    sin_obl = _np.sin(obl_rad)
+    qx = ex
+    qy = ey*cos_obl - ez*sin_obl
+    qz = ey*sin_obl + ez*cos_obl
+    # Convert from mean equinox of date to J2000.
+    (xx, yx, zx, xy, yy, zy, xz, yz, zz) = _precession_elements(times.tt, _np.sin, _np.cos)
+    return VectorArray(
+        xx*qx + xy*qy + xz*qz,
+        yx*qx + yy*qy + yz*qz,
+        zx*qx + zy*qy + zz*qz,
+        times
+    )
+
+
 def EclipticGeoMoon(time: Time) -> Spherical:
     """Calculates spherical ecliptic geocentric position of the Moon.
 
@@ -2395,7 +3038,7 @@ def EclipticGeoMoon(time: Time) -> Spherical:
 
     # Obtain true and mean obliquity angles for the given time.
     # This serves to pre-calculate the nutation also, and cache it in `time`.
-    et = _e_tilt(time)
+    et = time._etilt()
 
     # Convert ecliptic coordinates to equatorial coordinates, both in mean equinox of date.
     eqm = _obl_ecl2equ_vec(et.mobl, ecm)
@@ -2418,8 +3061,10 @@ def GeoMoonState(time: Time) -> StateVector:
     The velocity (vx, vy, vz) components are expressed in AU/day.
     The coordinates are oriented with respect to the Earth's equator at the J2000 epoch.
     In Astronomy Engine, this orientation is called EQJ.
+    The velocity is calculated analytically from the time derivatives of the
+    lunar series, in the same pass that calculates the position.
     If you need the Moon's position only, and not its velocity,
-    it is much more efficient to use #GeoMoon instead.
+    it is more efficient to use #GeoMoon instead.
 
     Parameters
     ----------
@@ -2431,26 +3076,53 @@ def GeoMoonState(time: Time) -> StateVector:
     StateVector
         The Moon's position and velocity vectors in J2000 equatorial coordinates (EQJ).
     """
-    # This is a hack, because trying to figure out how to derive a time
-    # derivative for CalcMoon() would be extremely painful!
-    # Calculate just before and just after the given time.
-    # Average to find position, subtract to find velocity.
-    dt = 1.0e-5   # 0.864 seconds
-    t1 = time.AddDays(-dt)
-    t2 = time.AddDays(+dt)
-    r1 = GeoMoon(t1)
-    r2 = GeoMoon(t2)
+    (moon, dlon, dlat, ddist) = _CalcMoonTheoryRates(time)
+    _MoonPositionCache.put(time.tt, moon)
+
+    # Convert geocentric ecliptic spherical coordinates and their rates to Cartesian coordinates.
+    coslon = math.cos(moon.geo_eclip_lon)
+    sinlon = math.sin(moon.geo_eclip_lon)
+    coslat = math.cos(moon.geo_eclip_lat)
+    sinlat = math.sin(moon.geo_eclip_lat)
+    dist = moon.distance_au
+    dist_cos_lat = dist * coslat
+    gepos = [dist_cos_lat * coslon, dist_cos_lat * sinlon, dist * sinlat]
+    gevel = [
+        ddist*coslat*coslon - dist*sinlat*coslon*dlat - dist_cos_lat*sinlon*dlon,
+        ddist*coslat*sinlon - dist*sinlat*sinlon*dlat + dist_cos_lat*coslon*dlon,
+        ddist*sinlat + dist_cos_lat*dlat
+    ]
+
+    # Rotate from the mean ecliptic of date to J2000, as GeoMoon does.
+    pos = _MoonEclipticToJ2000(time.tt, gepos)
+    vel = _MoonEclipticToJ2000(time.tt, gevel)
+
+    # The ecliptic of date itself turns very slowly (precession is about 50 arcseconds per year).
+    # Add the velocity that this contributes, using a central difference of the rotation only.
+    # Over +/- 1 day the rotation is so smooth that the difference error is negligible.
+    dt = 1.0
+    r1 = _MoonEclipticToJ2000(time.tt - dt, gepos)
+    r2 = _MoonEclipticToJ2000(time.tt + dt, gepos)
     return StateVector(
-        (r1.x + r2.x) / 2,
-        (r1.y + r2.y) / 2,
-        (r1.z + r2.z) / 2,
-        (r2.x - r1.x) / (2 * dt),
-        (r2.y - r1.y) / (2 * dt),
-        (r2.z - r1.z) / (2 * dt),
+        pos[0], pos[1], pos[2],
+        vel[0] + (r2[0] - r1[0])/(2*dt),
+        vel[1] + (r2[1] - r1[1])/(2*dt),
+        vel[2] + (r2[2] - r1[2])/(2*dt),
         time
     )
 
 
+def _MoonEclipticToJ2000(tt: float, ecm: List[float]) -> List[float]:
+    # Convert mean ecliptic of date (ECM) to mean equator of date, then precess to J2000 (EQJ).
+    eqm = _obl_ecl2equ_vec(_mean_obliq(tt), ecm)
+    (xx, yx, zx, xy, yy, zy, xz, yz, zz) = _precession_elements(tt, math.sin, math.cos)
+    return [
+        xx*eqm[0] + xy*eqm[1] + xz*eqm[2],
+        yx*eqm[0] + yy*eqm[1] + yz*eqm[2],
+        zx*eqm[0] + zy*eqm[1] + zz*eqm[2]
+    ]
+
+
 def GeoEmbState(time: Time) -> StateVector:
     """Calculates the geocentric position and velocity of the Earth/Moon barycenter.
 
@@ -3143,24 +3815,54 @@ def _VsopFormula(formula: _vsop_formula_t, t: float, clamp_angle: bool) -> float
         tpower *= t
     return coord
 
-def _VsopDeriv(formula: _vsop_formula_t, t: float) -> float:
+def _VsopFormulaDeriv(formula: _vsop_formula_t, t: float, clamp_angle: bool) -> Tuple[float, float]:
+    # Calculates the same value as _VsopFormula, along with its derivative with respect to t,
+    # in a single pass so that each term's angle, cosine, and sine are calculated only once.
     tpower = 1.0      # t**s
     dpower = 0.0      # t**(s-1)
+    coord = 0.0
     deriv = 0.0
     s = 0
     for series in formula.seriesList:
         sin_sum = 0.0
         cos_sum = 0.0
         for (ampl, phas, freq) in series.termList:
-            angle = phas + (t * freq)
+            angle = phas + (freq * t)
+            cos_sum += ampl * math.cos(angle)
             sin_sum += ampl * freq * math.sin(angle)
-            if s > 0:
-                cos_sum += ampl * math.cos(angle)
+        incr = tpower * cos_sum
+        if clamp_angle:
+            incr = math.fmod(incr, _PI2)
+        coord += incr
         deriv += (s * dpower * cos_sum) - (tpower * sin_sum)
         dpower = tpower
         tpower *= t
         s += 1
-    return deriv
+    return (coord, deriv)
+
+def _VsopFormulaRates(formula: _vsop_formula_t, t: float) -> Tuple[float, float, float]:
+    # Like _VsopFormulaDeriv without angle clamping, but also returns the second derivative.
+    coord = deriv = deriv2 = 0.0
+    s = 0
+    for series in formula.seriesList:
+        cos_sum = 0.0
+        sin_sum = 0.0
+        cos2_sum = 0.0
+        for (ampl, phas, freq) in series.termList:
+            angle = phas + (freq * t)
+            c = ampl * math.cos(angle)
+            cos_sum += c
+            sin_sum += ampl * freq * math.sin(angle)
+            cos2_sum += c * freq * freq
+        # Each series is t**s times a sum of cosines; differentiate the product.
+        p0 = t**s
+        p1 = s * t**(s-1) if s > 0 else 0.0
+        p2 = s * (s-1) * t**(s-2) if s > 1 else 0.0
+        coord += p0 * cos_sum
+        deriv += p1*cos_sum - p0*sin_sum
+        deriv2 += p2*cos_sum - 2*p1*sin_sum - p0*cos2_sum
+        s += 1
+    return (coord, deriv, deriv2)
 
 _DAYS_PER_MILLENNIUM = 365250.0
 
@@ -3204,13 +3906,9 @@ class _body_state_t:
 def _CalcVsopPosVel(model: _vsop_model_t, tt: float) -> _body_state_t:
     t = tt / _DAYS_PER_MILLENNIUM
 
-    lon = _VsopFormula(model.lon, t, True)
-    lat = _VsopFormula(model.lat, t, False)
-    rad = _VsopFormula(model.rad, t, False)
-
-    dlon_dt = _VsopDeriv(model.lon, t)
-    dlat_dt = _VsopDeriv(model.lat, t)
-    drad_dt = _VsopDeriv(model.rad, t)
+    (lon, dlon_dt) = _VsopFormulaDeriv(model.lon, t, True)
+    (lat, dlat_dt) = _VsopFormulaDeriv(model.lat, t, False)
+    (rad, drad_dt) = _VsopFormulaDeriv(model.rad, t, False)
 
     # Use spherical coords and spherical derivatives to calculate
     # the velocity vector in rectangular coordinates.
@@ -3271,8 +3969,319 @@ def _VsopHelioDistance(model: _vsop_model_t, time: Time) -> float:
     # There is no need to translate coordinates.
     return _VsopFormula(model.rad, time.tt / _DAYS_PER_MILLENNIUM, False)
 
-def _CalcEarth(time: Time) -> Vector:
-    return _CalcVsop(_vsop[Body.Earth.value], time)
+def _VsopHelioDistanceRates(model: _vsop_model_t, time: Time) -> Tuple[float, float, float]:
+    # Returns the distance in AU, with its first and second derivatives in AU/day and AU/day^2.
+    (r, dr, ddr) = _VsopFormulaRates(model.rad, time.tt / _DAYS_PER_MILLENNIUM)
+    return (r, dr / _DAYS_PER_MILLENNIUM, ddr / (_DAYS_PER_MILLENNIUM * _DAYS_PER_MILLENNIUM))
+
+
+# Truncated VSOP87 models.
+# Most VSOP87 terms have tiny amplitudes. Callers that only need coarse positions
+# can ask for a tier that drops the smallest terms, as long as the sum of everything
+# dropped stays within the tier's error budget.
+
+@enum.unique
+class VsopAccuracy(enum.Enum):
+    """Selects how many VSOP87 terms are summed when calculating planet positions.
+
+    Coarser tiers drop the smallest terms of the VSOP87 series, which makes
+    planet positions faster to calculate at the cost of accuracy.
+    Each tier has an error budget for the direction of a planet as seen from
+    the Sun or from the Earth (the Sun's direction, in the Earth's case).
+    The geocentric error counts both the planet's and the Earth's position error,
+    divided by the closest the planet comes to the Earth, so the inner planets
+    keep more terms than the budget alone would suggest.
+    Terms are dropped only while the sum of their amplitudes, over the years 0..4000,
+    stays within that allowance, so the actual error is usually well inside the budget.
+    Use #SetVsopAccuracy to select a tier globally, or pass one to
+    #HelioVector, #GeoVector, and related functions for a single call.
+
+    The series built into Astronomy Engine are already truncated VSOP87,
+    so `ArcSecond` keeps every term, and the savings of the coarser tiers are modest.
+    The time to calculate a position is roughly proportional to the number of terms.
+    This table lists the terms kept by each tier, and the largest geocentric error
+    in arcseconds (heliocentric for the Earth) over the years 1800..2200:
+
+    | Planet  | Full | ArcSecond  | TenArcSeconds | ArcMinute | TenArcMinutes |
+    |---------|------|------------|---------------|-----------|---------------|
+    | Mercury |  29  |  29, 0.004 |  29, 0.51     | 27, 17.6  | 23,  88       |
+    | Venus   |  26  |  26, 0.005 |  26, 1.08     | 22, 10.7  | 13,  65       |
+    | Earth   |  51  |  51, 0.004 |  47, 0.26     | 39,  2.1  | 18,  14       |
+    | Mars    |  91  |  91, 0.004 |  90, 2.15     | 84,  9.1  | 52,  48       |
+    | Jupiter |  72  |  72, 0.004 |  70, 2.54     | 63, 20.3  | 39,  90       |
+    | Saturn  |  91  |  91, 0.006 |  88, 2.02     | 79, 13.0  | 52, 139       |
+    | Uranus  |  76  |  76, 0.004 |  74, 2.08     | 64, 12.7  | 32, 186       |
+    | Neptune |  30  |  30, 0.003 |  28, 0.05     | 25, 19.3  | 13, 184       |
+
+    Measured speedups of `TenArcMinutes` over `Full` range from about 1.1
+    (Mercury) to 2.4 (Earth); the finer tiers gain less.
+    Run `python benchmark.py tiers` to measure the speed and error of each tier.
+
+    Values
+    ------
+    Full:          Sum every VSOP87 term. This is the default.
+    ArcSecond:     Error budget of 1 arcsecond.
+    TenArcSeconds: Error budget of 10 arcseconds.
+    ArcMinute:     Error budget of 1 arcminute.
+    TenArcMinutes: Error budget of 10 arcminutes.
+    """
+    Full = 0
+    ArcSecond = 1
+    TenArcSeconds = 2
+    ArcMinute = 3
+    TenArcMinutes = 4
+
+# The error budget of each tier, in arcseconds.
+_VsopAccuracyBudget = {
+    VsopAccuracy.Full:           0.0,
+    VsopAccuracy.ArcSecond:      1.0,
+    VsopAccuracy.TenArcSeconds: 10.0,
+    VsopAccuracy.ArcMinute:     60.0,
+    VsopAccuracy.TenArcMinutes: 600.0,
+}
+
+# For each body with a VSOP87 model: the largest distance from the Sun (AU),
+# and the smallest distance from the Earth (AU) over the years 0..4000.
+# For the Earth, the second value is its distance from the Sun.
+_VsopDistanceLimits = {
+    Body.Mercury: ( 0.467,  0.52),
+    Body.Venus:   ( 0.729,  0.26),
+    Body.Earth:   ( 1.017,  0.98),
+    Body.Mars:    ( 1.667,  0.37),
+    Body.Jupiter: ( 5.46,   3.93),
+    Body.Saturn:  (10.1,    7.99),
+    Body.Uranus:  (20.1,   17.2),
+    Body.Neptune: (30.4,   28.7),
+}
+
+_VsopAccuracyDefault = VsopAccuracy.Full
+_vsop_truncated: Dict[Tuple[int, VsopAccuracy], _vsop_model_t] = {}
+
+def SetVsopAccuracy(accuracy: VsopAccuracy) -> None:
+    """Selects the VSOP87 accuracy tier used when a function is not given one.
+
+    Parameters
+    ----------
+    accuracy : VsopAccuracy
+        The tier to use by default. Initially this is `VsopAccuracy.Full`.
+    """
+    global _VsopAccuracyDefault
+    if not isinstance(accuracy, VsopAccuracy):
+        raise Error('Invalid VSOP accuracy: {}'.format(accuracy))
+    _VsopAccuracyDefault = accuracy
+
+def VsopAccuracyForBudget(arcseconds: float) -> VsopAccuracy:
+    """Returns the fastest VSOP87 accuracy tier whose error budget fits the given one.
+
+    Parameters
+    ----------
+    arcseconds : float
+        The largest direction error, as seen from the Sun or the Earth,
+        that the caller can tolerate, in arcseconds.
+
+    Returns
+    -------
+    VsopAccuracy
+        The coarsest tier whose budget does not exceed `arcseconds`,
+        or `VsopAccuracy.Full` if none does.
+    """
+    best = VsopAccuracy.Full
+    for (accuracy, budget) in _VsopAccuracyBudget.items():
+        if budget <= arcseconds and budget > _VsopAccuracyBudget[best]:
+            best = accuracy
+    return best
+
+def _VsopTruncateFormula(formula: _vsop_formula_t, budget: float) -> _vsop_formula_t:
+    # Term k of series s is multiplied by t**s, and |t| <= 2 millennia over the years 0..4000.
+    weighted = []
+    for (s, series) in enumerate(formula.seriesList):
+        for (k, (ampl, _, _)) in enumerate(series.termList):
+            weighted.append((abs(ampl) * (2.0 ** s), s, k))
+    weighted.sort()
+    dropped = set()
+    total = 0.0
+    for (weight, s, k) in weighted:
+        if total + weight > budget:
+            break
+        total += weight
+        dropped.add((s, k))
+    return _vsop_formula_t([
+        _vsop_series_t([term for (k, term) in enumerate(series.termList) if (s, k) not in dropped])
+        for (s, series) in enumerate(formula.seriesList)
+    ])
+
+def _VsopModel(body: Body, accuracy: Optional[VsopAccuracy]) -> _vsop_model_t:
+    if accuracy is None:
+        accuracy = _VsopAccuracyDefault
+    if accuracy == VsopAccuracy.Full:
+        return _vsop[body.value]
+    key = (body.value, accuracy)
+    model = _vsop_truncated.get(key)
+    if model is None:
+        full = _vsop[body.value]
+        budget = _VsopAccuracyBudget[accuracy] * _ASEC2RAD
+        # Seen from the Earth, the position errors of the planet and of the Earth
+        # both count, divided by the distance between them. The Earth's own series
+        # gets the error allowed at half the closest approach of any planet,
+        # and each planet gets the rest of what its own closest approach allows.
+        earth = budget * min(near for (_, near) in _VsopDistanceLimits.values()) / 2.0
+        if body == Body.Earth:
+            error = earth
+        else:
+            error = budget * _VsopDistanceLimits[body][1] - earth
+        # Split the position error between longitude, latitude, and distance,
+        # but never allow more than half the budget to either angle.
+        aphelion = _VsopDistanceLimits[body][0]
+        angle = min(budget / 2.0, error / (3.0 * aphelion))
+        distance = error / 3.0
+        model = _vsop_model_t(
+            _VsopTruncateFormula(full.lon, angle),
+            _VsopTruncateFormula(full.lat, angle),
+            _VsopTruncateFormula(full.rad, distance)
+        )
+        _vsop_truncated[key] = model
+    return model
+
+# The Earth's heliocentric position is needed again and again for the same instant:
+# by every planet's light-time iteration, by the Moon and EMB, by illumination
+# and barycenter calculations, and so on. Remember recent results, keyed by TT.
+_EarthPositionCache = _InstantCache('EarthPosition', 4096)
+_EarthStateCache = _InstantCache('EarthState', 4096)
+
+def _CalcEarth(time: Time, accuracy: Optional[VsopAccuracy] = None) -> Vector:
+    key = (time.tt, accuracy or _VsopAccuracyDefault)
+    pos = _EarthPositionCache.get(key)
+    if pos is None:
+        vec = _CalcVsop(_VsopModel(Body.Earth, key[1]), time)
+        _EarthPositionCache.put(key, (vec.x, vec.y, vec.z))
+        return vec
+    return Vector(pos[0], pos[1], pos[2], time)
+
+def _CalcEarthPosVel(tt: float, accuracy: Optional[VsopAccuracy] = None) -> _body_state_t:
+    key = (tt, accuracy or _VsopAccuracyDefault)
+    state = _EarthStateCache.get(key)
+    if state is None:
+        earth = _CalcVsopPosVel(_VsopModel(Body.Earth, key[1]), tt)
+        (r, v) = (earth.r, earth.v)
+        _EarthStateCache.put(key, (r.x, r.y, r.z, v.x, v.y, v.z))
+        # The position part is identical to what _CalcEarth calculates.
+        _EarthPositionCache.put(key, (r.x, r.y, r.z))
+        return earth
+    return _body_state_t(tt, _TerseVector(state[0], state[1], state[2]), _TerseVector(state[3], state[4], state[5]))
+
+# Batch evaluation of VSOP87 over many times.
+# Each series is packed once into contiguous (amplitude, phase, frequency) arrays,
+# so a whole array of times can be evaluated with one outer product per series.
+# Times are processed in chunks so the (times x terms) angle matrix stays small.
+
+_VSOP_CHUNK_ELEMENTS = 1 << 20
+
+class _vsop_packed_t:
+    def __init__(self, model: _vsop_model_t) -> None:
+        self.lon = _VsopPackFormula(model.lon)
+        self.lat = _VsopPackFormula(model.lat)
+        self.rad = _VsopPackFormula(model.rad)
+        self.maxterms = max(len(ampl) for formula in (self.lon, self.lat, self.rad) for (ampl, _, _) in formula)
+
+def _VsopPackFormula(formula: _vsop_formula_t) -> List[Tuple[Any, Any, Any]]:
+    packed = []
+    for series in formula.seriesList:
+        terms = _np.array(series.termList, dtype=_np.float64).reshape(-1, 3)
+        packed.append((
+            _np.ascontiguousarray(terms[:, 0]),
+            _np.ascontiguousarray(terms[:, 1]),
+            _np.ascontiguousarray(terms[:, 2])
+        ))
+    return packed
+
+_vsop_packed: Dict[Tuple[int, VsopAccuracy], _vsop_packed_t] = {}
+
+def _VsopPacked(body: Body, accuracy: Optional[VsopAccuracy]) -> _vsop_packed_t:
+    if accuracy is None:
+        accuracy = _VsopAccuracyDefault
+    key = (body.value, accuracy)
+    packed = _vsop_packed.get(key)
+    if packed is None:
+        packed = _vsop_packed[key] = _vsop_packed_t(_VsopModel(body, accuracy))
+    return packed
+
+def _VsopFormulaArray(formula: List[Tuple[Any, Any, Any]], t: Any, clamp_angle: bool, deriv: bool) -> Tuple[Any, Any]:
+    # Vectorized form of _VsopFormula, or of _VsopFormulaDeriv when `deriv` is true, over an array of times `t`.
+    coord = _np.zeros_like(t)
+    rate = _np.zeros_like(t) if deriv else None
+    tpower = _np.ones_like(t)
+    dpower = _np.zeros_like(t)
+    for (s, (ampl, phas, freq)) in enumerate(formula):
+        angle = phas + _np.multiply.outer(t, freq)
+        cos_angle = _np.cos(angle)
+        cos_sum = cos_angle @ ampl
+        incr = tpower * cos_sum
+        if clamp_angle:
+            # Longitude angles can be hundreds of radians.
+            # Improve precision by keeping each increment within [-2*pi, +2*pi].
+            incr = _np.fmod(incr, _PI2)
+        coord += incr
+        if deriv:
+            sin_sum = _np.sin(angle) @ (ampl * freq)
+            rate += (s * dpower * cos_sum) - (tpower * sin_sum)
+            dpower = tpower
+        tpower = tpower * t
+    return (coord, rate)
+
+def _CalcVsopArrayChunk(packed: _vsop_packed_t, tt: Any, deriv: bool) -> Tuple[Any, ...]:
+    t = tt / _DAYS_PER_MILLENNIUM
+    (lon, dlon_dt) = _VsopFormulaArray(packed.lon, t, True, deriv)
+    (lat, dlat_dt) = _VsopFormulaArray(packed.lat, t, False, deriv)
+    (rad, drad_dt) = _VsopFormulaArray(packed.rad, t, False, deriv)
+
+    coslon = _np.cos(lon)
+    sinlon = _np.sin(lon)
+    coslat = _np.cos(lat)
+    sinlat = _np.sin(lat)
+    r_coslat = rad * coslat
+    ex = r_coslat * coslon
+    ey = r_coslat * sinlon
+    ez = rad * sinlat
+    pos = _VsopRotateArray(ex, ey, ez)
+    if not deriv:
+        return pos
+
+    vx = (
+        + (drad_dt * coslat * coslon)
+        - (rad * sinlat * coslon * dlat_dt)
+        - (rad * coslat * sinlon * dlon_dt)
+    )
+    vy = (
+        + (drad_dt * coslat * sinlon)
+        - (rad * sinlat * sinlon * dlat_dt)
+        + (rad * coslat * coslon * dlon_dt)
+    )
+    vz = (
+        + (drad_dt * sinlat)
+        + (rad * coslat * dlat_dt)
+    )
+    # Convert speed units from [AU/millennium] to [AU/day].
+    vel = _VsopRotateArray(vx / _DAYS_PER_MILLENNIUM, vy / _DAYS_PER_MILLENNIUM, vz / _DAYS_PER_MILLENNIUM)
+    return pos + vel
+
+def _VsopRotateArray(x: Any, y: Any, z: Any) -> Tuple[Any, Any, Any]:
+    # Same as _VsopRotate, but for arrays of coordinates.
+    return (
+        x + 0.000000440360*y - 0.000000190919*z,
+        -0.000000479966*x + 0.917482137087*y - 0.397776982902*z,
+        0.397776982902*y + 0.917482137087*z
+    )
+
+def _CalcVsopArray(body: Body, tt: Any, deriv: bool, accuracy: Optional[VsopAccuracy] = None) -> Any:
+    # Returns a (3, n) array of heliocentric EQJ positions, or a (6, n) array
+    # of positions and velocities when `deriv` is true, for the times in `tt`.
+    packed = _VsopPacked(body, accuracy)
+    n = len(tt)
+    out = _np.empty((6 if deriv else 3, n))
+    chunk = max(1, _VSOP_CHUNK_ELEMENTS // packed.maxterms)
+    for start in range(0, n, chunk):
+        out[:, start:start+chunk] = _CalcVsopArrayChunk(packed, tt[start:start+chunk], deriv)
+    return out
 
 # END VSOP
 #----------------------------------------------------------------------------
@@ -3390,6 +4399,8 @@ class _major_bodies_t:
 
 
 class _body_grav_calc_t:
+    __slots__ = ('tt', 'r', 'v', 'a')
+
     def __init__(self, tt: float, r: _TerseVector, v: _TerseVector, a: _TerseVector) -> None:
         self.tt = tt    # J2000 terrestrial time [days]
         self.r = r      # position [au]
@@ -3445,6 +4456,11 @@ def _GravSim(tt2: float, calc1: _body_grav_calc_t) -> _grav_sim_t:
 
 _pluto_cache: List[Optional[List[_body_grav_calc_t]]] = [None] * (_PLUTO_NUM_STATES - 1)
 
+# Each segment has its own lock, so that threads needing the same segment wait
+# for one of them to build it, while different segments can be built at once.
+# A segment is stored in the cache only after it is complete.
+_pluto_segment_locks = [threading.Lock() for _ in range(_PLUTO_NUM_STATES - 1)]
+
 
 def _ClampIndex(frac: float, nsteps: int) -> int:
     index = math.floor(frac)
@@ -3470,48 +4486,91 @@ def _GetSegment(cache: List[Optional[List[_body_grav_calc_t]]], tt: float) -> Op
         return None
 
     seg_index = _ClampIndex((tt - _PlutoStateTable[0].tt) / _PLUTO_TIME_STEP, _PLUTO_NUM_STATES-1)
-    if cache[seg_index] is None:
-        seg = cache[seg_index] = [ _GravFromState(_PlutoStateTable[seg_index]).grav ]
-
-        # Simulate forwards from the lower time bound.
-        step_tt = seg[0].tt
-        i = 1
-        while i < _PLUTO_NSTEPS-1:
-            step_tt += _PLUTO_DT
-            seg.append(_GravSim(step_tt, seg[i-1]).grav)
-            i += 1
-        seg.append(_GravFromState(_PlutoStateTable[seg_index + 1]).grav)
-
-        # Simulate backwards from the upper time bound.
-        # Tricky: the reverse list will be one element shorter than `seg`,
-        # because we don't need to fade-mix the first time slot in reverse.
-        step_tt = seg[_PLUTO_NSTEPS-1].tt
-        reverse = [ seg[-1] ]
-        i = _PLUTO_NSTEPS - 2
-        while i > 0:
-            step_tt -= _PLUTO_DT
-            reverse.append(_GravSim(step_tt, reverse[-1]).grav)
-            i -= 1
-        reverse.reverse()
-
-        # Fade-mix the two series so that there are no discontinuities.
-        i = _PLUTO_NSTEPS - 2
-        while i > 0:
-            ramp = i / (_PLUTO_NSTEPS-1)
-            seg[i].r = seg[i].r*(1 - ramp) + reverse[i-1].r*ramp
-            seg[i].v = seg[i].v*(1 - ramp) + reverse[i-1].v*ramp
-            seg[i].a = seg[i].a*(1 - ramp) + reverse[i-1].a*ramp
-            i -= 1
-
-    return cache[seg_index]
+    seg = cache[seg_index]
+    if seg is None:
+        with _pluto_segment_locks[seg_index]:
+            seg = cache[seg_index]
+            if seg is None:
+                cachefile = _PlutoCacheFile     # read once: another thread may replace it
+                if cachefile is not None:
+                    seg = cachefile.Segment(seg_index)
+                else:
+                    seg = _BuildSegment(seg_index)
+                cache[seg_index] = seg
+    return seg
+
+
+def _BuildSegment(seg_index: int) -> List[_body_grav_calc_t]:
+    seg = [ _GravFromState(_PlutoStateTable[seg_index]).grav ]
+
+    # Simulate forwards from the lower time bound.
+    step_tt = seg[0].tt
+    i = 1
+    while i < _PLUTO_NSTEPS-1:
+        step_tt += _PLUTO_DT
+        seg.append(_GravSim(step_tt, seg[i-1]).grav)
+        i += 1
+    seg.append(_GravFromState(_PlutoStateTable[seg_index + 1]).grav)
+
+    # Simulate backwards from the upper time bound.
+    # Tricky: the reverse list will be one element shorter than `seg`,
+    # because we don't need to fade-mix the first time slot in reverse.
+    step_tt = seg[_PLUTO_NSTEPS-1].tt
+    reverse = [ seg[-1] ]
+    i = _PLUTO_NSTEPS - 2
+    while i > 0:
+        step_tt -= _PLUTO_DT
+        reverse.append(_GravSim(step_tt, reverse[-1]).grav)
+        i -= 1
+    reverse.reverse()
+
+    # Fade-mix the two series so that there are no discontinuities.
+    i = _PLUTO_NSTEPS - 2
+    while i > 0:
+        ramp = i / (_PLUTO_NSTEPS-1)
+        seg[i].r = seg[i].r*(1 - ramp) + reverse[i-1].r*ramp
+        seg[i].v = seg[i].v*(1 - ramp) + reverse[i-1].v*ramp
+        seg[i].a = seg[i].a*(1 - ramp) + reverse[i-1].a*ramp
+        i -= 1
+
+    return seg
+
+
+# Outside the state table, Pluto is integrated outward from the nearest end of
+# the table in steps of _PLUTO_DT days. The state after every _PLUTO_CHECKPOINT_STEPS
+# steps is kept, separately for each direction, so that later calculations can
+# resume from the nearest checkpoint instead of starting over at the table edge.
+# Resuming repeats exactly the same steps, so the results do not change.
+
+_PLUTO_CHECKPOINT_STEPS = 50
+_pluto_checkpoints: List[List[_body_grav_calc_t]] = [[], []]    # [backward from year 0000, forward from year 4000]
+_pluto_checkpoint_lock = threading.Lock()
 
 
 def _CalcPlutoOneWay(entry: _pstate, target_tt: float, dt: float) -> _grav_sim_t:
     sim = _GravFromState(entry)
     n = math.ceil((target_tt - sim.grav.tt) / dt)
-    for i in range(n):
-        sim = _GravSim(target_tt if (i+1 == n) else (sim.grav.tt + dt), sim.grav)
-    return sim
+    if n < 1:
+        return sim
+    checkpoints = _pluto_checkpoints[1 if dt > 0.0 else 0]
+    if not checkpoints:
+        with _pluto_checkpoint_lock:
+            if not checkpoints:
+                checkpoints.append(sim.grav)
+    # Take n-1 whole steps, starting from the last checkpoint that does not pass them.
+    k = min((n - 1) // _PLUTO_CHECKPOINT_STEPS, len(checkpoints) - 1)
+    grav = checkpoints[k]
+    step = k * _PLUTO_CHECKPOINT_STEPS
+    while step < n - 1:
+        grav = _GravSim(grav.tt + dt, grav).grav
+        step += 1
+        if step == len(checkpoints) * _PLUTO_CHECKPOINT_STEPS:
+            # Another thread may have stored this checkpoint in the meantime.
+            with _pluto_checkpoint_lock:
+                if step == len(checkpoints) * _PLUTO_CHECKPOINT_STEPS:
+                    checkpoints.append(grav)
+    # Take the final, partial step to the target time.
+    return _GravSim(target_tt, grav)
 
 
 def _CalcPluto(time: Time, helio: bool) -> StateVector:
@@ -3519,8 +4578,8 @@ def _CalcPluto(time: Time, helio: bool) -> StateVector:
     seg = _GetSegment(_pluto_cache, time.tt)
     if seg is None:
         # The target time is outside the year range 0000..4000.
-        # Calculate it by crawling backward from 0000 or forward from 4000.
-        # FIXFIXFIX - This is super slow. Could optimize this with extra caching if needed.
+        # Calculate it by crawling backward from 0000 or forward from 4000,
+        # resuming from the nearest checkpoint kept by earlier calculations.
         if time.tt < _PlutoStateTable[0].tt:
             sim = _CalcPlutoOneWay(_PlutoStateTable[0], time.tt, -_PLUTO_DT)
         else:
@@ -3559,6 +4618,296 @@ def _CalcPluto(time: Time, helio: bool) -> StateVector:
     return StateVector(r.x, r.y, r.z, v.x, v.y, v.z, time)
 
 
+# Optional on-disk cache of the integrator segments.
+# Building a segment takes about 400 gravity simulation steps, each of which
+# evaluates four VSOP87 models. A cache file holds every fade-mixed segment
+# so that new processes can map it into memory and unpack segments on demand.
+#
+# Layout (little-endian):
+#     header:   magic, version, checksum of the Pluto state table, segment count, steps per segment
+#     index:    one CRC-32 per segment
+#     segments: each step as 10 doubles (tt, r.x, r.y, r.z, v.x, v.y, v.z, a.x, a.y, a.z)
+
+_PLUTO_CACHE_MAGIC = b'AEPLUTO\x00'
+_PLUTO_CACHE_VERSION = 1
+_PLUTO_CACHE_HEADER = struct.Struct('<8sIIII')
+_PLUTO_CACHE_INDEX = struct.Struct('<{}I'.format(_PLUTO_NUM_STATES - 1))
+_PLUTO_CACHE_SEGMENT = struct.Struct('<{}d'.format(10 * _PLUTO_NSTEPS))
+
+
+def _PlutoTableChecksum() -> int:
+    # The segments depend on the state table and the integrator settings,
+    # so a cache file built from a different table must not be used.
+    data = struct.pack('<IIdd', _PLUTO_NUM_STATES, _PLUTO_NSTEPS, _PLUTO_TIME_STEP, _PLUTO_DT)
+    for entry in _PlutoStateTable:
+        data += struct.pack('<7d', entry.tt, entry.pos.x, entry.pos.y, entry.pos.z, entry.vel.x, entry.vel.y, entry.vel.z)
+    return zlib.crc32(data)
+
+
+def _GravValues(grav: _body_grav_calc_t) -> Tuple[float, ...]:
+    return (grav.tt, grav.r.x, grav.r.y, grav.r.z, grav.v.x, grav.v.y, grav.v.z, grav.a.x, grav.a.y, grav.a.z)
+
+
+def _GravFromValues(c: Tuple[float, ...], k: int) -> _body_grav_calc_t:
+    return _body_grav_calc_t(
+        c[k],
+        _TerseVector(c[k+1], c[k+2], c[k+3]),
+        _TerseVector(c[k+4], c[k+5], c[k+6]),
+        _TerseVector(c[k+7], c[k+8], c[k+9])
+    )
+
+
+def _PackSegment(seg: List[_body_grav_calc_t]) -> bytes:
+    return _PLUTO_CACHE_SEGMENT.pack(*(c for s in seg for c in _GravValues(s)))
+
+
+def _UnpackSegment(block: bytes) -> List[_body_grav_calc_t]:
+    c = _PLUTO_CACHE_SEGMENT.unpack(block)
+    return [_GravFromValues(c, k) for k in range(0, len(c), 10)]
+
+
+def _InstallSegment(seg_index: int, seg: List[_body_grav_calc_t]) -> None:
+    # Keeps a segment built elsewhere, unless this process already has one.
+    with _pluto_segment_locks[seg_index]:
+        if _pluto_cache[seg_index] is None:
+            _pluto_cache[seg_index] = seg
+
+
+class _pluto_cache_file_t:
+    def __init__(self, filename: str) -> None:
+        self.filename = filename
+        with open(filename, 'rb') as infile:
+            try:
+                self.data = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise EphemerisFileError(filename, 'file is empty')
+        size = _PLUTO_CACHE_HEADER.size + _PLUTO_CACHE_INDEX.size + (_PLUTO_NUM_STATES - 1)*_PLUTO_CACHE_SEGMENT.size
+        if len(self.data) != size:
+            found = len(self.data)
+            self.close()
+            raise EphemerisFileError(filename, 'expected {} bytes but found {}'.format(size, found))
+        (magic, version, checksum, nseg, nsteps) = _PLUTO_CACHE_HEADER.unpack_from(self.data, 0)
+        reason = None
+        if magic != _PLUTO_CACHE_MAGIC:
+            reason = 'not a Pluto segment cache'
+        elif version != _PLUTO_CACHE_VERSION:
+            reason = 'unsupported version {}'.format(version)
+        elif checksum != _PlutoTableChecksum() or nseg != _PLUTO_NUM_STATES - 1 or nsteps != _PLUTO_NSTEPS:
+            reason = 'built from a different Pluto state table'
+        if reason is not None:
+            self.close()
+            raise EphemerisFileError(filename, reason)
+        self.crc = _PLUTO_CACHE_INDEX.unpack_from(self.data, _PLUTO_CACHE_HEADER.size)
+
+    def close(self) -> None:
+        self.data.close()
+
+    def Segment(self, seg_index: int) -> List[_body_grav_calc_t]:
+        offset = _PLUTO_CACHE_HEADER.size + _PLUTO_CACHE_INDEX.size + seg_index*_PLUTO_CACHE_SEGMENT.size
+        block = self.data[offset : offset + _PLUTO_CACHE_SEGMENT.size]
+        if zlib.crc32(block) != self.crc[seg_index]:
+            raise EphemerisFileError(self.filename, 'segment {} is corrupt'.format(seg_index))
+        return _UnpackSegment(block)
+
+
+_PlutoCacheFile: Optional[_pluto_cache_file_t] = None
+
+
+def _ReplaceFile(filename: str, blocks: List[bytes]) -> None:
+    # Writes the file under a unique temporary name in the same directory and then renames it,
+    # so that neither readers of the old file nor other writers ever see a partial file.
+    (handle, tempname) = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filename)))
+    try:
+        with os.fdopen(handle, 'wb') as outfile:
+            for block in blocks:
+                outfile.write(block)
+        # mkstemp makes the file private; the file is meant to be shared with other processes.
+        try:
+            mode = os.stat(filename).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o644
+        os.chmod(tempname, mode)
+        os.replace(tempname, filename)
+    except BaseException:
+        os.unlink(tempname)
+        raise
+
+
+def BuildPlutoCacheFile(filename: str) -> None:
+    """Writes a file containing every precomputed segment of the Pluto integrator.
+
+    Astronomy Engine calculates Pluto's position for the years 0000 to 4000
+    by numerically integrating its orbit, one segment of about 80 years at a time.
+    A new process has to integrate each segment the first time it is needed.
+    This function integrates all of them (this takes a while) and saves the
+    results, so that other processes can load them with #SetPlutoCacheFile
+    instead of integrating again.
+
+    The file is first written under a temporary name and then renamed,
+    so processes that are reading an older copy of the file are not disturbed.
+
+    Parameters
+    ----------
+    filename : str
+        The name of the file to create or overwrite.
+    """
+    crc = []
+    blocks = []
+    for seg_index in range(_PLUTO_NUM_STATES - 1):
+        seg = _GetSegment(_pluto_cache, _PlutoStateTable[seg_index].tt)
+        assert seg is not None
+        block = _PackSegment(seg)
+        crc.append(zlib.crc32(block))
+        blocks.append(block)
+    header = _PLUTO_CACHE_HEADER.pack(_PLUTO_CACHE_MAGIC, _PLUTO_CACHE_VERSION, _PlutoTableChecksum(), _PLUTO_NUM_STATES - 1, _PLUTO_NSTEPS)
+    _ReplaceFile(filename, [header, _PLUTO_CACHE_INDEX.pack(*crc)] + blocks)
+
+
+def SetPlutoCacheFile(filename: Optional[str]) -> None:
+    """Configures a file of precomputed Pluto integrator segments.
+
+    The file must have been written by #BuildPlutoCacheFile.
+    It is mapped into memory, and each segment is read from it the
+    first time Pluto's position is needed within that segment's time range.
+    The positions are exactly the same as when the segments are integrated.
+
+    This function may be called while other threads are calculating Pluto's position.
+    A file that is replaced stays mapped until no thread is reading from it any more.
+
+    Parameters
+    ----------
+    filename : str or `None`
+        The name of the cache file, or `None` to stop using a cache file
+        and integrate any segments not yet in memory.
+    """
+    global _PlutoCacheFile
+    # The old file is not closed here: it is unmapped when it is garbage collected.
+    _PlutoCacheFile = _pluto_cache_file_t(filename) if filename is not None else None
+
+
+def _PrewarmSegmentWorker(seg_index: int) -> bytes:
+    # Runs in a worker process: integrates one segment and returns it packed.
+    return _PackSegment(_BuildSegment(seg_index))
+
+
+def PrewarmPluto(time1: Time, time2: Time, workers: Optional[int] = None) -> int:
+    """Prepares the Pluto integrator segments needed for a range of times.
+
+    Astronomy Engine calculates Pluto's position for the years 0000 to 4000
+    from segments of numerical integration that are built the first time they
+    are needed, which takes a while for each segment. This function builds
+    every missing segment that overlaps the range `time1`..`time2`, in parallel
+    across a pool of worker processes, and installs them in this process.
+    Later Pluto calculations in the range then run at full speed.
+
+    Segments are read from the file configured by #SetPlutoCacheFile instead,
+    if there is one. Times outside the years 0000 to 4000 need no segments
+    and are ignored.
+
+    Parameters
+    ----------
+    time1 : Time
+        The start of the time range.
+    time2 : Time
+        The end of the time range.
+    workers : int, optional
+        The number of worker processes. If omitted, one per processor.
+        With 1, the segments are built in this process.
+
+    Returns
+    -------
+    int
+        The number of segments that were built or loaded.
+    """
+    tt1 = max(min(time1.tt, time2.tt), _PlutoStateTable[0].tt)
+    tt2 = min(max(time1.tt, time2.tt), _PlutoStateTable[_PLUTO_NUM_STATES-1].tt)
+    if tt1 > tt2:
+        return 0
+    first = _ClampIndex((tt1 - _PlutoStateTable[0].tt) / _PLUTO_TIME_STEP, _PLUTO_NUM_STATES-1)
+    last = _ClampIndex((tt2 - _PlutoStateTable[0].tt) / _PLUTO_TIME_STEP, _PLUTO_NUM_STATES-1)
+    missing = [k for k in range(first, last+1) if _pluto_cache[k] is None]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if _PlutoCacheFile is not None or workers <= 1 or len(missing) <= 1:
+        for seg_index in missing:
+            _GetSegment(_pluto_cache, _PlutoStateTable[seg_index].tt)
+        return len(missing)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=min(workers, len(missing))) as pool:
+        for (seg_index, block) in zip(missing, pool.map(_PrewarmSegmentWorker, missing)):
+            _InstallSegment(seg_index, _UnpackSegment(block))
+    return len(missing)
+
+
+# Checkpoint files hold the integrator states kept outside the state table.
+# Layout (little-endian):
+#     header:  magic, version, checksum of the Pluto state table, steps between checkpoints,
+#              number of backward checkpoints, number of forward checkpoints
+#     records: each checkpoint as 10 doubles, backward ones first
+
+_PLUTO_CHECKPOINT_MAGIC = b'AEPLCKPT'
+_PLUTO_CHECKPOINT_VERSION = 1
+_PLUTO_CHECKPOINT_HEADER = struct.Struct('<8sIIIII')
+_PLUTO_CHECKPOINT_RECORD = struct.Struct('<10d')
+
+
+def SavePlutoCheckpoints(filename: str) -> None:
+    """Saves the Pluto integrator checkpoints calculated so far to a file.
+
+    Astronomy Engine integrates Pluto's orbit outward from the year 0000 or 4000
+    to calculate its position at earlier or later times. The integrator state is
+    remembered at regular intervals, so that later calculations can resume from
+    the nearest one. This function saves those states, so that a new process can
+    restore them with #LoadPlutoCheckpoints instead of integrating all over again.
+
+    The file is first written under a temporary name and then renamed.
+
+    Parameters
+    ----------
+    filename : str
+        The name of the file to create or overwrite.
+    """
+    with _pluto_checkpoint_lock:
+        (backward, forward) = (list(_pluto_checkpoints[0]), list(_pluto_checkpoints[1]))
+    header = _PLUTO_CHECKPOINT_HEADER.pack(_PLUTO_CHECKPOINT_MAGIC, _PLUTO_CHECKPOINT_VERSION, _PlutoTableChecksum(), _PLUTO_CHECKPOINT_STEPS, len(backward), len(forward))
+    _ReplaceFile(filename, [header] + [_PLUTO_CHECKPOINT_RECORD.pack(*_GravValues(grav)) for grav in backward + forward])
+
+
+def LoadPlutoCheckpoints(filename: str) -> None:
+    """Restores Pluto integrator checkpoints saved by #SavePlutoCheckpoints.
+
+    Checkpoints already calculated in this process are kept when the file
+    holds fewer of them. Either way the calculated positions are the same;
+    the checkpoints only save time.
+
+    Parameters
+    ----------
+    filename : str
+        The name of the file to read.
+    """
+    with open(filename, 'rb') as infile:
+        data = infile.read()
+    if len(data) < _PLUTO_CHECKPOINT_HEADER.size:
+        raise EphemerisFileError(filename, 'file is too short')
+    (magic, version, checksum, steps, nback, nforward) = _PLUTO_CHECKPOINT_HEADER.unpack_from(data, 0)
+    if magic != _PLUTO_CHECKPOINT_MAGIC:
+        raise EphemerisFileError(filename, 'not a Pluto checkpoint file')
+    if version != _PLUTO_CHECKPOINT_VERSION:
+        raise EphemerisFileError(filename, 'unsupported version {}'.format(version))
+    if checksum != _PlutoTableChecksum() or steps != _PLUTO_CHECKPOINT_STEPS:
+        raise EphemerisFileError(filename, 'built from a different Pluto state table')
+    if len(data) != _PLUTO_CHECKPOINT_HEADER.size + (nback + nforward)*_PLUTO_CHECKPOINT_RECORD.size:
+        raise EphemerisFileError(filename, 'file has the wrong size')
+    offset = _PLUTO_CHECKPOINT_HEADER.size
+    for (direction, count) in ((0, nback), (1, nforward)):
+        loaded = []
+        for _ in range(count):
+            loaded.append(_GravFromValues(_PLUTO_CHECKPOINT_RECORD.unpack_from(data, offset), 0))
+            offset += _PLUTO_CHECKPOINT_RECORD.size
+        with _pluto_checkpoint_lock:
+            if len(loaded) > len(_pluto_checkpoints[direction]):
+                _pluto_checkpoints[direction] = loaded
+
+
 # END Pluto Integrator
 #----------------------------------------------------------------------------
 # BEGIN Jupiter Moons
@@ -3736,7 +5085,7 @@ class JupiterMoonsInfo:
     callisto : StateVector
         The position and velocity of Jupiter's moon Callisto.
     """
-    def __init__(self, moon: List[StateVector]) -> None:
+    def __init__(self, moon: List[Any]) -> None:
         self.io = moon[0]
         self.europa = moon[1]
         self.ganymede = moon[2]
@@ -3751,10 +5100,45 @@ class JupiterMoonsInfo:
         )
 
 
-def _JupiterMoon_elem2pv(time: Time, mu: float, A: float, AL: float, K: float, H: float, Q: float, P: float) -> StateVector:
+class JupiterMoonPositionsInfo:
+    """Holds the positions of Jupiter's major 4 moons.
+
+    The #JupiterMoonPositions function returns an object of this type
+    to report position vectors for Jupiter's largest 4 moons
+    Io, Europa, Ganymede, and Callisto. Each position vector is relative
+    to the center of Jupiter, oriented in the EQJ system, and
+    expressed in astronomical units (AU).
+
+    Attributes
+    ----------
+    io : Vector
+        The position of Jupiter's moon Io.
+    europa : Vector
+        The position of Jupiter's moon Europa.
+    ganymede : Vector
+        The position of Jupiter's moon Ganymede.
+    callisto : Vector
+        The position of Jupiter's moon Callisto.
+    """
+    def __init__(self, moon: List[Vector]) -> None:
+        self.io = moon[0]
+        self.europa = moon[1]
+        self.ganymede = moon[2]
+        self.callisto = moon[3]
+
+    def __repr__(self) -> str:
+        return 'JupiterMoonPositionsInfo(io={}, europa={}, ganymede={}, callisto={})'.format(
+            repr(self.io),
+            repr(self.europa),
+            repr(self.ganymede),
+            repr(self.callisto)
+        )
+
+
+def _JupiterMoon_elem2pv(time: Time, mu: float, A: float, AL: float, K: float, H: float, Q: float, P: float, velocity: bool = True) -> Any:
     # Translation of FORTRAN subroutine ELEM2PV from:
     # https://ftp.imcce.fr/pub/ephem/satel/galilean/L1/L1.2/
-    AN = math.sqrt(mu / (A*A*A))
+    # Returns a StateVector, or only a position Vector when `velocity` is false.
     EE = AL + K*math.sin(AL) - H*math.cos(AL)
     DE = 1.0
     while abs(DE) >= 1.0e-12:
@@ -3765,30 +5149,38 @@ def _JupiterMoon_elem2pv(time: Time, mu: float, A: float, AL: float, K: float, H
     CE = math.cos(EE)
     SE = math.sin(EE)
     DLE = H*CE - K*SE
-    RSAM1 = -K*CE - H*SE
-    ASR = 1.0/(1.0 + RSAM1)
     PHI = math.sqrt(1.0 - K*K - H*H)
     PSI = 1.0/(1.0 + PHI)
     X1 = A*(CE - K - PSI*H*DLE)
     Y1 = A*(SE - H + PSI*K*DLE)
-    VX1 = AN*ASR*A*(-SE - PSI*H*RSAM1)
-    VY1 = AN*ASR*A*(+CE + PSI*K*RSAM1)
     F2 = 2.0*math.sqrt(1.0 - Q*Q - P*P)
     P2 = 1.0 - 2.0*P*P
     Q2 = 1.0 - 2.0*Q*Q
     PQ = 2.0*P*Q
-    return StateVector(
-        X1*P2 + Y1*PQ,
-        X1*PQ + Y1*Q2,
-        (Q*Y1 - X1*P)*F2,
-        VX1*P2 + VY1*PQ,
+    if not velocity:
+        return Vector(
+            X1*P2 + Y1*PQ,
+            X1*PQ + Y1*Q2,
+            (Q*Y1 - X1*P)*F2,
+            time
+        )
+    AN = math.sqrt(mu / (A*A*A))
+    RSAM1 = -K*CE - H*SE
+    ASR = 1.0/(1.0 + RSAM1)
+    VX1 = AN*ASR*A*(-SE - PSI*H*RSAM1)
+    VY1 = AN*ASR*A*(+CE + PSI*K*RSAM1)
+    return StateVector(
+        X1*P2 + Y1*PQ,
+        X1*PQ + Y1*Q2,
+        (Q*Y1 - X1*P)*F2,
+        VX1*P2 + VY1*PQ,
         VX1*PQ + VY1*Q2,
         (Q*VY1 - VX1*P)*F2,
         time
     )
 
 
-def _CalcJupiterMoon(time: Time, model: _jm) -> StateVector:
+def _CalcJupiterMoon(time: Time, model: _jm, velocity: bool = True) -> Any:
     # This is a translation of FORTRAN code by Duriez, Lainey, and Vienne:
     # https://ftp.imcce.fr/pub/ephem/satel/galilean/L1/L1.2/
 
@@ -3822,9 +5214,11 @@ def _CalcJupiterMoon(time: Time, model: _jm) -> StateVector:
         elem5 += amplitude * math.sin(arg)
 
     # Convert the oribital elements into position vectors in the Jupiter equatorial system (JUP).
-    state = _JupiterMoon_elem2pv(time, model.mu, elem0, elem1, elem2, elem3, elem4, elem5)
+    state = _JupiterMoon_elem2pv(time, model.mu, elem0, elem1, elem2, elem3, elem4, elem5, velocity)
 
     # Re-orient position and velocity vectors from Jupiter-equatorial (JUP) to Earth-equatorial in J2000 (EQJ).
+    if not velocity:
+        return RotateVector(_Rotation_JUP_EQJ, state)
     return RotateState(_Rotation_JUP_EQJ, state)
 
 
@@ -3843,6 +5237,9 @@ def JupiterMoons(time: Time) -> JupiterMoonsInfo:
     add the jovicentric vectors. Likewise, you can call #GeoVector
     to convert to geocentric vectors.
 
+    If only the positions are needed, #JupiterMoonPositions is faster.
+    To calculate the moons for many times at once, #JupiterMoonsArray is much faster.
+
     Parameters
     ----------
     time : Time
@@ -3855,10 +5252,412 @@ def JupiterMoons(time: Time) -> JupiterMoonsInfo:
     """
     return JupiterMoonsInfo([_CalcJupiterMoon(time, model) for model in _JupiterMoonModel])
 
+
+def JupiterMoonPositions(time: Time) -> JupiterMoonPositionsInfo:
+    """Calculates jovicentric positions of Jupiter's largest 4 moons.
+
+    This is like #JupiterMoons, but skips the velocities, which saves time.
+    The positions are the same as those #JupiterMoons reports.
+
+    Parameters
+    ----------
+    time : Time
+        The date and time for which to calculate Jupiter's moons.
+
+    Returns
+    -------
+    JupiterMoonPositionsInfo
+        The positions of Jupiter's 4 largest moons.
+    """
+    return JupiterMoonPositionsInfo([_CalcJupiterMoon(time, model, False) for model in _JupiterMoonModel])
+
+
+class JupiterMoonsInfoArray:
+    """Holds the positions and velocities of Jupiter's major 4 moons for every time in a #TimeArray.
+
+    This is the batch counterpart of #JupiterMoonsInfo, returned by #JupiterMoonsArray.
+    The vectors are jovicentric and oriented in the EQJ system.
+
+    Attributes
+    ----------
+    io : StateVectorArray
+        The positions and velocities of Jupiter's moon Io.
+    europa : StateVectorArray
+        The positions and velocities of Jupiter's moon Europa.
+    ganymede : StateVectorArray
+        The positions and velocities of Jupiter's moon Ganymede.
+    callisto : StateVectorArray
+        The positions and velocities of Jupiter's moon Callisto.
+    """
+    def __init__(self, moon: List[Any]) -> None:
+        self.io = moon[0]
+        self.europa = moon[1]
+        self.ganymede = moon[2]
+        self.callisto = moon[3]
+
+    def __repr__(self) -> str:
+        return 'JupiterMoonsInfoArray(io={}, europa={}, ganymede={}, callisto={})'.format(
+            repr(self.io),
+            repr(self.europa),
+            repr(self.ganymede),
+            repr(self.callisto)
+        )
+
+    def __len__(self) -> int:
+        return len(self.io)
+
+    def __getitem__(self, index: Any) -> Any:
+        moons = [self.io[index], self.europa[index], self.ganymede[index], self.callisto[index]]
+        if isinstance(index, (int, _np.integer)):
+            return JupiterMoonsInfo(moons)
+        return JupiterMoonsInfoArray(moons)
+
+
+class JupiterMoonPositionsInfoArray:
+    """Holds the positions of Jupiter's major 4 moons for every time in a #TimeArray.
+
+    This is the batch counterpart of #JupiterMoonPositionsInfo, returned by #JupiterMoonPositionsArray.
+    The vectors are jovicentric and oriented in the EQJ system.
+
+    Attributes
+    ----------
+    io : VectorArray
+        The positions of Jupiter's moon Io.
+    europa : VectorArray
+        The positions of Jupiter's moon Europa.
+    ganymede : VectorArray
+        The positions of Jupiter's moon Ganymede.
+    callisto : VectorArray
+        The positions of Jupiter's moon Callisto.
+    """
+    def __init__(self, moon: List[Any]) -> None:
+        self.io = moon[0]
+        self.europa = moon[1]
+        self.ganymede = moon[2]
+        self.callisto = moon[3]
+
+    def __repr__(self) -> str:
+        return 'JupiterMoonPositionsInfoArray(io={}, europa={}, ganymede={}, callisto={})'.format(
+            repr(self.io),
+            repr(self.europa),
+            repr(self.ganymede),
+            repr(self.callisto)
+        )
+
+    def __len__(self) -> int:
+        return len(self.io)
+
+    def __getitem__(self, index: Any) -> Any:
+        moons = [self.io[index], self.europa[index], self.ganymede[index], self.callisto[index]]
+        if isinstance(index, (int, _np.integer)):
+            return JupiterMoonPositionsInfo(moons)
+        return JupiterMoonPositionsInfoArray(moons)
+
+
+# Batch evaluation of the Jovian moon models.
+# Each series is packed into (amplitude, phase, frequency) arrays; they have
+# at most a few terms, so all the times are evaluated with one outer product per series.
+
+_jupiter_moons_packed: Optional[List[Tuple[Any, ...]]] = None
+
+def _JupiterMoonsPacked() -> List[Tuple[Any, ...]]:
+    global _jupiter_moons_packed
+    if _jupiter_moons_packed is None:
+        _jupiter_moons_packed = [
+            tuple(_np.array(s.series, dtype=_np.float64).reshape(-1, 3).T.copy() for s in (model.a, model.l, model.z, model.zeta))
+            for model in _JupiterMoonModel
+        ]
+    return _jupiter_moons_packed
+
+def _CalcJupiterMoonArray(times: TimeArray, model: _jm, packed: Tuple[Any, ...], velocity: bool) -> Any:
+    # Vectorized form of _CalcJupiterMoon.
+    t = times.tt + 18262.5    # number of days since 1950-01-01T00:00:00Z
+    ((a_ampl, a_phas, a_freq), (l_ampl, l_phas, l_freq), (z_ampl, z_phas, z_freq), (w_ampl, w_phas, w_freq)) = packed
+
+    # Calculate 6 orbital elements at the given times.
+    A = _np.cos(a_phas + _np.multiply.outer(t, a_freq)) @ a_ampl
+    AL = (model.al0 + t*model.al1) + _np.sin(l_phas + _np.multiply.outer(t, l_freq)) @ l_ampl
+    AL = _np.fmod(AL, _PI2)
+    AL[AL < 0] += _PI2
+    arg = z_phas + _np.multiply.outer(t, z_freq)
+    K = _np.cos(arg) @ z_ampl
+    H = _np.sin(arg) @ z_ampl
+    arg = w_phas + _np.multiply.outer(t, w_freq)
+    Q = _np.cos(arg) @ w_ampl
+    P = _np.sin(arg) @ w_ampl
+
+    # Same as _JupiterMoon_elem2pv, but for arrays.
+    # Solve Kepler's equation, refining each element only until it converges.
+    EE = AL + K*_np.sin(AL) - H*_np.cos(AL)
+    active = _np.arange(len(t))
+    while len(active) > 0:
+        (ee, k, h) = (EE[active], K[active], H[active])
+        CE = _np.cos(ee)
+        SE = _np.sin(ee)
+        DE = (AL[active] - ee + k*SE - h*CE) / (1.0 - k*CE - h*SE)
+        EE[active] = ee + DE
+        active = active[_np.abs(DE) >= 1.0e-12]
+    CE = _np.cos(EE)
+    SE = _np.sin(EE)
+    DLE = H*CE - K*SE
+    PHI = _np.sqrt(1.0 - K*K - H*H)
+    PSI = 1.0/(1.0 + PHI)
+    X1 = A*(CE - K - PSI*H*DLE)
+    Y1 = A*(SE - H + PSI*K*DLE)
+    F2 = 2.0*_np.sqrt(1.0 - Q*Q - P*P)
+    P2 = 1.0 - 2.0*P*P
+    Q2 = 1.0 - 2.0*Q*Q
+    PQ = 2.0*P*Q
+    rot = _Rotation_JUP_EQJ.rot
+    (x, y, z) = (X1*P2 + Y1*PQ, X1*PQ + Y1*Q2, (Q*Y1 - X1*P)*F2)
+    pos = (
+        rot[0][0]*x + rot[1][0]*y + rot[2][0]*z,
+        rot[0][1]*x + rot[1][1]*y + rot[2][1]*z,
+        rot[0][2]*x + rot[1][2]*y + rot[2][2]*z
+    )
+    if not velocity:
+        return VectorArray(pos[0], pos[1], pos[2], times)
+    AN = _np.sqrt(model.mu / (A*A*A))
+    RSAM1 = -K*CE - H*SE
+    ASR = 1.0/(1.0 + RSAM1)
+    VX1 = AN*ASR*A*(-SE - PSI*H*RSAM1)
+    VY1 = AN*ASR*A*(+CE + PSI*K*RSAM1)
+    (vx, vy, vz) = (VX1*P2 + VY1*PQ, VX1*PQ + VY1*Q2, (Q*VY1 - VX1*P)*F2)
+    return StateVectorArray(
+        pos[0], pos[1], pos[2],
+        rot[0][0]*vx + rot[1][0]*vy + rot[2][0]*vz,
+        rot[0][1]*vx + rot[1][1]*vy + rot[2][1]*vz,
+        rot[0][2]*vx + rot[1][2]*vy + rot[2][2]*vz,
+        times
+    )
+
+
+def JupiterMoonsArray(times: TimeArray) -> JupiterMoonsInfoArray:
+    """Calculates jovicentric positions and velocities of Jupiter's largest 4 moons for every time in a #TimeArray.
+
+    This is the batch variant of #JupiterMoons.
+
+    Parameters
+    ----------
+    times : TimeArray
+        The dates and times for which to calculate Jupiter's moons.
+
+    Returns
+    -------
+    JupiterMoonsInfoArray
+        The positions and velocities of Jupiter's 4 largest moons.
+    """
+    _RequireNumpy()
+    return JupiterMoonsInfoArray([
+        _CalcJupiterMoonArray(times, model, packed, True)
+        for (model, packed) in zip(_JupiterMoonModel, _JupiterMoonsPacked())
+    ])
+
+
+def JupiterMoonPositionsArray(times: TimeArray) -> JupiterMoonPositionsInfoArray:
+    """Calculates jovicentric positions of Jupiter's largest 4 moons for every time in a #TimeArray.
+
+    This is the batch variant of #JupiterMoonPositions.
+
+    Parameters
+    ----------
+    times : TimeArray
+        The dates and times for which to calculate Jupiter's moons.
+
+    Returns
+    -------
+    JupiterMoonPositionsInfoArray
+        The positions of Jupiter's 4 largest moons.
+    """
+    _RequireNumpy()
+    return JupiterMoonPositionsInfoArray([
+        _CalcJupiterMoonArray(times, model, packed, False)
+        for (model, packed) in zip(_JupiterMoonModel, _JupiterMoonsPacked())
+    ])
+
 # END Jupiter Moons
 #----------------------------------------------------------------------------
 # BEGIN Search
 
+class SearchCallInfo:
+    """Statistics about a single call to #Search or #SearchWithRate.
+
+    When search statistics are enabled with #SetSearchStats, an object of this type
+    is passed to the callback function, if any, after every call to #Search
+    or #SearchWithRate.
+
+    Attributes
+    ----------
+    api : str
+        The name of the Astronomy Engine function that the application called,
+        which in turn called #Search. For example, `"SearchLunarEclipse"`.
+        If the application called #Search or #SearchWithRate directly,
+        this is the name of that function.
+    evaluations : int
+        The number of times the search function was called.
+    iterations : int
+        The number of iterations of the search loop.
+    quadraticSteps : int
+        The number of iterations in which quadratic interpolation narrowed the search window.
+    bisectionSteps : int
+        The number of iterations in which the search window was cut in half.
+    newtonSteps : int
+        The number of iterations in which a Newton step was taken.
+        Only #SearchWithRate takes Newton steps.
+    widthSeconds : float
+        The width of the final search window, in seconds.
+    found : bool
+        `True` if the search found a root; `False` if it returned `None` or raised an exception.
+    """
+    def __init__(self, api: str) -> None:
+        self.api = api
+        self.evaluations = 0
+        self.iterations = 0
+        self.quadraticSteps = 0
+        self.bisectionSteps = 0
+        self.newtonSteps = 0
+        self.widthSeconds = 0.0
+        self.found = False
+
+    def __repr__(self) -> str:
+        return 'SearchCallInfo(api={}, evaluations={}, iterations={}, quadraticSteps={}, bisectionSteps={}, newtonSteps={}, widthSeconds={}, found={})'.format(
+            repr(self.api), self.evaluations, self.iterations, self.quadraticSteps, self.bisectionSteps, self.newtonSteps, self.widthSeconds, self.found)
+
+
+class SearchStats:
+    """Totals of the statistics of all #Search calls made on behalf of one API function.
+
+    #GetSearchStats returns a dictionary of these objects, keyed by #SearchCallInfo.api.
+
+    Attributes
+    ----------
+    api : str
+        The name of the Astronomy Engine function that called #Search.
+    calls : int
+        The number of calls to #Search.
+    failures : int
+        The number of calls that returned `None` or raised an exception.
+    evaluations : int
+        The total number of times the search functions were called.
+    iterations : int
+        The total number of iterations of the search loops.
+    quadraticSteps : int
+        The total number of iterations that used quadratic interpolation.
+    bisectionSteps : int
+        The total number of iterations that cut the search window in half.
+    newtonSteps : int
+        The total number of iterations that took a Newton step.
+    maxWidthSeconds : float
+        The widest final search window of any successful call, in seconds.
+    meanWidthSeconds : float
+        The average width of the final search windows of successful calls, in seconds.
+    """
+    def __init__(self, api: str) -> None:
+        self.api = api
+        self.calls = 0
+        self.failures = 0
+        self.evaluations = 0
+        self.iterations = 0
+        self.quadraticSteps = 0
+        self.bisectionSteps = 0
+        self.newtonSteps = 0
+        self.maxWidthSeconds = 0.0
+        self.meanWidthSeconds = 0.0
+
+    def __repr__(self) -> str:
+        return 'SearchStats(api={}, calls={}, failures={}, evaluations={}, iterations={}, quadraticSteps={}, bisectionSteps={}, newtonSteps={}, maxWidthSeconds={}, meanWidthSeconds={})'.format(
+            repr(self.api), self.calls, self.failures, self.evaluations, self.iterations,
+            self.quadraticSteps, self.bisectionSteps, self.newtonSteps, self.maxWidthSeconds, self.meanWidthSeconds)
+
+    def _Add(self, info: SearchCallInfo) -> None:
+        self.calls += 1
+        self.evaluations += info.evaluations
+        self.iterations += info.iterations
+        self.quadraticSteps += info.quadraticSteps
+        self.bisectionSteps += info.bisectionSteps
+        self.newtonSteps += info.newtonSteps
+        if info.found:
+            found = self.calls - self.failures
+            self.meanWidthSeconds += (info.widthSeconds - self.meanWidthSeconds) / found
+            self.maxWidthSeconds = max(self.maxWidthSeconds, info.widthSeconds)
+        else:
+            self.failures += 1
+
+
+_SearchStatsEnabled = False
+_SearchStatsCallback: Optional[Callable[[SearchCallInfo], None]] = None
+_SearchStatsTable: Dict[str, SearchStats] = {}
+_SearchStatsLock = threading.Lock()
+
+def SetSearchStats(enabled: bool, callback: Optional[Callable[[SearchCallInfo], None]] = None) -> None:
+    """Turns the collection of #Search statistics on or off.
+
+    Most of the event-finding functions in Astronomy Engine, such as
+    #SearchRiseSet, #SearchMoonPhase, and #SearchLunarEclipse, work by calling
+    #Search one or more times. While statistics are enabled, every call to
+    #Search counts its function evaluations and iterations, and the totals are
+    kept separately for each function that the application called.
+    Read them with #GetSearchStats.
+
+    Collecting statistics makes searches slightly slower,
+    so it is turned off by default.
+
+    Parameters
+    ----------
+    enabled : bool
+        `True` to collect statistics, `False` to stop.
+    callback : function(SearchCallInfo), optional
+        A function to call with the statistics of each #Search call as it finishes.
+    """
+    global _SearchStatsEnabled, _SearchStatsCallback
+    _SearchStatsCallback = callback if enabled else None
+    _SearchStatsEnabled = enabled
+
+def GetSearchStats() -> Dict[str, SearchStats]:
+    """Returns the #Search statistics collected since they were enabled or reset.
+
+    Returns
+    -------
+    dict
+        A dictionary of #SearchStats objects, keyed by the name of the
+        API function on whose behalf #Search was called.
+    """
+    with _SearchStatsLock:
+        result = {}
+        for (api, stats) in _SearchStatsTable.items():
+            copy = SearchStats(api)
+            copy.__dict__.update(stats.__dict__)
+            result[api] = copy
+        return result
+
+def ResetSearchStats() -> None:
+    """Discards the #Search statistics collected so far."""
+    with _SearchStatsLock:
+        _SearchStatsTable.clear()
+
+def _SearchApiName(api: str) -> str:
+    # Finds the outermost public function of this module in the call stack:
+    # that is the function the application called.
+    # If the application called the search function `api` directly, returns `api`.
+    frame = sys._getframe(2)
+    while frame is not None:
+        name = frame.f_code.co_name
+        if frame.f_globals is globals() and not name.startswith(('_', '<')):
+            api = name
+        frame = frame.f_back
+    return api
+
+def _SearchRecord(info: SearchCallInfo) -> None:
+    with _SearchStatsLock:
+        stats = _SearchStatsTable.get(info.api)
+        if stats is None:
+            stats = _SearchStatsTable[info.api] = SearchStats(info.api)
+        stats._Add(info)
+    callback = _SearchStatsCallback
+    if callback is not None:
+        callback(info)
+
+
 def _QuadInterp(tm: float, dt: float, fa: float, fm: float, fb: float) -> Optional[Tuple[float, float]]:
     Q = (fb + fa)/2 - fm
     R = (fb - fa)/2
@@ -3957,93 +5756,821 @@ def Search(func: Callable[[Any, Time], float], context: object, t1: Time, t2: Ti
         Specifies an amount of time in seconds within which a bounded ascending root
         is considered accurate enough to stop. A typical value is 1 second.
 
-    Returns
-    -------
-    Time or `None`
-        If the search is successful, returns a #Time object that is within
-        `dt_tolerance_seconds` of an ascending root.
-        In this case, the returned time value will always be within the
-        inclusive range [`t1`, `t2`].
-        If there is no ascending root, or there is more than one ascending root,
-        the function returns `None`.
+    Returns
+    -------
+    Time or `None`
+        If the search is successful, returns a #Time object that is within
+        `dt_tolerance_seconds` of an ascending root.
+        In this case, the returned time value will always be within the
+        inclusive range [`t1`, `t2`].
+        If there is no ascending root, or there is more than one ascending root,
+        the function returns `None`.
+
+    """
+    if not _SearchStatsEnabled:
+        return _Search(func, context, t1, t2, dt_tolerance_seconds, None)
+    info = SearchCallInfo(_SearchApiName('Search'))
+    def CountedFunc(context: Any, time: Time) -> float:
+        info.evaluations += 1
+        return func(context, time)
+    try:
+        result = _Search(CountedFunc, context, t1, t2, dt_tolerance_seconds, info)
+        info.found = result is not None
+        return result
+    finally:
+        _SearchRecord(info)
+
+
+def _Search(func: Callable[[Any, Time], float], context: object, t1: Time, t2: Time, dt_tolerance_seconds: float, info: Optional[SearchCallInfo]) -> Optional[Time]:
+    # The body of Search. When `info` is given, it collects statistics about the search.
+    dt_days = abs(dt_tolerance_seconds / _SECONDS_PER_DAY)
+    f1 = func(context, t1)
+    f2 = func(context, t2)
+    iter_count = 0
+    iter_limit = 20
+    calc_fmid = True
+    while True:
+        iter_count += 1
+        if iter_count > iter_limit:
+            raise Error('Excessive iteration in Search')
+
+        dt = (t2.tt - t1.tt) / 2.0
+        tmid = t1.AddDays(dt)
+        if info is not None:
+            info.iterations = iter_count
+            info.widthSeconds = abs(2.0 * dt) * _SECONDS_PER_DAY
+        if abs(dt) < dt_days:
+            # We are close enough to the event to stop the search.
+            return tmid
+
+        if calc_fmid:
+            fmid = func(context, tmid)
+        else:
+            # We already have the correct value of fmid from the previous loop.
+            calc_fmid = True
+
+        # Quadratic interpolation:
+        # Try to find a parabola that passes through the 3 points we have sampled:
+        # (t1,f1), (tmid,fmid), (t2,f2).
+        q = _QuadInterp(tmid.ut, t2.ut - tmid.ut, f1, fmid, f2)
+        if q:
+            (q_ut, q_df_dt) = q
+            tq = Time(q_ut)
+            fq = func(context, tq)
+            if q_df_dt != 0.0:
+                dt_guess = abs(fq / q_df_dt)
+                if dt_guess < dt_days:
+                    # The estimated time error is small enough that we can quit now.
+                    if info is not None:
+                        info.quadraticSteps += 1
+                        info.widthSeconds = 2.0 * dt_guess * _SECONDS_PER_DAY
+                    return tq
+
+                # Try guessing a tighter boundary with the interpolated root at the center.
+                dt_guess *= 1.2
+                if dt_guess < dt / 10.0:
+                    tleft = tq.AddDays(-dt_guess)
+                    tright = tq.AddDays(+dt_guess)
+                    if (tleft.ut - t1.ut)*(tleft.ut - t2.ut) < 0.0:
+                        if (tright.ut - t1.ut)*(tright.ut - t2.ut) < 0.0:
+                            fleft = func(context, tleft)
+                            fright = func(context, tright)
+                            if fleft < 0.0 and fright >= 0.0:
+                                f1 = fleft
+                                f2 = fright
+                                t1 = tleft
+                                t2 = tright
+                                fmid = fq
+                                calc_fmid = False
+                                if info is not None:
+                                    info.quadraticSteps += 1
+                                continue
+
+        # Quadratic interpolation attempt did not work out.
+        # Just divide the region in two parts and pick whichever one appears to contain a root.
+        if f1 < 0.0 and fmid >= 0.0:
+            t2 = tmid
+            f2 = fmid
+            if info is not None:
+                info.bisectionSteps += 1
+            continue
+
+        if fmid < 0.0 and f2 >= 0.0:
+            t1 = tmid
+            f1 = fmid
+            if info is not None:
+                info.bisectionSteps += 1
+            continue
+
+        # Either there is no ascending zero-crossing in this range
+        # or the search window is too wide (more than one zero-crossing).
+        return None
+
+
+def SearchWithRate(func: Callable[[Any, Time], Tuple[float, float]], context: object, t1: Time, t2: Time, dt_tolerance_seconds: float) -> Optional[Time]:
+    """Searches for an ascending root of a function whose rate of change is known.
+
+    `SearchWithRate` finds the same kind of root as #Search: the time at which the
+    function's value increases through zero inside the window `t1`..`t2`.
+    The difference is that `func` returns a tuple `(value, rate)`, where `rate`
+    is the derivative of `value` with respect to time, in units per day.
+    Knowing the rate lets the search take Newton steps, which close in on the root
+    much faster than interpolation, so fewer calls to `func` are needed
+    to reach the same `dt_tolerance_seconds`.
+
+    The rate does not have to be exact. An approximate rate, such as one that
+    ignores small perturbations, only slows the convergence a little; the value
+    alone decides where the root is. Each Newton step is checked against a
+    window that always brackets the root, and whenever a step would leave the
+    window or fails to make enough progress, the window is cut in half instead.
+    So the search converges even where the rate is a poor guide.
+
+    Unlike #Search, `SearchWithRate` requires the window to bracket the root:
+    the value must be negative at `t1` and zero or positive at `t2`.
+    Otherwise it returns `None`.
+
+    Parameters
+    ----------
+    func : function(context, Time)
+        A function that takes an arbitrary context parameter and a #Time parameter.
+        Returns a tuple of two floats: the function value and its rate of change per day.
+    context : object
+        An arbitrary data structure needed to be passed to the function `func`
+        every time it is called.
+    t1 : Time
+        The lower time bound of the search window.
+    t2 : Time
+        The upper time bound of the search window.
+    dt_tolerance_seconds : float
+        Specifies an amount of time in seconds within which a bounded ascending root
+        is considered accurate enough to stop. A typical value is 1 second.
+
+    Returns
+    -------
+    Time or `None`
+        If the search is successful, returns a #Time object that is within
+        `dt_tolerance_seconds` of an ascending root, inside the range [`t1`, `t2`].
+        If the window does not bracket an ascending root, returns `None`.
+    """
+    if not _SearchStatsEnabled:
+        return _SearchWithRate(func, context, t1, t2, dt_tolerance_seconds, None)
+    info = SearchCallInfo(_SearchApiName('SearchWithRate'))
+    def CountedFunc(context: Any, time: Time) -> Tuple[float, float]:
+        info.evaluations += 1
+        return func(context, time)
+    try:
+        result = _SearchWithRate(CountedFunc, context, t1, t2, dt_tolerance_seconds, info)
+        info.found = result is not None
+        return result
+    finally:
+        _SearchRecord(info)
+
+
+def _SearchWithRate(func: Callable[[Any, Time], Tuple[float, float]], context: object, t1: Time, t2: Time, dt_tolerance_seconds: float, info: Optional[SearchCallInfo]) -> Optional[Time]:
+    # The body of SearchWithRate: a safeguarded Newton iteration.
+    # All times are kept as offsets in days from t1; the root is always inside [lo, hi].
+    dt_days = abs(dt_tolerance_seconds / _SECONDS_PER_DAY)
+    (f1, df1) = func(context, t1)
+    (f2, df2) = func(context, t2)
+    if not (f1 < 0.0 and f2 >= 0.0):
+        return None
+    lo = 0.0
+    hi = t2.tt - t1.tt
+    # Start with a Newton step from whichever endpoint predicts the smaller step,
+    # or else where the straight line through the endpoints crosses zero.
+    x = hi * (-f1 / (f2 - f1))
+    if df1 > 0.0 and (df2 <= 0.0 or -f1*df2 < f2*df1) and -f1/df1 < hi:
+        x = -f1/df1
+    elif df2 > 0.0 and f2/df2 < hi:
+        x = hi - f2/df2
+    step = prev_step = hi
+    iter_count = 0
+    iter_limit = 50
+    while True:
+        iter_count += 1
+        if iter_count > iter_limit:
+            raise Error('Excessive iteration in SearchWithRate')
+        (f, df) = func(context, t1.AddDays(x))
+        if f < 0.0:
+            lo = x
+        else:
+            hi = x
+        # Take the Newton step only if it stays inside the bracket
+        # and shrinks at least half as fast as bisection would.
+        newton = (df > 0.0)
+        if newton:
+            xn = x - f/df
+            newton = (lo < xn < hi) and (2.0 * abs(f/df) <= abs(prev_step))
+        if newton:
+            (prev_step, step) = (step, x - xn)
+            x = xn
+        else:
+            (prev_step, step) = (step, (hi - lo) / 2.0)
+            x = (lo + hi) / 2.0
+        if info is not None:
+            info.iterations = iter_count
+            if newton:
+                info.newtonSteps += 1
+            else:
+                info.bisectionSteps += 1
+            info.widthSeconds = (2.0 * abs(step) if newton else hi - lo) * _SECONDS_PER_DAY
+        if abs(step) < dt_days or hi - lo < dt_days:
+            return t1.AddDays(x)
+
+
+@enum.unique
+class SearchAllKind(enum.Enum):
+    """The kinds of events reported by #SearchAll.
+
+    Values
+    ------
+    Ascending: The function increases through zero.
+    Descending: The function decreases through zero.
+    Minimum: The function reaches a local minimum.
+    """
+    Ascending = +1
+    Descending = -1
+    Minimum = 0
+
+
+class SearchAllEvent:
+    """A root or minimum of a function, as reported by #SearchAll.
+
+    Attributes
+    ----------
+    kind : SearchAllKind
+        Whether the event is an ascending root, a descending root, or a local minimum.
+    time : Time
+        When the event happens.
+    value : float
+        The value of the function at `time`. For roots, this is close to zero.
+    """
+    def __init__(self, kind: SearchAllKind, time: Time, value: float) -> None:
+        self.kind = kind
+        self.time = time
+        self.value = value
+
+    def __repr__(self) -> str:
+        return 'SearchAllEvent({}, {}, {})'.format(self.kind, repr(self.time), self.value)
+
+
+_SEARCH_ALL_BATCH = 1000        # number of samples to request at a time from a batch function
+_SEARCH_ALL_SLOPE_DT = 0.001    # half-width in days of the central difference used to find minima
+
+def _SearchAllSamples(func: Callable[[Any, Time], float], context: Any, t1: Time, t2: Time, step: float, batch: Optional[Callable[[Any, TimeArray], Any]]) -> Iterator[Tuple[Time, float]]:
+    # Yields (time, value) for t1, t1+step, t1+2*step, ... and finally t2.
+    count = max(1, int(math.ceil((t2.ut - t1.ut) / step)))
+    if batch is not None:
+        for first in range(0, count, _SEARCH_ALL_BATCH):
+            last = min(count, first + _SEARCH_ALL_BATCH)
+            times = TimeArray(t1.ut + step*_np.arange(first, last, dtype=_np.float64))
+            for (k, value) in enumerate(batch(context, times)):
+                yield (times[k], float(value))
+    else:
+        for k in range(count):
+            time = t1.AddDays(k * step)
+            yield (time, func(context, time))
+    yield (t2, func(context, t2))
+
+def _SearchAllNegated(context: Tuple[Callable[[Any, Time], float], Any], time: Time) -> float:
+    (func, funcContext) = context
+    return -func(funcContext, time)
+
+def _SearchAllSlope(context: Tuple[Callable[[Any, Time], float], Any], time: Time) -> float:
+    (func, funcContext) = context
+    f1 = func(funcContext, time.AddDays(-_SEARCH_ALL_SLOPE_DT))
+    f2 = func(funcContext, time.AddDays(+_SEARCH_ALL_SLOPE_DT))
+    return (f2 - f1) / (2 * _SEARCH_ALL_SLOPE_DT)
+
+def SearchAll(
+    func: Callable[[Any, Time], float],
+    context: Any,
+    t1: Time,
+    t2: Time,
+    step: float,
+    dt_tolerance_seconds: float = 1.0,
+    batch: Optional[Callable[[Any, TimeArray], Any]] = None
+) -> Iterator[SearchAllEvent]:
+    """Finds every root and local minimum of a function in a range of time.
+
+    Where #Search finds a single ascending root inside a window that must be
+    chosen so that it holds only one root, `SearchAll` scans a whole range.
+    It samples `func` every `step` days from `t1` to `t2`, brackets every
+    change of sign and every local minimum between the samples, and refines
+    each one to within `dt_tolerance_seconds`.
+
+    Ascending roots, descending roots, and minima are generated lazily, in
+    chronological order. Minima are useful for finding near misses:
+    for example, when the function is an angular separation minus a limit,
+    a minimum that stays above zero is a close approach without contact.
+
+    The step must be small enough that the function never has two roots,
+    or two minima, within a single step; otherwise some of them can be missed.
+    A root exactly at `t1` is reported if the function increases or decreases from it.
+    Minima exactly at `t1` or `t2` are not reported.
+
+    Parameters
+    ----------
+    func : function(context, Time)
+        A function that takes an arbitrary context parameter and a #Time parameter,
+        and returns a float value, as for #Search.
+    context : object
+        An arbitrary data structure passed to every call of `func` and `batch`.
+    t1 : Time
+        The start of the time range.
+    t2 : Time
+        The end of the time range. It must not be before `t1`.
+    step : float
+        The positive number of days between samples.
+    dt_tolerance_seconds : float
+        The accuracy of the reported times, as for #Search.
+    batch : function(context, TimeArray), optional
+        A vectorized version of `func` that returns an array of values,
+        one for each time in a #TimeArray. If given, it is used to take the
+        samples, which is much faster for functions built on the batch APIs.
+        `func` is still used to refine each event.
+
+    Returns
+    -------
+    generator of SearchAllEvent
+    """
+    if step <= 0.0:
+        raise Error('SearchAll step must be positive.')
+    if t2.ut < t1.ut:
+        raise Error('SearchAll time range is reversed.')
+    if batch is not None:
+        _RequireNumpy()
+    negated = (func, context)
+    pending: List[SearchAllEvent] = []
+    window: List[Tuple[Time, float]] = []
+    for sample in _SearchAllSamples(func, context, t1, t2, step, batch):
+        window.append(sample)
+        if len(window) > 3:
+            del window[0]
+        if len(window) < 2:
+            continue
+        ((ta, fa), (tb, fb)) = window[-2:]
+        if fa == 0.0 and fb > 0.0 and len(window) == 2:
+            # A function that starts at zero and then increases has an ascending root at t1.
+            pending.append(SearchAllEvent(SearchAllKind.Ascending, ta, fa))
+        elif fa < 0.0 <= fb:
+            time = Search(func, context, ta, tb, dt_tolerance_seconds)
+            if time is not None:
+                pending.append(SearchAllEvent(SearchAllKind.Ascending, time, func(context, time)))
+        elif fb < 0.0 <= fa:
+            time = Search(_SearchAllNegated, negated, ta, tb, dt_tolerance_seconds)
+            if time is not None:
+                pending.append(SearchAllEvent(SearchAllKind.Descending, time, func(context, time)))
+        if len(window) == 3:
+            ((t0, f0), (tm, fm), (t3, f3)) = window
+            if fm < f0 and fm <= f3:
+                time = Search(_SearchAllSlope, negated, t0, t3, dt_tolerance_seconds)
+                if time is not None:
+                    pending.append(SearchAllEvent(SearchAllKind.Minimum, time, func(context, time)))
+            # Events found from now on cannot be earlier than the middle sample,
+            # which begins the next window.
+            if pending:
+                pending.sort(key=lambda event: event.time.ut)
+                while pending and pending[0].time.ut < tm.ut:
+                    yield pending.pop(0)
+    pending.sort(key=lambda event: event.time.ut)
+    for event in pending:
+        yield event
+
+def _NextEventWindow(history: List[float], cycle: int, shortest: float, longest: float, margin: float) -> Tuple[float, float]:
+    # For a series of events that repeats every `cycle` events, such as the four lunar quarters,
+    # returns a window of days after the last time in `history` that contains the next event.
+    # Once two whole cycles are known, the interval one cycle back is extrapolated linearly
+    # from the interval two cycles back, and the window is that estimate +/- `margin`.
+    # Until then, the window spans every possible interval, from `shortest` to `longest`.
+    n = len(history)
+    if n > 2*cycle:
+        recent = history[n-cycle] - history[n-cycle-1]
+        older = history[n-2*cycle] - history[n-2*cycle-1]
+        estimate = 2.0*recent - older
+        if shortest < estimate < longest:
+            return (max(shortest, estimate - margin), min(longest, estimate + margin))
+    return (shortest, longest)
+
+# END Search
+#----------------------------------------------------------------------------
+
+# BEGIN Chebyshev Ephemeris
+
+_CHEB_MAGIC = b'AECHEB\x00\x00'
+_CHEB_VERSION = 1
+_CHEB_HEADER = struct.Struct('<8sII')
+_CHEB_RECORD = struct.Struct('<iiiddd')
+
+# Bodies that can be stored in a Chebyshev ephemeris, and the initial segment
+# length in days that the generator tries for each one before refining.
+# The Moon is stored geocentric; all other bodies are stored heliocentric.
+_ChebInitialSpan = {
+    Body.Mercury:  16.0,
+    Body.Venus:    32.0,
+    Body.Earth:    32.0,
+    Body.Mars:     64.0,
+    Body.Jupiter: 256.0,
+    Body.Saturn:  256.0,
+    Body.Uranus:  512.0,
+    Body.Neptune: 512.0,
+    Body.Pluto:   float(_PLUTO_DT),
+    Body.Moon:      8.0,
+}
+
+class EphemerisFileError(Error):
+    """An ephemeris or cache file is corrupt or has an unsupported format."""
+    def __init__(self, filename: str, reason: str) -> None:
+        Error.__init__(self, 'Invalid ephemeris file "{}": {}'.format(filename, reason))
+
+class ChebyshevAccuracy:
+    """Reports how closely a Chebyshev ephemeris reproduces the analytic models for one body.
+
+    Attributes
+    ----------
+    body : Body
+        The body that was checked.
+    samples : int
+        The number of times at which the two models were compared.
+    maxError : float
+        The largest distance, in AU, between the Chebyshev and analytic positions.
+    rmsError : float
+        The root-mean-square distance, in AU, over all samples.
+    worstTime : Time
+        The time at which `maxError` occurred.
+    """
+    def __init__(self, body: Body, samples: int, maxError: float, rmsError: float, worstTime: Time) -> None:
+        self.body = body
+        self.samples = samples
+        self.maxError = maxError
+        self.rmsError = rmsError
+        self.worstTime = worstTime
+
+    def __repr__(self) -> str:
+        return 'ChebyshevAccuracy({}, samples={}, maxError={}, rmsError={}, worstTime={})'.format(
+            self.body, self.samples, repr(self.maxError), repr(self.rmsError), repr(self.worstTime))
+
+
+class _cheb_series_t:
+    def __init__(self, body: Body, degree: int, start_tt: float, span: float, segments: List[List[Tuple[float, float, float]]], maxError: float) -> None:
+        self.body = body
+        self.degree = degree
+        self.start_tt = start_tt
+        self.span = span
+        self.stop_tt = start_tt + span*len(segments)
+        # Each segment holds (degree+1) coefficient triples (cx, cy, cz),
+        # stored in reverse order so the Clenshaw recurrence can walk them directly.
+        self.segments = segments
+        self.maxError = maxError
+
+    def Position(self, tt: float) -> Optional[Tuple[float, float, float]]:
+        if not (self.start_tt <= tt <= self.stop_tt):
+            return None
+        s = (tt - self.start_tt) / self.span
+        index = min(int(s), len(self.segments) - 1)
+        return _ChebEval(self.segments[index], 2.0*(s - index) - 1.0)
+
+
+def _ChebEval(coeff: List[Tuple[float, float, float]], x: float) -> Tuple[float, float, float]:
+    # Clenshaw recurrence for all three coordinates at once, with x in [-1, +1].
+    x2 = 2.0 * x
+    bx1 = by1 = bz1 = bx2 = by2 = bz2 = 0.0
+    for (cx, cy, cz) in coeff[:-1]:
+        (bx1, bx2) = (x2*bx1 - bx2 + cx, bx1)
+        (by1, by2) = (x2*by1 - by2 + cy, by1)
+        (bz1, bz2) = (x2*bz1 - bz2 + cz, bz1)
+    (cx, cy, cz) = coeff[-1]
+    return (x*bx1 - bx2 + cx, x*by1 - by2 + cy, x*bz1 - bz2 + cz)
+
+
+def _ChebTime(tt: float) -> Time:
+    # The analytic models depend only on TT, so skip solving for UT.
+    return Time(tt, tt)
+
+
+def _ChebAnalytic(body: Body, time: Time) -> Vector:
+    # The positions that a Chebyshev ephemeris approximates.
+    # These never consult the configured ephemeris.
+    if body == Body.Moon:
+        return GeoMoon(time)
+    if body == Body.Pluto:
+        state = _CalcPluto(time, True)
+        return Vector(state.x, state.y, state.z, time)
+    return _CalcVsop(_vsop[body.value], time)
+
+
+def _ChebFitSegment(body: Body, tt1: float, span: float, degree: int) -> List[Tuple[float, float, float]]:
+    # Interpolate at the Chebyshev nodes of the segment, which gives a near-minimax fit.
+    n = degree + 1
+    samples = []
+    for j in range(n):
+        x = math.cos(math.pi * (j + 0.5) / n)
+        samples.append(_ChebAnalytic(body, _ChebTime(tt1 + span*(x + 1.0)/2.0)))
+    coeff = []
+    for k in range(n):
+        sx = sy = sz = 0.0
+        for j in range(n):
+            w = math.cos(math.pi * k * (j + 0.5) / n)
+            sx += w * samples[j].x
+            sy += w * samples[j].y
+            sz += w * samples[j].z
+        f = (1.0 if k == 0 else 2.0) / n
+        coeff.append((f*sx, f*sy, f*sz))
+    coeff.reverse()
+    return coeff
+
+
+def _ChebSegmentError(series: _cheb_series_t, index: int) -> float:
+    # Compare with the analytic model at the extrema of T[n], which lie between
+    # the interpolation nodes and include both segment endpoints.
+    n = series.degree + 1
+    tt1 = series.start_tt + index*series.span
+    error = 0.0
+    for k in range(n + 1):
+        x = math.cos(math.pi * k / n)
+        tt = tt1 + series.span*(x + 1.0)/2.0
+        approx = _ChebEval(series.segments[index], x)
+        exact = _ChebAnalytic(series.body, _ChebTime(tt))
+        error = max(error, math.sqrt((approx[0]-exact.x)**2 + (approx[1]-exact.y)**2 + (approx[2]-exact.z)**2))
+    return error
+
+
+def _ChebFitBody(body: Body, tt1: float, tt2: float, tolerance: float, degree: int) -> _cheb_series_t:
+    span = _ChebInitialSpan[body]
+    if body == Body.Pluto:
+        # Pluto's position is blended separately within each integrator step,
+        # so its derivatives jump at step boundaries. Align the segments with
+        # the steps so that no polynomial has to fit across a jump.
+        grid = _PlutoStateTable[0].tt
+        tt1 = grid + _PLUTO_DT*math.floor((tt1 - grid) / _PLUTO_DT)
+    for _ in range(12):
+        nseg = max(1, int(math.ceil((tt2 - tt1) / span)))
+        # Probe a handful of evenly spaced segments before paying for the whole range.
+        probe = sorted(set(int(i * (nseg - 1) / 15) for i in range(16)))
+        series = _cheb_series_t(body, degree, tt1, span, [[]] * nseg, 0.0)
+        for i in probe:
+            series.segments[i] = _ChebFitSegment(body, tt1 + i*span, span, degree)
+        if max(_ChebSegmentError(series, i) for i in probe) <= tolerance:
+            error = 0.0
+            for i in range(nseg):
+                series.segments[i] = _ChebFitSegment(body, tt1 + i*span, span, degree)
+                error = max(error, _ChebSegmentError(series, i))
+            if error <= tolerance:
+                series.maxError = error
+                return series
+        span /= 2.0
+    raise NoConvergeError()
+
+
+class ChebyshevEphemeris:
+    """Piecewise Chebyshev approximations of body positions over a span of time.
+
+    A Chebyshev ephemeris replaces the analytic models (VSOP87 for the planets,
+    the lunar theory for the Moon, and the Pluto integrator) with
+    precomputed polynomials, so looking up a position costs only a short
+    polynomial evaluation.
+
+    Create one with #ChebyshevEphemeris.Generate, store it with
+    #ChebyshevEphemeris.Save, and read it back with #ChebyshevEphemeris.Load.
+    Once configured with #SetChebyshevEphemeris, #HelioVector and #GeoVector
+    use it automatically for any body and time it covers.
+
+    The Moon is stored as a geocentric position, like #GeoMoon.
+    All other bodies are stored as heliocentric positions, like #HelioVector.
+    All positions are J2000 mean equator (EQJ) coordinates in AU.
+    """
+    def __init__(self) -> None:
+        self._series: Dict[Body, _cheb_series_t] = {}
+
+    def __repr__(self) -> str:
+        return 'ChebyshevEphemeris([{}])'.format(', '.join(str(body) for body in self._series))
+
+    def Bodies(self) -> List[Body]:
+        """Returns the bodies stored in this ephemeris."""
+        return list(self._series)
+
+    def Span(self, body: Body) -> Tuple[Time, Time]:
+        """Returns the range of times covered for a body.
+
+        Parameters
+        ----------
+        body : Body
+            A body stored in this ephemeris.
+
+        Returns
+        -------
+        (Time, Time)
+            The first and last times for which the body's position is available.
+        """
+        series = self._series.get(body)
+        if series is None:
+            raise InvalidBodyError(body)
+        return (Time.FromTerrestrialTime(series.start_tt), Time.FromTerrestrialTime(series.stop_tt))
+
+    def Position(self, body: Body, time: Time) -> Optional[Vector]:
+        """Evaluates the stored position of a body.
+
+        Parameters
+        ----------
+        body : Body
+            The body whose position is to be calculated.
+        time : Time
+            The date and time of the position.
+
+        Returns
+        -------
+        Vector or `None`
+            The heliocentric position of the body (geocentric for the Moon),
+            or `None` if the body or time is not covered by this ephemeris.
+        """
+        series = self._series.get(body)
+        if series is not None:
+            pos = series.Position(time.tt)
+            if pos is not None:
+                return Vector(pos[0], pos[1], pos[2], time)
+        return None
+
+    def _HelioVector(self, body: Body, time: Time) -> Optional[Vector]:
+        if body == Body.Moon or body == Body.EMB:
+            earth = self._series.get(Body.Earth)
+            moon = self._series.get(Body.Moon)
+            if earth is None or moon is None:
+                return None
+            e = earth.Position(time.tt)
+            m = moon.Position(time.tt)
+            if e is None or m is None:
+                return None
+            d = 1.0 if body == Body.Moon else (1.0 + _EARTH_MOON_MASS_RATIO)
+            return Vector(e[0]+(m[0]/d), e[1]+(m[1]/d), e[2]+(m[2]/d), time)
+        return self.Position(body, time)
+
+    @staticmethod
+    def Generate(bodies: Iterable[Body], startTime: Time, stopTime: Time, tolerance: float = 1.0e-9, degree: int = 12) -> "ChebyshevEphemeris":
+        """Fits Chebyshev polynomials to the analytic models over a span of time.
 
-    """
-    dt_days = abs(dt_tolerance_seconds / _SECONDS_PER_DAY)
-    f1 = func(context, t1)
-    f2 = func(context, t2)
-    iter_count = 0
-    iter_limit = 20
-    calc_fmid = True
-    while True:
-        iter_count += 1
-        if iter_count > iter_limit:
-            raise Error('Excessive iteration in Search')
+        Each body's span is divided into equal segments. The segment length
+        is halved until every segment reproduces the analytic model within
+        `tolerance`. Generating a long span, especially for the Moon,
+        can take a while; save the result with #ChebyshevEphemeris.Save.
 
-        dt = (t2.tt - t1.tt) / 2.0
-        tmid = t1.AddDays(dt)
-        if abs(dt) < dt_days:
-            # We are close enough to the event to stop the search.
-            return tmid
+        Parameters
+        ----------
+        bodies : iterable of Body
+            The bodies to include: the Moon, Pluto, or any of the planets Mercury through Neptune.
+        startTime : Time
+            The beginning of the span to cover.
+        stopTime : Time
+            The end of the span to cover.
+        tolerance : float
+            The largest allowed difference, in AU, between the polynomials
+            and the analytic models. The default is 1.0e-9 AU (about 150 meters).
+        degree : int
+            The degree of each polynomial.
 
-        if calc_fmid:
-            fmid = func(context, tmid)
-        else:
-            # We already have the correct value of fmid from the previous loop.
-            calc_fmid = True
+        Returns
+        -------
+        ChebyshevEphemeris
+        """
+        if stopTime.tt <= startTime.tt:
+            raise Error('The stop time must be after the start time.')
+        if degree < 1:
+            raise Error('The polynomial degree must be at least 1.')
+        ephem = ChebyshevEphemeris()
+        for body in bodies:
+            if body not in _ChebInitialSpan:
+                raise InvalidBodyError(body)
+            ephem._series[body] = _ChebFitBody(body, startTime.tt, stopTime.tt, tolerance, degree)
+        return ephem
+
+    def Save(self, filename: str) -> None:
+        """Writes this ephemeris to a compact binary file.
 
-        # Quadratic interpolation:
-        # Try to find a parabola that passes through the 3 points we have sampled:
-        # (t1,f1), (tmid,fmid), (t2,f2).
-        q = _QuadInterp(tmid.ut, t2.ut - tmid.ut, f1, fmid, f2)
-        if q:
-            (q_ut, q_df_dt) = q
-            tq = Time(q_ut)
-            fq = func(context, tq)
-            if q_df_dt != 0.0:
-                dt_guess = abs(fq / q_df_dt)
-                if dt_guess < dt_days:
-                    # The estimated time error is small enough that we can quit now.
-                    return tq
+        Parameters
+        ----------
+        filename : str
+            The name of the file to create or overwrite.
+        """
+        with open(filename, 'wb') as outfile:
+            outfile.write(_CHEB_HEADER.pack(_CHEB_MAGIC, _CHEB_VERSION, len(self._series)))
+            for series in self._series.values():
+                outfile.write(_CHEB_RECORD.pack(series.body.value, series.degree, len(series.segments), series.start_tt, series.span, series.maxError))
+                block = struct.Struct('<{}d'.format(3 * (series.degree + 1)))
+                for coeff in series.segments:
+                    outfile.write(block.pack(*(c for triple in coeff for c in triple)))
 
-                # Try guessing a tighter boundary with the interpolated root at the center.
-                dt_guess *= 1.2
-                if dt_guess < dt / 10.0:
-                    tleft = tq.AddDays(-dt_guess)
-                    tright = tq.AddDays(+dt_guess)
-                    if (tleft.ut - t1.ut)*(tleft.ut - t2.ut) < 0.0:
-                        if (tright.ut - t1.ut)*(tright.ut - t2.ut) < 0.0:
-                            fleft = func(context, tleft)
-                            fright = func(context, tright)
-                            if fleft < 0.0 and fright >= 0.0:
-                                f1 = fleft
-                                f2 = fright
-                                t1 = tleft
-                                t2 = tright
-                                fmid = fq
-                                calc_fmid = False
-                                continue
+    @staticmethod
+    def Load(filename: str) -> "ChebyshevEphemeris":
+        """Reads an ephemeris file written by #ChebyshevEphemeris.Save.
 
-        # Quadratic interpolation attempt did not work out.
-        # Just divide the region in two parts and pick whichever one appears to contain a root.
-        if f1 < 0.0 and fmid >= 0.0:
-            t2 = tmid
-            f2 = fmid
-            continue
+        Parameters
+        ----------
+        filename : str
+            The name of the file to read.
 
-        if fmid < 0.0 and f2 >= 0.0:
-            t1 = tmid
-            f1 = fmid
-            continue
+        Returns
+        -------
+        ChebyshevEphemeris
+        """
+        with open(filename, 'rb') as infile:
+            data = infile.read()
+        if len(data) < _CHEB_HEADER.size:
+            raise EphemerisFileError(filename, 'file is too short')
+        (magic, version, count) = _CHEB_HEADER.unpack_from(data, 0)
+        if magic != _CHEB_MAGIC:
+            raise EphemerisFileError(filename, 'not a Chebyshev ephemeris')
+        if version != _CHEB_VERSION:
+            raise EphemerisFileError(filename, 'unsupported version {}'.format(version))
+        ephem = ChebyshevEphemeris()
+        offset = _CHEB_HEADER.size
+        for _ in range(count):
+            if offset + _CHEB_RECORD.size > len(data):
+                raise EphemerisFileError(filename, 'file is truncated')
+            (bodyValue, degree, nseg, start_tt, span, maxError) = _CHEB_RECORD.unpack_from(data, offset)
+            offset += _CHEB_RECORD.size
+            try:
+                body = Body(bodyValue)
+            except ValueError:
+                raise EphemerisFileError(filename, 'unknown body {}'.format(bodyValue))
+            if body not in _ChebInitialSpan or degree < 1 or nseg < 1 or not (span > 0.0):
+                raise EphemerisFileError(filename, 'invalid record for {}'.format(body))
+            n = degree + 1
+            block = struct.Struct('<{}d'.format(3 * n))
+            if offset + nseg*block.size > len(data):
+                raise EphemerisFileError(filename, 'file is truncated')
+            segments = []
+            for _ in range(nseg):
+                c = block.unpack_from(data, offset)
+                offset += block.size
+                segments.append([(c[3*k], c[3*k+1], c[3*k+2]) for k in range(n)])
+            ephem._series[body] = _cheb_series_t(body, degree, start_tt, span, segments, maxError)
+        if offset != len(data):
+            raise EphemerisFileError(filename, 'unexpected data after the last record')
+        return ephem
+
+    def ErrorReport(self, samples: int = 1000) -> List[ChebyshevAccuracy]:
+        """Compares this ephemeris with the analytic models.
+
+        For each body, positions are compared at `samples` times spread
+        quasi-randomly over the body's span.
 
-        # Either there is no ascending zero-crossing in this range
-        # or the search window is too wide (more than one zero-crossing).
-        return None
+        Parameters
+        ----------
+        samples : int
+            The number of times at which to compare each body.
 
-# END Search
+        Returns
+        -------
+        list of ChebyshevAccuracy
+            One entry per body, in the order the bodies are stored.
+        """
+        report = []
+        for series in self._series.values():
+            worst = 0.0
+            worst_tt = series.start_tt
+            sumsq = 0.0
+            for i in range(samples):
+                # Golden-ratio sequence: evenly spread, but never aligned with segment boundaries.
+                tt = series.start_tt + ((0.5 + i*0.6180339887498949) % 1.0)*(series.stop_tt - series.start_tt)
+                approx = series.Position(tt)
+                assert approx is not None
+                exact = _ChebAnalytic(series.body, _ChebTime(tt))
+                dsq = (approx[0]-exact.x)**2 + (approx[1]-exact.y)**2 + (approx[2]-exact.z)**2
+                sumsq += dsq
+                if dsq > worst*worst:
+                    worst = math.sqrt(dsq)
+                    worst_tt = tt
+            rms = math.sqrt(sumsq / samples) if samples > 0 else 0.0
+            report.append(ChebyshevAccuracy(series.body, samples, worst, rms, Time.FromTerrestrialTime(worst_tt)))
+        return report
+
+
+_ChebyshevEphemeris: Optional[ChebyshevEphemeris] = None
+
+def SetChebyshevEphemeris(ephemeris: Union[ChebyshevEphemeris, str, None]) -> None:
+    """Configures the Chebyshev ephemeris used by #HelioVector and #GeoVector.
+
+    While an ephemeris is configured, #HelioVector and #GeoVector take positions
+    from it for any body and time it covers, and fall back to the analytic
+    models otherwise. The heliocentric Moon and EMB require both the Earth
+    and the Moon to be stored. Calls that pass an explicit VSOP87 `accuracy`
+    tier always use the analytic models.
+
+    Parameters
+    ----------
+    ephemeris : ChebyshevEphemeris, str, or `None`
+        The ephemeris to use, or the name of a file to load it from.
+        Pass `None` to go back to the analytic models everywhere.
+    """
+    global _ChebyshevEphemeris
+    if isinstance(ephemeris, str):
+        ephemeris = ChebyshevEphemeris.Load(ephemeris)
+    _ChebyshevEphemeris = ephemeris
+
+# END Chebyshev Ephemeris
 #----------------------------------------------------------------------------
 
 
-def HelioVector(body: Body, time: Time) -> Vector:
+def HelioVector(body: Body, time: Time, accuracy: Optional[VsopAccuracy] = None) -> Vector:
     """Calculates heliocentric Cartesian coordinates of a body in the J2000 equatorial system.
 
     This function calculates the position of the given celestial body as a vector,
@@ -4054,6 +6581,10 @@ def HelioVector(body: Body, time: Time) -> Vector:
     The position is not corrected for light travel time or aberration.
     This is different from the behavior of #GeoVector.
 
+    If a Chebyshev ephemeris has been configured with #SetChebyshevEphemeris,
+    positions it covers are taken from it instead of the analytic models,
+    unless `accuracy` is given.
+
     If given an invalid value for `body`, this function raises an exception.
 
     Parameters
@@ -4064,6 +6595,11 @@ def HelioVector(body: Body, time: Time) -> Vector:
         Also allowed to be a user-defined star created by #DefineStar.
     time : Time
         The time at which to calculate the heliocentric position.
+    accuracy : VsopAccuracy, optional
+        The VSOP87 accuracy tier for the planets.
+        If omitted, the tier selected by #SetVsopAccuracy is used.
+        If given, the analytic models are used even where the Chebyshev ephemeris
+        configured by #SetChebyshevEphemeris covers the body.
 
     Returns
     -------
@@ -4071,23 +6607,32 @@ def HelioVector(body: Body, time: Time) -> Vector:
         A heliocentric position vector of the center of the given body
         at the given time.
     """
+    ephemeris = _ChebyshevEphemeris     # read once: another thread may replace it
+    if ephemeris is not None and accuracy is None:
+        vec = ephemeris._HelioVector(body, time)
+        if vec is not None:
+            return vec
+
     if body == Body.Pluto:
         planet = _CalcPluto(time, True)
         return Vector(planet.x, planet.y, planet.z, time)
 
+    if body == Body.Earth:
+        return _CalcEarth(time, accuracy)
+
     if 0 <= body.value < len(_vsop):
-        return _CalcVsop(_vsop[body.value], time)
+        return _CalcVsop(_VsopModel(body, accuracy), time)
 
     if body == Body.Sun:
         return Vector(0.0, 0.0, 0.0, time)
 
     if body == Body.Moon:
-        e = _CalcEarth(time)
+        e = _CalcEarth(time, accuracy)
         m = GeoMoon(time)
         return Vector(e.x+m.x, e.y+m.y, e.z+m.z, time)
 
     if body == Body.EMB:
-        e = _CalcEarth(time)
+        e = _CalcEarth(time, accuracy)
         m = GeoMoon(time)
         d = 1.0 + _EARTH_MOON_MASS_RATIO
         return Vector(e.x+(m.x/d), e.y+(m.y/d), e.z+(m.z/d), time)
@@ -4102,7 +6647,38 @@ def HelioVector(body: Body, time: Time) -> Vector:
     raise InvalidBodyError(body)
 
 
-def HelioDistance(body: Body, time: Time) -> float:
+def HelioVectorArray(body: Body, times: TimeArray, accuracy: Optional[VsopAccuracy] = None) -> VectorArray:
+    """Calculates heliocentric Cartesian coordinates of a body for every time in a #TimeArray.
+
+    This is the batch variant of #HelioVector. It returns the same
+    J2000 equatorial (EQJ) heliocentric positions, packed into NumPy arrays.
+
+    Parameters
+    ----------
+    body : Body
+        The celestial body whose heliocentric positions are to be calculated.
+        The same bodies are allowed as for #HelioVector.
+    times : TimeArray
+        The times at which to calculate the heliocentric positions.
+    accuracy : VsopAccuracy, optional
+        The VSOP87 accuracy tier for the planets.
+        If omitted, the tier selected by #SetVsopAccuracy is used.
+
+    Returns
+    -------
+    VectorArray
+        The heliocentric position vectors of the body, one per time.
+    """
+    _RequireNumpy()
+    if 0 <= body.value < len(_vsop):
+        (x, y, z) = _CalcVsopArray(body, times.tt, False, accuracy)
+        return VectorArray(x, y, z, times)
+    if body == Body.Sun:
+        return VectorArray(_np.zeros(len(times)), _np.zeros(len(times)), _np.zeros(len(times)), times)
+    return _VectorArrayFromFunc(times, lambda time: HelioVector(body, time, accuracy))
+
+
+def HelioDistance(body: Body, time: Time, accuracy: Optional[VsopAccuracy] = None) -> float:
     """Calculates the distance between a body and the Sun at a given time.
 
     Given a date and time, this function calculates the distance between
@@ -4118,6 +6694,9 @@ def HelioDistance(body: Body, time: Time) -> float:
         the Sun, Moon, any of the planets, or a user-defined star.
     time : Time
         The date and time for which to calculate the heliocentric distance.
+    accuracy : VsopAccuracy, optional
+        The VSOP87 accuracy tier for the planets.
+        If omitted, the tier selected by #SetVsopAccuracy is used.
 
     Returns
     -------
@@ -4128,13 +6707,13 @@ def HelioDistance(body: Body, time: Time) -> float:
         return 0.0
 
     if 0 <= body.value < len(_vsop):
-        return _VsopHelioDistance(_vsop[body.value], time)
+        return _VsopHelioDistance(_VsopModel(body, accuracy), time)
 
     star = _UserDefinedStar(body)
     if star:
         return star.dist
 
-    return HelioVector(body, time).Length()
+    return HelioVector(body, time, accuracy).Length()
 
 
 class PositionFunction(abc.ABC):
@@ -4219,12 +6798,13 @@ def CorrectLightTravel(func: PositionFunction, time: Time) -> Vector:
 
 
 class _BodyPosition(PositionFunction):
-    def __init__(self, observerBody: Body, targetBody: Body, aberration: bool, observerPos: Optional[Vector]) -> None:
+    def __init__(self, observerBody: Body, targetBody: Body, aberration: bool, observerPos: Optional[Vector], accuracy: Optional[VsopAccuracy] = None) -> None:
         super().__init__()
         self.observerBody = observerBody
         self.targetBody = targetBody
         self.aberration = aberration
         self.observerPos = observerPos
+        self.accuracy = accuracy
 
     def Position(self, time: Time) -> Vector:
         if self.aberration:
@@ -4243,17 +6823,17 @@ class _BodyPosition(PositionFunction):
             # In other words, both of the following approximate the aberration angle:
             #     (transverse distance Earth moves) / (distance to body)
             #     (transverse speed of Earth) / (speed of light).
-            observerPos = HelioVector(self.observerBody, time)
+            observerPos = HelioVector(self.observerBody, time, self.accuracy)
         else:
             # No aberration, so use the pre-calculated initial position of
             # the observer body that is already stored in this object.
             assert self.observerPos is not None
             observerPos = self.observerPos
         # Subtract the bodies' heliocentric positions to obtain a relative position vector.
-        return HelioVector(self.targetBody, time) - observerPos
+        return HelioVector(self.targetBody, time, self.accuracy) - observerPos
 
 
-def BackdatePosition(time: Time, observerBody: Body, targetBody: Body, aberration: bool) -> Vector:
+def BackdatePosition(time: Time, observerBody: Body, targetBody: Body, aberration: bool, accuracy: Optional[VsopAccuracy] = None) -> Vector:
     """Solve for light travel time correction of apparent position.
 
     When observing a distant object, for example Jupiter as seen from Earth,
@@ -4282,6 +6862,11 @@ def BackdatePosition(time: Time, observerBody: Body, targetBody: Body, aberratio
         The body to be observed.
     aberration : bool
         `True` to correct for aberration, or `False` to leave uncorrected.
+    accuracy : VsopAccuracy, optional
+        The VSOP87 accuracy tier for the planets.
+        If omitted, the tier selected by #SetVsopAccuracy is used.
+        If given, the analytic models are used even where the Chebyshev ephemeris
+        configured by #SetChebyshevEphemeris covers the body.
 
     Returns
     -------
@@ -4316,12 +6901,12 @@ def BackdatePosition(time: Time, observerBody: Body, targetBody: Body, aberratio
     else:
         # Without aberration, we need the observer body position at the observation time only.
         # For efficiency, calculate it once and hold onto it, so `BodyPosition` can keep using it.
-        observerPos = HelioVector(observerBody, time)
-    func = _BodyPosition(observerBody, targetBody, aberration, observerPos)
+        observerPos = HelioVector(observerBody, time, accuracy)
+    func = _BodyPosition(observerBody, targetBody, aberration, observerPos, accuracy)
     return CorrectLightTravel(func, time)
 
 
-def GeoVector(body: Body, time: Time, aberration: bool) -> Vector:
+def GeoVector(body: Body, time: Time, aberration: bool, accuracy: Optional[VsopAccuracy] = None) -> Vector:
     """Calculates geocentric Cartesian coordinates of a body in the J2000 equatorial system.
 
     This function calculates the position of the given celestial body as a vector,
@@ -4331,6 +6916,9 @@ def GeoVector(body: Body, time: Time, aberration: bool) -> Vector:
 
     If given an invalid value for `body`, this function will raise an exception.
 
+    Like #HelioVector, this function uses the Chebyshev ephemeris
+    configured by #SetChebyshevEphemeris, if any, for the times it covers.
+
     Unlike #HelioVector, this function corrects for light travel time.
     This means the position of the body is "back-dated" by the amount of time it takes
     light to travel from that body to an observer on the Earth.
@@ -4348,6 +6936,11 @@ def GeoVector(body: Body, time: Time, aberration: bool) -> Vector:
         The date and time for which to calculate the position.
     aberration : bool
         A boolean value indicating whether to correct for aberration.
+    accuracy : VsopAccuracy, optional
+        The VSOP87 accuracy tier for the planets.
+        If omitted, the tier selected by #SetVsopAccuracy is used.
+        If given, the analytic models are used even where the Chebyshev ephemeris
+        configured by #SetChebyshevEphemeris covers the body.
 
     Returns
     -------
@@ -4355,19 +6948,86 @@ def GeoVector(body: Body, time: Time, aberration: bool) -> Vector:
         A geocentric position vector of the center of the given body.
     """
     if body == Body.Moon:
+        ephemeris = _ChebyshevEphemeris     # read once: another thread may replace it
+        if ephemeris is not None:
+            vec = ephemeris.Position(Body.Moon, time)
+            if vec is not None:
+                return vec
         return GeoMoon(time)
 
     if body == Body.Earth:
         return Vector(0.0, 0.0, 0.0, time)
 
     # Correct for light-travel time, to get position of body as seen from Earth's center.
-    vec = BackdatePosition(time, Body.Earth, body, aberration)
+    vec = BackdatePosition(time, Body.Earth, body, aberration, accuracy)
 
     # Tricky: return the observation time, not the backdated time.
     vec.t = time
     return vec
 
 
+def GeoVectorArray(body: Body, times: TimeArray, aberration: bool, accuracy: Optional[VsopAccuracy] = None) -> VectorArray:
+    """Calculates geocentric Cartesian coordinates of a body for every time in a #TimeArray.
+
+    This is the batch variant of #GeoVector. Like #GeoVector, each position
+    is corrected for light travel time, and optionally for aberration.
+
+    Parameters
+    ----------
+    body : Body
+        A body for which to calculate geocentric positions: the Sun, Moon, or any of the planets.
+    times : TimeArray
+        The dates and times for which to calculate the positions.
+    aberration : bool
+        A boolean value indicating whether to correct for aberration.
+    accuracy : VsopAccuracy, optional
+        The VSOP87 accuracy tier for the planets.
+        If omitted, the tier selected by #SetVsopAccuracy is used.
+
+    Returns
+    -------
+    VectorArray
+        The geocentric position vectors of the body, one per time.
+    """
+    _RequireNumpy()
+    if body == Body.Sun or (0 <= body.value < len(_vsop) and body != Body.Earth):
+        return _BackdateVsopArray(body, times, aberration, accuracy)
+    return _VectorArrayFromFunc(times, lambda time: GeoVector(body, time, aberration, accuracy))
+
+
+def _HelioVsopArray(body: Body, tt: Any, accuracy: Optional[VsopAccuracy]) -> Any:
+    if body == Body.Sun:
+        return _np.zeros((3, len(tt)))
+    return _CalcVsopArray(body, tt, False, accuracy)
+
+
+def _BackdateVsopArray(body: Body, times: TimeArray, aberration: bool, accuracy: Optional[VsopAccuracy]) -> VectorArray:
+    # Vectorized form of BackdatePosition/CorrectLightTravel for the Sun and the VSOP planets,
+    # as seen from the Earth. Each element keeps iterating until it converges,
+    # exactly like the scalar loop, so the results agree with #GeoVector.
+    n = len(times)
+    result = _np.empty((3, n))
+    observer = None if aberration else _CalcVsopArray(Body.Earth, times.tt, False, accuracy)
+    active = _np.arange(n)
+    ltt = times.tt.copy()
+    for _ in range(10):
+        target = _HelioVsopArray(body, ltt[active], accuracy)
+        if aberration:
+            pos = target - _CalcVsopArray(Body.Earth, ltt[active], False, accuracy)
+        else:
+            pos = target - observer[:, active]
+        ut2 = times.ut[active] - _np.sqrt(pos[0]**2 + pos[1]**2 + pos[2]**2) / C_AUDAY
+        tt2 = _TerrestrialTimeArray(ut2)
+        done = _np.abs(tt2 - ltt[active]) < 1.0e-9     # 86.4 microseconds
+        result[:, active[done]] = pos[:, done]
+        active = active[~done]
+        if len(active) == 0:
+            return VectorArray(result[0], result[1], result[2], times)
+        ltt[active] = tt2[~done]
+    # This should never happen. Usually the solver converges after 3 iterations.
+    raise NoConvergeError()
+
+
 def _ExportState(terse: _body_state_t, time: Time) -> StateVector:
     return StateVector(
         terse.r.x, terse.r.y, terse.r.z,
@@ -4426,7 +7086,8 @@ def BaryState(body: Body, time: Time) -> StateVector:
         return _ExportState(bary.Neptune, time)
 
     if body in [Body.Moon, Body.EMB]:
-        earth = _CalcVsopPosVel(_vsop[Body.Earth.value], time.tt)
+        # Like the other bodies here, always use the full VSOP87 model.
+        earth = _CalcEarthPosVel(time.tt, VsopAccuracy.Full)
         state = GeoMoonState(time) if body == Body.Moon else GeoEmbState(time)
         return StateVector(
             state.x  + bary.Sun.r.x + earth.r.x,
@@ -4454,7 +7115,7 @@ def BaryState(body: Body, time: Time) -> StateVector:
     raise InvalidBodyError(body)
 
 
-def HelioState(body: Body, time: Time) -> StateVector:
+def HelioState(body: Body, time: Time, accuracy: Optional[VsopAccuracy] = None) -> StateVector:
     """Calculates heliocentric position and velocity vectors for the given body.
 
     Given a body and a time, calculates the position and velocity
@@ -4477,6 +7138,9 @@ def HelioState(body: Body, time: Time) -> StateVector:
         Also allowed to be a user-defined star created by #DefineStar.
     time : Time
         The date and time for which to calculate position and velocity.
+    accuracy : VsopAccuracy, optional
+        The VSOP87 accuracy tier for the planets.
+        If omitted, the tier selected by #SetVsopAccuracy is used.
 
     Returns
     -------
@@ -4500,16 +7164,19 @@ def HelioState(body: Body, time: Time) -> StateVector:
             time
         )
 
+    if body == Body.Earth:
+        return _ExportState(_CalcEarthPosVel(time.tt, accuracy), time)
+
     if 0 <= body.value < len(_vsop):
         # Planets included in the VSOP87 model.
-        planet = _CalcVsopPosVel(_vsop[body.value], time.tt)
+        planet = _CalcVsopPosVel(_VsopModel(body, accuracy), time.tt)
         return _ExportState(planet, time)
 
     if body == Body.Pluto:
         return _CalcPluto(time, True)
 
     if body in [Body.Moon, Body.EMB]:
-        earth = _CalcVsopPosVel(_vsop[Body.Earth.value], time.tt)
+        earth = _CalcEarthPosVel(time.tt, accuracy)
         state = GeoMoonState(time) if body == Body.Moon else GeoEmbState(time)
         return StateVector(
             state.x  + earth.r.x,
@@ -4528,6 +7195,39 @@ def HelioState(body: Body, time: Time) -> StateVector:
     raise InvalidBodyError(body)
 
 
+def HelioStateArray(body: Body, times: TimeArray, accuracy: Optional[VsopAccuracy] = None) -> StateVectorArray:
+    """Calculates heliocentric position and velocity vectors for every time in a #TimeArray.
+
+    This is the batch variant of #HelioState. For the Sun and the planets
+    Mercury through Neptune, all times are evaluated together using the
+    vectorized VSOP87 model; the results agree with #HelioState to round-off.
+
+    Parameters
+    ----------
+    body : Body
+        The celestial body whose heliocentric state vectors are to be calculated.
+        The same bodies are allowed as for #HelioState.
+    times : TimeArray
+        The dates and times for which to calculate position and velocity.
+    accuracy : VsopAccuracy, optional
+        The VSOP87 accuracy tier for the planets.
+        If omitted, the tier selected by #SetVsopAccuracy is used.
+
+    Returns
+    -------
+    StateVectorArray
+        The heliocentric position and velocity vectors of the body, one per time.
+    """
+    _RequireNumpy()
+    if 0 <= body.value < len(_vsop):
+        (x, y, z, vx, vy, vz) = _CalcVsopArray(body, times.tt, True, accuracy)
+        return StateVectorArray(x, y, z, vx, vy, vz, times)
+    if body == Body.Sun:
+        zero = _np.zeros(len(times))
+        return StateVectorArray(zero, zero.copy(), zero.copy(), zero.copy(), zero.copy(), zero.copy(), times)
+    return _StateVectorArrayFromFunc(times, lambda time: HelioState(body, time, accuracy))
+
+
 def Equator(body: Body, time: Time, observer: Observer, ofdate: bool, aberration: bool) -> Equatorial:
     """Calculates equatorial coordinates of a celestial body as seen by an observer on the Earth's surface.
 
@@ -4775,6 +7475,8 @@ class HorizontalCoordinates:
     dec : float
         The declination in degrees.
     """
+    __slots__ = ('azimuth', 'altitude', 'ra', 'dec')
+
     def __init__(self, azimuth: float, altitude: float, ra: float, dec: float) -> None:
         self.azimuth = azimuth
         self.altitude = altitude
@@ -5065,6 +7767,8 @@ class EclipticCoordinates:
     elon : float
         Longitude in degrees around the ecliptic plane prograde from the equinox.
     """
+    __slots__ = ('vec', 'elat', 'elon')
+
     def __init__(self, vec: Vector, elat: float, elon: float) -> None:
         self.vec = vec
         self.elat = elat
@@ -5153,7 +7857,7 @@ def Ecliptic(eqj: Vector) -> EclipticCoordinates:
     # Calculate nutation and obliquity for this time.
     # As an optimization, the nutation angles are cached in `eqj.t`,
     # and reused below when the `nutation` function is called.
-    et = _e_tilt(eqj.t)
+    et = eqj.t._etilt()
 
     # Convert J2000 mean equator (EQJ) to true equator of date (EQD).
     mean_pos = _precession([eqj.x, eqj.y, eqj.z], eqj.t, _PrecessDir.From2000)
@@ -5411,7 +8115,12 @@ def SearchRelativeLongitude(body: Body, targetRelLon:float, startTime: Time) ->
     error_angle = _rlon_offset(body, startTime, direction, targetRelLon)
     if error_angle > 0.0:
         error_angle -= 360.0    # force searching forward in time
-    time = startTime
+    return _RelativeLongitudeLoop(body, direction, targetRelLon, startTime, error_angle, syn)[0]
+
+def _RelativeLongitudeLoop(body: Body, direction: float, targetRelLon: float, time: Time, error_angle: float, syn: float) -> Tuple[Time, float]:
+    # Starting from `time`, where the relative longitude is `error_angle` degrees from the target,
+    # iterates to the time of the target relative longitude.
+    # Returns that time and the synodic period that matches the planets' speeds near it.
     iter_count = 0
     while iter_count < 100:
         # Estimate how many days in the future (positive) or past (negative)
@@ -5419,7 +8128,7 @@ def SearchRelativeLongitude(body: Body, targetRelLon:float, startTime: Time) ->
         day_adjust = (-error_angle/360.0) * syn
         time = time.AddDays(day_adjust)
         if abs(day_adjust) * _SECONDS_PER_DAY < 1.0:
-            return time
+            return (time, syn)
         prev_angle = error_angle
         error_angle = _rlon_offset(body, time, direction, targetRelLon)
         if abs(prev_angle) < 30.0 and prev_angle != error_angle:
@@ -5432,6 +8141,151 @@ def SearchRelativeLongitude(body: Body, targetRelLon:float, startTime: Time) ->
         iter_count += 1
     raise NoConvergeError()
 
+
+@enum.unique
+class SynodicEventKind(enum.Enum):
+    """The kinds of events reported by #SynodicEvents.
+
+    Values
+    ------
+    InferiorConjunction: Mercury or Venus passes between the Sun and the Earth (relative longitude 0).
+    SuperiorConjunction: The planet is on the far side of the Sun from the Earth (relative longitude 180).
+    Opposition: The Earth passes between the Sun and a planet beyond it (relative longitude 0).
+    """
+    InferiorConjunction = 0
+    SuperiorConjunction = 1
+    Opposition = 2
+
+
+class SynodicEvent:
+    """A conjunction or opposition of a planet, as reported by #SynodicEvents.
+
+    Attributes
+    ----------
+    body : Body
+        The planet.
+    kind : SynodicEventKind
+        Whether the event is an inferior conjunction, a superior conjunction, or an opposition.
+    time : Time
+        When the event happens.
+    """
+    def __init__(self, body: Body, kind: SynodicEventKind, time: Time) -> None:
+        self.body = body
+        self.kind = kind
+        self.time = time
+
+    def __repr__(self) -> str:
+        return 'SynodicEvent({}, {}, {})'.format(self.body, self.kind, repr(self.time))
+
+
+def _SynodicSeries(body: Body, startTime: Time, stopTime: Time) -> List[Tuple[float, float]]:
+    # Returns (relative longitude, ut) for each event of one planet in [startTime, stopTime).
+    direction = +1.0 if _IsSuperiorPlanet(body) else -1.0
+    # The first two events are found from scratch; they have different relative longitudes.
+    first = sorted(((SearchRelativeLongitude(body, lon, startTime), lon) for lon in (0.0, 180.0)), key=lambda pair: pair[0].ut)
+    times = [time for (time, _) in first]
+    targets = [lon for (_, lon) in first]
+    # The synodic period that matches the planets' speeds near each event.
+    syns = [_SynodicPeriod(body)] * 2
+    # Mercury's intervals vary too much from one event to the next,
+    # but three of its synodic periods are close to one year, so the
+    # geometry nearly repeats: predict from the events a year earlier.
+    stride = 3 if body == Body.Mercury else 1
+    result = []
+    while times[-2].ut < stopTime.ut:
+        result.append((targets[-2], times[-2].ut))
+        # The next event has the same relative longitude as the one before the latest.
+        # Predict it one synodic period later, or by the interval between
+        # earlier events of the same kind once they are known.
+        target = targets[-2]
+        if len(times) >= 2 + 2*stride:
+            guess = times[-2*stride].AddDays(times[-2].ut - times[-2 - 2*stride].ut)
+            syn = syns[-2*stride]
+        else:
+            syn = _SynodicPeriod(body)
+            guess = times[-2].AddDays(syn)
+        error_angle = _rlon_offset(body, guess, direction, target)
+        if abs(error_angle) < 10.0:
+            (time, syn) = _RelativeLongitudeLoop(body, direction, target, guess, error_angle, syn)
+        else:
+            # The prediction is too far off to trust the local synodic period.
+            # Search forward from the latest event, the way SearchRelativeLongitude does.
+            syn = _SynodicPeriod(body)
+            time = SearchRelativeLongitude(body, target, times[-1])
+        times = times[-1 - 2*stride:] + [time]
+        targets = targets[-1 - 2*stride:] + [target]
+        syns = syns[-1 - 2*stride:] + [syn]
+    return [(lon, ut) for (lon, ut) in result if ut >= startTime.ut]
+
+
+def _SynodicWorker(args: Tuple[int, float, float]) -> List[Tuple[float, float]]:
+    # Runs in a worker process: the events of one planet, as plain numbers.
+    (body_value, ut1, ut2) = args
+    return _SynodicSeries(Body(body_value), Time(ut1), Time(ut2))
+
+
+def SynodicEvents(bodies: List[Body], startTime: Time, stopTime: Time, workers: Optional[int] = 1) -> List[SynodicEvent]:
+    """Lists every conjunction and opposition of one or more planets in a range of time.
+
+    For Mercury and Venus, the events are inferior and superior conjunctions.
+    For the planets beyond the Earth, they are oppositions and conjunctions
+    (reported as superior conjunctions).
+    These are the same events that #SearchRelativeLongitude finds for
+    relative longitudes 0 and 180, but each one after the first two of each
+    planet is predicted from the interval between the previous events
+    of the same kind. This saves about a quarter of the relative longitude
+    calculations; over several centuries, listing the events of all the
+    planets takes about 10 to 25 percent less time than chaining calls
+    to #SearchRelativeLongitude.
+
+    With more than one planet, the planets can optionally be spread across
+    a pool of worker processes. On platforms that start worker processes
+    by spawning a new interpreter (Windows and macOS), the calling script
+    must then protect its main code with `if __name__ == '__main__':`.
+
+    Parameters
+    ----------
+    bodies : list of Body
+        The planets, any of Mercury through Pluto except the Earth.
+    startTime : Time
+        The beginning of the time range.
+    stopTime : Time
+        The end of the time range.
+    workers : int or `None`, optional
+        The number of worker processes. By default, 1: all planets are
+        calculated in this process. Pass `None` for one per processor.
+
+    Returns
+    -------
+    list of SynodicEvent
+        The events of all the planets in chronological order.
+    """
+    for body in bodies:
+        if body == Body.Earth:
+            raise EarthNotAllowedError()
+        if body in (Body.Moon, Body.Sun) or not (0 <= body.value < len(_PlanetOrbitalPeriod)):
+            raise InvalidBodyError(body)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(bodies) <= 1:
+        series = [_SynodicSeries(body, startTime, stopTime) for body in bodies]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(workers, len(bodies))) as pool:
+            series = list(pool.map(_SynodicWorker, [(body.value, startTime.ut, stopTime.ut) for body in bodies]))
+    events = []
+    for (body, found) in zip(bodies, series):
+        superior = _IsSuperiorPlanet(body)
+        for (lon, ut) in found:
+            if lon != 0.0:
+                kind = SynodicEventKind.SuperiorConjunction
+            elif superior:
+                kind = SynodicEventKind.Opposition
+            else:
+                kind = SynodicEventKind.InferiorConjunction
+            events.append(SynodicEvent(body, kind, Time(ut)))
+    events.sort(key=lambda event: event.time.ut)
+    return events
+
 def _neg_elong_slope(body: Body, time: Time) -> float:
     dt = 0.1
     t1 = time.AddDays(-dt/2.0)
@@ -5764,6 +8618,40 @@ def NextMoonQuarter(mq: MoonQuarter) -> MoonQuarter:
         raise InternalError()
     return next_mq
 
+def MoonQuarters(startTime: Time, stopTime: Time) -> Iterator[MoonQuarter]:
+    """Generates the lunar quarters in a range of time, in chronological order.
+
+    This generator finds the same events as calling #SearchMoonQuarter once
+    and then #NextMoonQuarter repeatedly, but faster: the intervals between
+    the quarters already found predict when the next one happens,
+    so each search covers a narrow window of time. Over a century or more,
+    this runs about 1.2 to 1.3 times as fast as the loop.
+    Events are calculated only as they are consumed.
+
+    Parameters
+    ----------
+    startTime : Time
+        The date and time at which to start searching for lunar quarters.
+    stopTime : Time
+        The generator stops at the first lunar quarter after this time.
+
+    Returns
+    -------
+    generator of MoonQuarter
+    """
+    mq = SearchMoonQuarter(startTime)
+    history: List[float] = []
+    while mq.time.ut <= stopTime.ut:
+        yield mq
+        history = history[-8:] + [mq.time.tt]
+        quarter = (1 + mq.quarter) % 4
+        (dt1, dt2) = _NextEventWindow(history, 4, 6.5, 8.3, 0.35)
+        time = Search(_moon_offset, 90.0 * quarter, mq.time.AddDays(dt1), mq.time.AddDays(dt2), 0.1)
+        if time is None:
+            mq = NextMoonQuarter(mq)
+        else:
+            mq = MoonQuarter(quarter, time)
+
 
 class AtmosphereInfo:
     """Information about idealized atmospheric variables at a given elevation.
@@ -6738,16 +9626,63 @@ def Seasons(year: int) -> SeasonInfo:
     dec_solstice = _FindSeasonChange(270, year, 12, 10)
     return SeasonInfo(mar_equinox, jun_solstice, sep_equinox, dec_solstice)
 
+class SeasonEvent:
+    """An equinox or solstice, as reported by #SeasonEvents.
+
+    Attributes
+    ----------
+    season : int
+        0=March equinox, 1=June solstice, 2=September equinox, 3=December solstice.
+    time : Time
+        The date and time of the equinox or solstice.
+    """
+    def __init__(self, season: int, time: Time) -> None:
+        self.season = season
+        self.time = time
+
+    def __repr__(self) -> str:
+        return 'SeasonEvent({}, {})'.format(self.season, repr(self.time))
+
+def SeasonEvents(firstYear: int, lastYear: int) -> Iterator[SeasonEvent]:
+    """Generates the equinoxes and solstices of a range of years, in chronological order.
+
+    This generator finds the same events as calling #Seasons for each year
+    from `firstYear` through `lastYear`, but faster: the intervals between
+    the events already found predict the next one to within a few minutes,
+    so each search covers a narrow window of time.
+    Events are calculated only as they are consumed.
+
+    Parameters
+    ----------
+    firstYear : int
+        The calendar year of the first March equinox to generate.
+    lastYear : int
+        The calendar year of the last December solstice to generate.
+
+    Returns
+    -------
+    generator of SeasonEvent
+    """
+    months = (3, 6, 9, 12)
+    history: List[float] = []
+    time = None
+    for year in range(firstYear, lastYear + 1):
+        for season in range(4):
+            if time is not None:
+                (dt1, dt2) = _NextEventWindow(history, 4, 88.5, 94.2, 0.05)
+                time = Search(_sun_offset, 90.0 * season, time.AddDays(dt1), time.AddDays(dt2), 0.01)
+            if time is None:
+                time = _FindSeasonChange(90.0 * season, year, months[season], 10)
+            yield SeasonEvent(season, time)
+            history = history[-8:] + [time.tt]
+
 def _MoonDistance(time: Time) -> float:
     return _CalcMoon(time).distance_au
 
-def _moon_distance_slope(direction: int, time: Time) -> float:
-    dt = 0.001
-    t1 = time.AddDays(-dt/2.0)
-    t2 = time.AddDays(+dt/2.0)
-    dist1 = _MoonDistance(t1)
-    dist2 = _MoonDistance(t2)
-    return direction * (dist2 - dist1) / dt
+def _moon_distance_slope(direction: int, time: Time) -> Tuple[float, float]:
+    # Returns the rate of change of the Moon's distance, and the rate of change of that rate.
+    (_, slope, curvature) = _MoonDistanceRates(time)
+    return (direction * slope, direction * curvature)
 
 @enum.unique
 class ApsisKind(enum.Enum):
@@ -6835,11 +9770,11 @@ def SearchLunarApsis(startTime: Time) -> Apsis:
     """
     increment = 5.0     # number of days to skip on each iteration
     t1 = startTime
-    m1 = _moon_distance_slope(+1, t1)
+    (m1, _) = _moon_distance_slope(+1, t1)
     iter_count = 0
     while iter_count * increment < 2.0 * _MEAN_SYNODIC_MONTH:
         t2 = t1.AddDays(increment)
-        m2 = _moon_distance_slope(+1, t2)
+        (m2, _) = _moon_distance_slope(+1, t2)
         if m1 * m2 <= 0.0:
             # There is a change of slope polarity within the time range [t1, t2].
             # Therefore this time range contains an apsis.
@@ -6847,12 +9782,12 @@ def SearchLunarApsis(startTime: Time) -> Apsis:
             if m1 < 0.0 or m2 > 0.0:
                 # We found a minimum-distance event: perigee.
                 # Search the time range for the time when the slope goes from negative to positive.
-                apsis_time = Search(_moon_distance_slope, +1, t1, t2, 1.0)
+                apsis_time = SearchWithRate(_moon_distance_slope, +1, t1, t2, 1.0)
                 kind = ApsisKind.Pericenter
             elif m1 > 0.0 or m2 < 0.0:
                 # We found a maximum-distance event: apogee.
                 # Search the time range for the time when the slope goes from positive to negative.
-                apsis_time = Search(_moon_distance_slope, -1, t1, t2, 1.0)
+                apsis_time = SearchWithRate(_moon_distance_slope, -1, t1, t2, 1.0)
                 kind = ApsisKind.Apocenter
             else:
                 # This should never happen. It should not be possible for both slopes to be zero.
@@ -6902,15 +9837,50 @@ def NextLunarApsis(apsis: Apsis) -> Apsis:
         raise InternalError()   # should have found opposite apsis kind
     return next_apsis
 
+def LunarApsides(startTime: Time, stopTime: Time) -> Iterator[Apsis]:
+    """Generates the lunar perigees and apogees in a range of time, in chronological order.
+
+    This generator finds the same events as calling #SearchLunarApsis once
+    and then #NextLunarApsis repeatedly, but faster: each apsis is searched
+    for directly in the window of 11.5 to 16.5 days after the previous one,
+    which always contains exactly one apsis.
+    Events are calculated only as they are consumed.
+
+    Parameters
+    ----------
+    startTime : Time
+        The date and time at which to start searching for lunar apsides.
+    stopTime : Time
+        The generator stops at the first apsis after this time.
+
+    Returns
+    -------
+    generator of Apsis
+    """
+    # The Sun perturbs the times of perigee by up to a few days,
+    # so unlike the lunar quarters, the previous intervals do not predict the next one well.
+    apsis = SearchLunarApsis(startTime)
+    while apsis.time.ut <= stopTime.ut:
+        yield apsis
+        if apsis.kind == ApsisKind.Pericenter:
+            (kind, direction) = (ApsisKind.Apocenter, -1)
+        else:
+            (kind, direction) = (ApsisKind.Pericenter, +1)
+        time = SearchWithRate(_moon_distance_slope, direction, apsis.time.AddDays(11.5), apsis.time.AddDays(16.5), 1.0)
+        if time is None:
+            apsis = NextLunarApsis(apsis)
+        else:
+            apsis = Apsis(time, kind, _MoonDistance(time))
 
-def _planet_distance_slope(context: Tuple[float, Body], time: Time) -> float:
+
+def _planet_distance_slope(context: Tuple[float, Body], time: Time) -> Tuple[float, float]:
+    # Returns the rate of change of the planet's distance from the Sun, and the rate of change of that rate.
+    # The rates are exact derivatives of the VSOP87 distance series. Near an apsis of a slow planet
+    # the distance hardly changes, so a finite-difference slope over a day or more is biased:
+    # such a search puts Saturn's apsides a few seconds, and Uranus's up to half a minute, away from these.
     (direction, body) = context
-    dt = 0.001
-    t1 = time.AddDays(-dt/2.0)
-    t2 = time.AddDays(+dt/2.0)
-    dist1 = HelioDistance(body, t1)
-    dist2 = HelioDistance(body, t2)
-    return direction * (dist2 - dist1) / dt
+    (_, slope, curvature) = _VsopHelioDistanceRates(_VsopModel(body, None), time)
+    return (direction * slope, direction * curvature)
 
 
 def SearchPlanetApsis(body: Body, startTime: Time) -> Apsis:
@@ -6947,11 +9917,11 @@ def SearchPlanetApsis(body: Body, startTime: Time) -> Apsis:
     orbit_period_days = _PlanetOrbitalPeriod[body.value]
     increment = orbit_period_days / 6.0
     t1 = startTime
-    m1 = _planet_distance_slope(positive_slope, t1)
+    (m1, _) = _planet_distance_slope(positive_slope, t1)
     iter_count = 0
     while iter_count * increment < 2 * orbit_period_days:
         t2 = t1.AddDays(increment)
-        m2 = _planet_distance_slope(positive_slope, t2)
+        (m2, _) = _planet_distance_slope(positive_slope, t2)
         if m1 * m2 <= 0.0:
             # There is a change of slope polarity within the time range [t1, t2].
             # Therefore this time range contains an apsis.
@@ -6968,7 +9938,7 @@ def SearchPlanetApsis(body: Body, startTime: Time) -> Apsis:
                 kind = ApsisKind.Apocenter
             else:
                 raise InternalError()   # at least one of the planet distance slopes should have been nonzero
-            search = Search(_planet_distance_slope, context, t1, t2, 1.0)
+            search = SearchWithRate(_planet_distance_slope, context, t1, t2, 1.0)
             if search is None:
                 raise InternalError()   # failed to find where planet distance slope passed through zero
 
@@ -7869,7 +10839,7 @@ def Rotation_ECT_EQD(time: Time) -> RotationMatrix:
     RotationMatrix
         A rotation matrix that converts ECT to EQD.
     """
-    et = _e_tilt(time)
+    et = time._etilt()
     tobl = math.radians(et.tobl)
     c = math.cos(tobl)
     s = math.sin(tobl)
@@ -7897,7 +10867,7 @@ def Rotation_EQD_ECT(time: Time) -> RotationMatrix:
     RotationMatrix
         A rotation matrix that converts EQD to ECT.
     """
-    et = _e_tilt(time)
+    et = time._etilt()
     tobl = math.radians(et.tobl)
     c = math.cos(tobl)
     s = math.sin(tobl)
@@ -8545,28 +11515,73 @@ def _PlanetShadow(body: Body, planet_radius_km: float, time: Time) -> _ShadowInf
     return _CalcShadow(planet_radius_km, time, -p, p-s)
 
 
-def _ShadowDistanceSlope(shadowfunc: Callable[[Time], _ShadowInfo], time: Time) -> float:
-    dt = 1.0 / 86400.0
-    t1 = time.AddDays(-dt)
-    t2 = time.AddDays(+dt)
-    shadow1 = shadowfunc(t1)
-    shadow2 = shadowfunc(t2)
-    return (shadow2.r - shadow1.r) / dt
+def _ShadowRates(target: Vector, tvel: List[float], sdir: Vector, svel: List[float]) -> Tuple[float, float]:
+    # Given the vectors passed to _CalcShadow and their velocities in AU/day,
+    # returns half the rate of change of the squared distance between the target
+    # and the shadow axis, which is zero when the target is closest to the axis.
+    # Also returns the rate of change of that value, ignoring accelerations,
+    # which are small compared to the velocities over the short times involved.
+    dd = sdir.x*sdir.x + sdir.y*sdir.y + sdir.z*sdir.z
+    u = (sdir.x*target.x + sdir.y*target.y + sdir.z*target.z) / dd
+    du = (svel[0]*target.x + svel[1]*target.y + svel[2]*target.z
+        + sdir.x*tvel[0] + sdir.y*tvel[1] + sdir.z*tvel[2]
+        - 2.0*u*(sdir.x*svel[0] + sdir.y*svel[1] + sdir.z*svel[2])) / dd
+    # The offset of the target from the axis, and its velocity.
+    (px, py, pz) = (target.x - u*sdir.x, target.y - u*sdir.y, target.z - u*sdir.z)
+    vx = tvel[0] - u*svel[0] - du*sdir.x
+    vy = tvel[1] - u*svel[1] - du*sdir.y
+    vz = tvel[2] - u*svel[2] - du*sdir.z
+    return (px*vx + py*vy + pz*vz, vx*vx + vy*vy + vz*vz)
+
+
+def _EarthShadowSlope(context: None, time: Time) -> Tuple[float, float]:
+    # The Sun's apparent motion is the reverse of the Earth's orbital velocity;
+    # the changes in light travel time and aberration are negligible here.
+    s = GeoVector(Body.Sun, time, True)
+    m = GeoMoonState(time)
+    e = HelioState(Body.Earth, time)
+    return _ShadowRates(
+        Vector(m.x, m.y, m.z, time), [m.vx, m.vy, m.vz],
+        -s, [e.vx, e.vy, e.vz])
+
+
+def _MoonShadowSlope(context: None, time: Time) -> Tuple[float, float]:
+    s = GeoVector(Body.Sun, time, True)
+    m = GeoMoonState(time)
+    e = HelioState(Body.Earth, time)
+    mv = Vector(m.x, m.y, m.z, time)
+    return _ShadowRates(
+        -mv, [-m.vx, -m.vy, -m.vz],
+        mv-s, [m.vx + e.vx, m.vy + e.vy, m.vz + e.vz])
+
+
+def _LocalMoonShadowSlope(observer: Observer, time: Time) -> Tuple[float, float]:
+    o = ObserverState(time, observer, False)
+    s = GeoVector(Body.Sun, time, True)
+    m = GeoMoonState(time)
+    e = HelioState(Body.Earth, time)
+    lo = Vector(o.x - m.x, o.y - m.y, o.z - m.z, time)
+    return _ShadowRates(
+        lo, [o.vx - m.vx, o.vy - m.vy, o.vz - m.vz],
+        Vector(m.x - s.x, m.y - s.y, m.z - s.z, time), [m.vx + e.vx, m.vy + e.vy, m.vz + e.vz])
 
 
-def _PlanetShadowSlope(context: Tuple[Body, float], time: Time) -> float:
+def _PlanetShadowSlope(context: Tuple[Body, float], time: Time) -> Tuple[float, float]:
     (body, planet_radius_km) = context
-    dt = 1.0 / 86400.0
-    shadow1 = _PlanetShadow(body, planet_radius_km, time.AddDays(-dt))
-    shadow2 = _PlanetShadow(body, planet_radius_km, time.AddDays(+dt))
-    return (shadow2.r - shadow1.r) / dt
+    p = GeoVector(body, time, True)
+    s = GeoVector(Body.Sun, time, True)
+    b = HelioState(body, time)
+    e = HelioState(Body.Earth, time)
+    return _ShadowRates(
+        -p, [e.vx - b.vx, e.vy - b.vy, e.vz - b.vz],
+        p-s, [b.vx, b.vy, b.vz])
 
 
 def _PeakEarthShadow(search_center_time: Time) -> _ShadowInfo:
     window = 0.03        # initial search window, in days, before/after given time
     t1 = search_center_time.AddDays(-window)
     t2 = search_center_time.AddDays(+window)
-    tx = Search(_ShadowDistanceSlope, _EarthShadow, t1, t2, 1.0)
+    tx = SearchWithRate(_EarthShadowSlope, None, t1, t2, 1.0)
     if tx is None:
         raise InternalError()
     return _EarthShadow(tx)
@@ -8576,7 +11591,7 @@ def _PeakMoonShadow(search_center_time: Time) -> _ShadowInfo:
     window = 0.03        # initial search window, in days, before/after given time
     t1 = search_center_time.AddDays(-window)
     t2 = search_center_time.AddDays(+window)
-    tx = Search(_ShadowDistanceSlope, _MoonShadow, t1, t2, 1.0)
+    tx = SearchWithRate(_MoonShadowSlope, None, t1, t2, 1.0)
     if tx is None:
         raise InternalError()
     return _MoonShadow(tx)
@@ -8587,7 +11602,7 @@ def _PeakLocalMoonShadow(search_center_time: Time, observer: Observer) -> _Shado
     window = 0.2
     t1 = search_center_time.AddDays(-window)
     t2 = search_center_time.AddDays(+window)
-    tx = Search(_ShadowDistanceSlope, lambda time: _LocalMoonShadow(time, observer), t1, t2, 1.0)
+    tx = SearchWithRate(_LocalMoonShadowSlope, observer, t1, t2, 1.0)
     if tx is None:
         raise InternalError()
     return _LocalMoonShadow(tx, observer)
@@ -8597,7 +11612,7 @@ def _PeakPlanetShadow(body: Body, planet_radius_km: float, search_center_time: T
     window = 1.0     # days before/after inferior conjunction to search for minimum shadow distance.
     t1 = search_center_time.AddDays(-window)
     t2 = search_center_time.AddDays(+window)
-    tx = Search(_PlanetShadowSlope, (body, planet_radius_km), t1, t2, 1.0)
+    tx = SearchWithRate(_PlanetShadowSlope, (body, planet_radius_km), t1, t2, 1.0)
     if tx is None:
         raise InternalError()
     return _PlanetShadow(body, planet_radius_km, tx)
@@ -9574,6 +12589,43 @@ def NextMoonNode(prevNode: NodeEventInfo) -> NodeEventInfo:
     return node
 
 
+def MoonNodes(startTime: Time, stopTime: Time) -> Iterator[NodeEventInfo]:
+    """Generates the ascending and descending nodes of the Moon in a range of time, in chronological order.
+
+    This generator finds the same events as calling #SearchMoonNode once
+    and then #NextMoonNode repeatedly, but faster: the intervals between
+    the nodes already found predict when the next one happens,
+    so each search covers a narrow window of time.
+    Events are calculated only as they are consumed.
+
+    Parameters
+    ----------
+    startTime : Time
+        The date and time at which to start searching for nodes.
+    stopTime : Time
+        The generator stops at the first node after this time.
+
+    Returns
+    -------
+    generator of NodeEventInfo
+    """
+    node = SearchMoonNode(startTime)
+    history: List[float] = []
+    while node.time.ut <= stopTime.ut:
+        yield node
+        history = history[-4:] + [node.time.tt]
+        if node.kind == NodeEventKind.Ascending:
+            kind = NodeEventKind.Descending
+        else:
+            kind = NodeEventKind.Ascending
+        (dt1, dt2) = _NextEventWindow(history, 2, 12.2, 14.9, 0.35)
+        time = Search(_MoonNodeSearchFunc, kind.value, node.time.AddDays(dt1), node.time.AddDays(dt2), 1.0)
+        if time is None:
+            node = NextMoonNode(node)
+        else:
+            node = NodeEventInfo(kind, time)
+
+
 class LibrationInfo:
     """Lunar libration angles, returned by #Libration.
 
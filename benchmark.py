@@ -0,0 +1,747 @@
+#!/usr/bin/env python3
+"""
+Performance benchmarks for astronomy.py
+
+Usage:
+    python benchmark.py             list the available suites
+    python benchmark.py SUITE ...   run one or more suites
+    python benchmark.py all         run every suite
+"""
+
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import astronomy
+from astronomy import Body, Observer, Time
+
+# ----------------------------------------------------------
+
+def _Rate(func, count, repeat=3):
+    """Returns the best observed number of calls per second of func(i), i in [0, count)."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for i in range(count):
+            func(i)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return count / best
+
+
+def _BytesPerObject(factory, count=20000):
+    """Returns the average number of bytes allocated per object created by factory(i)."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    keep = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Subtract the list that holds the objects alive.
+    return (after - before - sys.getsizeof(keep)) / count
+
+
+def _DictBacked(cls):
+    """Returns a copy of a slotted class that stores its attributes in a per-instance __dict__,
+    which is what the class looked like before it declared __slots__."""
+    slots = set(cls.__slots__)
+    members = dict((k, v) for (k, v) in cls.__dict__.items() if k not in slots and k != '__slots__')
+    return type(cls.__name__ + 'Dict', cls.__bases__, members)
+
+
+def _RateDictBacked(func, count, repeat=3):
+    """Like _Rate, but with every slotted class of astronomy.py replaced by its
+    dict-backed copy from _DictBacked while func runs."""
+    saved = dict((name, cls) for (name, cls) in vars(astronomy).items()
+                 if isinstance(cls, type) and cls.__module__ == 'astronomy' and '__slots__' in cls.__dict__)
+    try:
+        for (name, cls) in saved.items():
+            setattr(astronomy, name, _DictBacked(cls))
+        return _Rate(func, count, repeat)
+    finally:
+        for (name, cls) in saved.items():
+            setattr(astronomy, name, cls)
+
+
+def _Header(title):
+    print()
+    print(title)
+    print('-' * len(title))
+
+# ----------------------------------------------------------
+
+def BenchMemory():
+    """Per-object memory of the slotted value types, and throughput of hot paths."""
+    t = Time(9000.0)
+    tv = astronomy._TerseVector(1.0, 2.0, 3.0)
+    vec = astronomy.Vector(1.0, 2.0, 3.0, t)
+    factories = [
+        (Time, lambda cls, i: cls(i + 0.5, i + 0.5)),
+        (astronomy.Vector, lambda cls, i: cls(i, 2.0, 3.0, t)),
+        (astronomy.StateVector, lambda cls, i: cls(i, 2.0, 3.0, 4.0, 5.0, 6.0, t)),
+        (astronomy._TerseVector, lambda cls, i: cls(i, 2.0, 3.0)),
+        (astronomy.Equatorial, lambda cls, i: cls(i, 2.0, 3.0, vec)),
+        (astronomy.HorizontalCoordinates, lambda cls, i: cls(i, 2.0, 3.0, 4.0)),
+        (astronomy.EclipticCoordinates, lambda cls, i: cls(vec, i, 2.0)),
+        (astronomy.Spherical, lambda cls, i: cls(i, 2.0, 3.0)),
+        (astronomy._body_grav_calc_t, lambda cls, i: cls(i, tv, tv, tv)),
+    ]
+    _Header('Bytes per object: __slots__ vs dict-backed')
+    print('{:<24s} {:>8s} {:>8s} {:>8s}'.format('type', 'slots', 'dict', 'saved'))
+    for (cls, make) in factories:
+        dictcls = _DictBacked(cls)
+        slotted = _BytesPerObject(lambda i: make(cls, i))
+        dicted = _BytesPerObject(lambda i: make(dictcls, i))
+        print('{:<24s} {:8.1f} {:8.1f} {:7.0f}%'.format(cls.__name__, slotted, dicted, 100.0 * (dicted - slotted) / dicted))
+
+    observer = Observer(-23.55, -46.63, 760.0)
+    base = Time.Make(2025, 1, 1, 0, 0, 0)
+    _Header('Throughput (calls per second): __slots__ vs dict-backed')
+    print('{:<36s} {:>12s} {:>12s} {:>8s}'.format('loop', 'slots', 'dict', 'speedup'))
+    def GeoMars(i):
+        astronomy.GeoVector(Body.Mars, base.AddDays(i), True)
+    def EquatorMoon(i):
+        astronomy.Equator(Body.Moon, base.AddDays(i), observer, True, True)
+    pluto_tt = base.tt
+    def BuildSegment(i):
+        astronomy._GetSegment([None] * (astronomy._PLUTO_NUM_STATES - 1), pluto_tt)
+    loops = [
+        ('GeoVector(Mars)', GeoMars, 2000, 3),
+        ('Equator(Moon, ofdate)', EquatorMoon, 2000, 3),
+        ('Pluto integrator segment build', BuildSegment, 3, 1),
+    ]
+    for (name, func, count, repeat) in loops:
+        slotted = _Rate(func, count, repeat)
+        dicted = _RateDictBacked(func, count, repeat)
+        print('{:<36s} {:12.2f} {:12.2f} {:7.2f}x'.format(name, slotted, dicted, slotted / dicted))
+
+def BenchVsop():
+    """Scalar VSOP87 evaluation vs the vectorized TimeArray path."""
+    from astronomy import TimeArray
+    times = TimeArray.Range(Time.Make(2000, 1, 1, 0, 0, 0), Time.Make(2030, 1, 1, 0, 0, 0), 1.0)
+    scalar = list(times)
+    _Header('VSOP87 positions per second ({} epochs)'.format(len(times)))
+    print('{:<12s} {:>12s} {:>12s} {:>8s}'.format('body', 'scalar', 'batch', 'speedup'))
+    for body in [Body.Mercury, Body.Earth, Body.Jupiter, Body.Neptune]:
+        slow = _Rate(lambda i: astronomy.HelioVector(body, scalar[i]), len(scalar), 1)
+        fast = len(times) * _Rate(lambda i: astronomy.HelioVectorArray(body, times), 1)
+        print('{:<12s} {:12.0f} {:12.0f} {:7.1f}x'.format(body.name, slow, fast, fast / slow))
+
+
+def BenchChebyshev():
+    """Chebyshev ephemeris lookups vs the analytic models, with the fit error."""
+    start = Time.Make(2020, 1, 1, 0, 0, 0)
+    stop = Time.Make(2030, 1, 1, 0, 0, 0)
+    bodies = [Body.Mercury, Body.Earth, Body.Jupiter, Body.Pluto, Body.Moon]
+    begin = time.perf_counter()
+    ephem = astronomy.ChebyshevEphemeris.Generate(bodies, start, stop)
+    _Header('Chebyshev ephemeris 2020-2030 (generated in {:0.1f} s)'.format(time.perf_counter() - begin))
+    print('{:<10s} {:>12s} {:>12s} {:>8s} {:>12s}'.format('body', 'analytic/s', 'chebyshev/s', 'speedup', 'max err km'))
+    accuracy = dict((report.body, report) for report in ephem.ErrorReport(500))
+    times = [start.AddDays(i * 0.37) for i in range(5000)]
+    for body in bodies:
+        if body == Body.Moon:
+            slow = _Rate(lambda i: astronomy.GeoMoon(times[i]), len(times))
+        else:
+            slow = _Rate(lambda i: astronomy.HelioVector(body, times[i]), len(times))
+        fast = _Rate(lambda i: ephem.Position(body, times[i]), len(times))
+        print('{:<10s} {:12.0f} {:12.0f} {:7.1f}x {:12.6f}'.format(body.name, slow, fast, fast / slow, accuracy[body].maxError * astronomy.KM_PER_AU))
+
+
+def _TermCount(model):
+    return sum(len(series.termList) for formula in (model.lon, model.lat, model.rad) for series in formula.seriesList)
+
+
+def BenchTiers():
+    """Speed and accuracy of each VSOP87 accuracy tier, per planet."""
+    planets = [Body.Mercury, Body.Venus, Body.Earth, Body.Mars, Body.Jupiter, Body.Saturn, Body.Uranus, Body.Neptune]
+    # Sample the years 1800..2200 at an interval that does not alias with any orbit.
+    times = [Time.Make(1800, 1, 1, 0, 0, 0).AddDays(i * 97.13) for i in range(1500)]
+    _Header('VSOP87 accuracy tiers, 1800-2200: heliocentric and geocentric max error in arcseconds')
+    # Time the VSOP evaluations themselves, not hits in the Earth caches.
+    sizes = dict((name, info.maxsize) for (name, info) in astronomy.GetCacheInfo().items())
+    astronomy.SetCacheSize(0)
+    try:
+        _TierRows(planets, times)
+    finally:
+        for (name, maxsize) in sizes.items():
+            astronomy.SetCacheSize(maxsize, name)
+
+
+def _TierRows(planets, times):
+    """Prints the terms, speed, and errors of each tier for each planet."""
+    from astronomy import VsopAccuracy
+    print('{:<8s} {:<14s} {:>6s} {:>10s} {:>8s} {:>10s} {:>10s}'.format('planet', 'tier', 'terms', 'calls/s', 'speedup', 'helio"', 'geo"'))
+    for body in planets:
+        exact = [astronomy.HelioVector(body, t) for t in times]
+        geoexact = [astronomy.GeoVector(body, t, False) for t in times] if body != Body.Earth else None
+        full = None
+        for accuracy in VsopAccuracy:
+            terms = _TermCount(astronomy._VsopModel(body, accuracy))
+            rate = _Rate(lambda i: astronomy.HelioVector(body, times[i], accuracy), len(times))
+            if full is None:
+                full = rate
+            helio = max(astronomy.AngleBetween(exact[i], astronomy.HelioVector(body, t, accuracy)) for (i, t) in enumerate(times))
+            if geoexact is None:
+                geo = '-'
+            else:
+                geo = '{:10.3f}'.format(3600.0 * max(astronomy.AngleBetween(geoexact[i], astronomy.GeoVector(body, t, False, accuracy)) for (i, t) in enumerate(times)))
+            print('{:<8s} {:<14s} {:6d} {:10.0f} {:7.1f}x {:10.3f} {:>10s}'.format(body.name, accuracy.name, terms, rate, rate / full, 3600.0 * helio, geo))
+
+
+def BenchEarth():
+    """VSOP evaluations of the Earth saved by the per-instant Earth cache."""
+    observer = Observer(51.48, 0.0, 50.0)
+    base = Time.Make(2025, 1, 1, 0, 0, 0)
+    bodies = [Body.Sun, Body.Moon, Body.Mercury, Body.Venus, Body.Mars, Body.Jupiter, Body.Saturn, Body.Uranus, Body.Neptune]
+    count = 200
+    workloads = [
+        ('Equator, 9 bodies', lambda t: [astronomy.Equator(body, t, observer, True, True) for body in bodies]),
+        ('Illumination, 9 bodies', lambda t: [astronomy.Illumination(body, t) for body in bodies]),
+        ('HelioState(Moon) + HelioVector(EMB)', lambda t: (astronomy.HelioState(Body.Moon, t), astronomy.HelioVector(Body.EMB, t))),
+    ]
+    _Header('Earth VSOP evaluations per instant ({} instants)'.format(count))
+    print('{:<36s} {:>9s} {:>9s} {:>8s} {:>10s} {:>10s}'.format('workload', 'computed', 'saved', 'saved%', 'cached/s', 'uncached/s'))
+    for (name, work) in workloads:
+        astronomy.ResetCaches()
+        for i in range(count):
+            work(base.AddDays(i))
+        info = astronomy.GetCacheInfo()
+        computed = info['EarthPosition'].misses + info['EarthState'].misses
+        saved = info['EarthPosition'].hits + info['EarthState'].hits
+        # Time each pass over instants not seen before, so no result is reused across passes.
+        astronomy.ResetCaches()
+        cached = _Rate(lambda i: work(base.AddDays(i + 0.25)), count, 1)
+        astronomy.SetCacheSize(0, 'EarthPosition')
+        astronomy.SetCacheSize(0, 'EarthState')
+        uncached = _Rate(lambda i: work(base.AddDays(i + 0.5)), count, 1)
+        astronomy.SetCacheSize(4096, 'EarthPosition')
+        astronomy.SetCacheSize(4096, 'EarthState')
+        print('{:<36s} {:9d} {:9d} {:7.0f}% {:10.1f} {:10.1f}'.format(name, computed, saved, 100.0 * saved / (saved + computed), cached, uncached))
+
+
+def _TwoPassFormulaDeriv(formula, t, clamp_angle):
+    """VSOP87 value and derivative as they were calculated before the fused single pass:
+    every term's angle is calculated once for the value and again for the derivative."""
+    tpower = 1.0
+    dpower = 0.0
+    deriv = 0.0
+    for (s, series) in enumerate(formula.seriesList):
+        sin_sum = 0.0
+        cos_sum = 0.0
+        for (ampl, phas, freq) in series.termList:
+            angle = phas + (t * freq)
+            sin_sum += ampl * freq * math.sin(angle)
+            if s > 0:
+                cos_sum += ampl * math.cos(angle)
+        deriv += (s * dpower * cos_sum) - (tpower * sin_sum)
+        dpower = tpower
+        tpower *= t
+    return (astronomy._VsopFormula(formula, t, clamp_angle), deriv)
+
+
+def BenchFused():
+    """GravitySimulator stepping and Pluto segment builds, two-pass vs fused VSOP position/velocity."""
+    start = Time.Make(2025, 1, 1, 0, 0, 0)
+    pluto_tt = start.tt
+    asteroid = astronomy.StateVector(2.5, 0.3, -0.1, -0.001, 0.01, 0.0005, start)
+    def Step(i):
+        sim.Update(start.AddDays(i + 1))
+    def BuildSegment(i):
+        astronomy._GetSegment([None] * (astronomy._PLUTO_NUM_STATES - 1), pluto_tt)
+    _Header('VSOP87 position/velocity: two passes vs fused')
+    print('{:<36s} {:>12s} {:>12s} {:>8s}'.format('operation', 'two-pass/s', 'fused/s', 'speedup'))
+    fused = astronomy._VsopFormulaDeriv
+    results = {}
+    for (label, func) in (('two-pass', _TwoPassFormulaDeriv), ('fused', fused)):
+        sim = astronomy.GravitySimulator(Body.Sun, start, [asteroid])
+        astronomy._VsopFormulaDeriv = func
+        try:
+            results[label] = [
+                _Rate(lambda i: astronomy._CalcVsopPosVel(astronomy._vsop[Body.Earth.value], pluto_tt + i), 2000),
+                _Rate(Step, 500, 1),
+                _Rate(BuildSegment, 2, 1),
+            ]
+        finally:
+            astronomy._VsopFormulaDeriv = fused
+    names = ['_CalcVsopPosVel(Earth)', 'GravitySimulator.Update', 'Pluto integrator segment build']
+    for (k, name) in enumerate(names):
+        before = results['two-pass'][k]
+        after = results['fused'][k]
+        print('{:<36s} {:12.1f} {:12.1f} {:7.2f}x'.format(name, before, after, after / before))
+
+
+def BenchMoon():
+    """GeoMoon one call at a time vs GeoMoonArray over a TimeArray."""
+    from astronomy import TimeArray
+    start = Time.Make(2025, 1, 1, 0, 0, 0)
+    _Header('Lunar positions per second')
+    print('{:<10s} {:>12s} {:>12s} {:>8s}'.format('times', 'GeoMoon', 'batch', 'speedup'))
+    for count in [10, 1000, 100000]:
+        times = TimeArray.Range(start, start.AddDays(count * 0.1), 0.1)
+        scalar = list(times)[:5000]
+        slow = _Rate(lambda i: astronomy.GeoMoon(scalar[i]), len(scalar), 1)
+        fast = len(times) * _Rate(lambda i: astronomy.GeoMoonArray(times), 1)
+        print('{:<10d} {:12.0f} {:12.0f} {:7.1f}x'.format(len(times), slow, fast, fast / slow))
+
+
+def BenchMoonCache():
+    """Lunar theory evaluations saved by the shared lunar position cache in searches."""
+    start = Time.Make(2025, 1, 1, 0, 0, 0)
+    def Eclipses():
+        eclipse = astronomy.SearchLunarEclipse(start)
+        for _ in range(4):
+            eclipse = astronomy.NextLunarEclipse(eclipse.peak)
+    def SolarEclipses():
+        eclipse = astronomy.SearchGlobalSolarEclipse(start)
+        for _ in range(4):
+            eclipse = astronomy.NextGlobalSolarEclipse(eclipse.peak)
+    def Apsides():
+        apsis = astronomy.SearchLunarApsis(start)
+        for _ in range(20):
+            apsis = astronomy.NextLunarApsis(apsis)
+    def Libration():
+        for i in range(200):
+            t = start.AddDays(i)
+            astronomy.Libration(t)
+            astronomy.EclipticGeoMoon(t)
+            astronomy.GeoMoon(t)
+    _Header('Lunar theory evaluations')
+    print('{:<28s} {:>9s} {:>9s} {:>8s} {:>9s} {:>9s}'.format('workload', 'computed', 'saved', 'saved%', 'cached s', 'uncached s'))
+    for (name, work) in [('5 lunar eclipses', Eclipses), ('5 solar eclipses', SolarEclipses), ('21 lunar apsides', Apsides), ('Libration + Ecliptic + Geo', Libration)]:
+        astronomy.ResetCaches()
+        begin = time.perf_counter()
+        work()
+        cached = time.perf_counter() - begin
+        info = astronomy.GetCacheInfo()['MoonPosition']
+        astronomy.ResetCaches()
+        astronomy.SetCacheSize(0, 'MoonPosition')
+        begin = time.perf_counter()
+        work()
+        uncached = time.perf_counter() - begin
+        astronomy.SetCacheSize(4096, 'MoonPosition')
+        print('{:<28s} {:9d} {:9d} {:7.0f}% {:9.3f} {:9.3f}'.format(name, info.misses, info.hits, 100.0 * info.hits / (info.hits + info.misses), cached, uncached))
+
+
+def _FiniteDifferenceMoonState(time):
+    """Geocentric lunar state vector as it was calculated before the analytic lunar rates:
+    position and velocity from two lunar positions 0.864 seconds either side of the time."""
+    dt = 1.0e-5
+    r1 = astronomy.GeoMoon(time.AddDays(-dt))
+    r2 = astronomy.GeoMoon(time.AddDays(+dt))
+    return astronomy.StateVector(
+        (r1.x + r2.x) / 2, (r1.y + r2.y) / 2, (r1.z + r2.z) / 2,
+        (r2.x - r1.x) / (2 * dt), (r2.y - r1.y) / (2 * dt), (r2.z - r1.z) / (2 * dt),
+        time
+    )
+
+
+def BenchMoonState():
+    """GeoMoonState by finite differences vs analytic lunar rates."""
+    start = Time.Make(2025, 1, 1, 0, 0, 0)
+    count = 2000
+    _Header('Lunar state vectors per second ({} instants)'.format(count))
+    print('{:<24s} {:>12s} {:>12s} {:>8s}'.format('method', 'states/s', 'max dv', 'speedup'))
+    astronomy.SetCacheSize(0, 'MoonPosition')
+    try:
+        slow = _Rate(lambda i: _FiniteDifferenceMoonState(start.AddDays(i * 1.37)), count, 1)
+        fast = _Rate(lambda i: astronomy.GeoMoonState(start.AddDays(i * 1.37)), count, 1)
+    finally:
+        astronomy.SetCacheSize(4096, 'MoonPosition')
+    error = 0.0
+    for i in range(0, count, 20):
+        t = start.AddDays(i * 1.37)
+        a = _FiniteDifferenceMoonState(t)
+        b = astronomy.GeoMoonState(t)
+        error = max(error, abs(a.vx - b.vx), abs(a.vy - b.vy), abs(a.vz - b.vz))
+    print('{:<24s} {:12.1f} {:>12s} {:>8s}'.format('finite difference', slow, '', ''))
+    print('{:<24s} {:12.1f} {:12.3e} {:7.2f}x'.format('analytic', fast, error, fast / slow))
+
+
+_PLUTO_COLD_START = """
+import sys, time
+import astronomy
+if sys.argv[1]:
+    astronomy.SetPlutoCacheFile(sys.argv[1])
+begin = time.perf_counter()
+for day in range(-700000, 700000, 9973):
+    astronomy.HelioVector(astronomy.Body.Pluto, astronomy.Time(day))
+print(time.perf_counter() - begin)
+"""
+
+def BenchPlutoFile():
+    """Cold-start Pluto positions in a new process, with and without a segment cache file."""
+    def ColdStart(filename):
+        output = subprocess.check_output([sys.executable, '-c', _PLUTO_COLD_START, filename], cwd=os.path.dirname(os.path.abspath(__file__)))
+        return float(output)
+    with tempfile.TemporaryDirectory() as folder:
+        filename = os.path.join(folder, 'pluto.bin')
+        begin = time.perf_counter()
+        astronomy.BuildPlutoCacheFile(filename)
+        build = time.perf_counter() - begin
+        _Header('Pluto segment cache file ({} bytes, built in {:0.1f} s)'.format(os.path.getsize(filename), build))
+        print('{:<28s} {:>10s} {:>8s}'.format('new process, years 0-4000', 'seconds', 'speedup'))
+        slow = ColdStart('')
+        fast = ColdStart(filename)
+        print('{:<28s} {:10.3f}'.format('integrate segments', slow))
+        print('{:<28s} {:10.3f} {:7.1f}x'.format('load from cache file', fast, slow / fast))
+
+
+def BenchPlutoDeep():
+    """Pluto outside the years 0000-4000, crawling from the table edge vs resuming from checkpoints."""
+    days = [-740000.0 - 977.0*i for i in range(40)] + [740000.0 + 977.0*i for i in range(40)]
+    def Crawl(i):
+        astronomy._pluto_checkpoints[:] = [[], []]
+        astronomy.HelioVector(Body.Pluto, Time(days[i]))
+    def Resume(i):
+        astronomy.HelioVector(Body.Pluto, Time(days[i] + 0.5))
+    _Header('Deep-time Pluto positions per second ({} times, 26-133 years outside the table)'.format(len(days)))
+    print('{:<28s} {:>12s} {:>8s}'.format('method', 'positions/s', 'speedup'))
+    slow = _Rate(Crawl, len(days), 1)
+    astronomy._pluto_checkpoints[:] = [[], []]
+    first = _Rate(Resume, len(days), 1)
+    fast = _Rate(Resume, len(days), 1)
+    print('{:<28s} {:12.1f}'.format('crawl from table edge', slow))
+    print('{:<28s} {:12.1f} {:7.1f}x'.format('checkpoints, first pass', first, first / slow))
+    print('{:<28s} {:12.1f} {:7.1f}x'.format('checkpoints, warm', fast, fast / slow))
+
+
+def BenchPrewarm():
+    """Building Pluto segments for the years 1000-3000 one by one vs PrewarmPluto in a process pool."""
+    t1 = Time.Make(1000, 1, 1, 0, 0, 0)
+    t2 = Time.Make(3000, 1, 1, 0, 0, 0)
+    workers = os.cpu_count() or 1
+    _Header('Pluto segment builds, years 1000-3000 ({} processors)'.format(workers))
+    print('{:<28s} {:>10s} {:>8s}'.format('method', 'seconds', 'speedup'))
+    astronomy._pluto_cache[:] = [None] * len(astronomy._pluto_cache)
+    begin = time.perf_counter()
+    count = astronomy.PrewarmPluto(t1, t2, workers=1)
+    slow = time.perf_counter() - begin
+    astronomy._pluto_cache[:] = [None] * len(astronomy._pluto_cache)
+    begin = time.perf_counter()
+    astronomy.PrewarmPluto(t1, t2, workers=workers)
+    fast = time.perf_counter() - begin
+    print('{:<28s} {:10.2f}'.format('{} segments, serial'.format(count), slow))
+    print('{:<28s} {:10.2f} {:7.1f}x'.format('{} segments, {} workers'.format(count, workers), fast, slow / fast))
+
+
+def BenchJupiterMoons():
+    """JupiterMoons and JupiterMoonPositions one time at a time vs their TimeArray variants."""
+    from astronomy import TimeArray
+    start = Time.Make(2025, 1, 1, 0, 0, 0)
+    times = TimeArray.Range(start, start.AddDays(3650.0), 0.5)
+    scalar = list(times)[:2000]
+    _Header('Galilean moon epochs per second ({} epochs)'.format(len(times)))
+    print('{:<16s} {:>12s} {:>12s} {:>8s}'.format('mode', 'scalar', 'batch', 'speedup'))
+    base = _Rate(lambda i: astronomy.JupiterMoons(scalar[i]), len(scalar), 1)
+    modes = [
+        ('state vectors', astronomy.JupiterMoons, astronomy.JupiterMoonsArray),
+        ('positions only', astronomy.JupiterMoonPositions, astronomy.JupiterMoonPositionsArray),
+    ]
+    for (name, func, batch) in modes:
+        slow = _Rate(lambda i: func(scalar[i]), len(scalar), 1)
+        fast = len(times) * _Rate(lambda i: batch(times), 1)
+        print('{:<16s} {:12.0f} {:12.0f} {:7.1f}x'.format(name, slow, fast, fast / base))
+
+
+def BenchJovian():
+    """One year of Galilean moon phenomena: scan plus refinement, by phenomenon."""
+    import jovian
+    start = Time.Make(2025, 1, 1, 0, 0, 0)
+    stop = Time.Make(2026, 1, 1, 0, 0, 0)
+    begin = time.perf_counter()
+    events = list(jovian.JovianEvents(start, stop))
+    elapsed = time.perf_counter() - begin
+    _Header('Galilean moon phenomena in 2025 ({} events in {:0.2f} s)'.format(len(events), elapsed))
+    print('{:<10s} {:>8s} {:>14s} {:>12s} {:>8s}'.format('moon', 'transit', 'shadow transit', 'occultation', 'eclipse'))
+    for moon in jovian.GalileanMoon:
+        counts = [sum(1 for e in events if e.moon == moon and e.phenomenon == p and e.begins) for p in jovian.JovianPhenomenon]
+        print('{:<10s} {:8d} {:14d} {:12d} {:8d}'.format(moon.name, *counts))
+
+
+def _MoonStarSeparation(context, time):
+    (observer, ra, dec) = context
+    moon = astronomy.Equator(Body.Moon, time, observer, True, True)
+    return astronomy.AngleBetween(moon.vec, astronomy.VectorFromSphere(astronomy.Spherical(dec, 15.0 * ra, 1.0), time)) - 0.25
+
+
+def BenchSearchAll():
+    """Moon/star contacts: minute-by-minute sampling vs SearchAll."""
+    observer = Observer(-23.55, -46.63, 0.0)
+    star = (16.4901, -26.4319)    # Antares
+    start = Time.Make(2025, 3, 20, 0, 0, 0)
+    context = (observer, star[0], star[1])
+    _Header('Moon/Antares contacts over one day')
+    print('{:<24s} {:>10s} {:>26s}'.format('method', 'seconds', 'first contact'))
+    begin = time.perf_counter()
+    found = None
+    for minute in range(1441):
+        t = start.AddDays(minute / 1440.0)
+        if found is None and _MoonStarSeparation(context, t) <= 0.0:
+            found = t
+    print('{:<24s} {:10.3f} {:>26s}'.format('every minute', time.perf_counter() - begin, str(found)))
+    begin = time.perf_counter()
+    events = list(astronomy.SearchAll(_MoonStarSeparation, context, start, start.AddDays(1.0), 1.0 / 48.0))
+    first = next((e.time for e in events if e.kind == astronomy.SearchAllKind.Descending), None)
+    print('{:<24s} {:10.3f} {:>26s}'.format('SearchAll, 30 min step', time.perf_counter() - begin, str(first)))
+
+
+def BenchSearchStats():
+    """Search statistics per API for a year of common event searches, and their overhead."""
+    observer = Observer(40.0, -75.0, 0.0)
+    start = Time.Make(2025, 1, 1, 0, 0, 0)
+    def Work():
+        for day in range(0, 365, 7):
+            t = start.AddDays(day)
+            astronomy.SearchRiseSet(Body.Sun, observer, astronomy.Direction.Rise, t, 1.0)
+            astronomy.SearchAltitude(Body.Sun, observer, astronomy.Direction.Set, t, 1.0, -6.0)
+        astronomy.Seasons(2025)
+        astronomy.SearchLunarEclipse(start)
+        quarter = astronomy.SearchMoonQuarter(start)
+        for _ in range(48):
+            quarter = astronomy.NextMoonQuarter(quarter)
+        apsis = astronomy.SearchLunarApsis(start)
+        for _ in range(25):
+            apsis = astronomy.NextLunarApsis(apsis)
+    Work()
+    astronomy.SetSearchStats(False)
+    begin = time.perf_counter()
+    Work()
+    disabled = time.perf_counter() - begin
+    astronomy.ResetSearchStats()
+    astronomy.SetSearchStats(True)
+    begin = time.perf_counter()
+    Work()
+    enabled = time.perf_counter() - begin
+    astronomy.SetSearchStats(False)
+    _Header('Search statistics (disabled {:0.3f} s, enabled {:0.3f} s)'.format(disabled, enabled))
+    print('{:<22s} {:>6s} {:>6s} {:>8s} {:>8s} {:>6s} {:>6s} {:>6s} {:>12s}'.format('api', 'calls', 'fail', 'evals', 'evals/c', 'quad', 'bisect', 'newton', 'max width s'))
+    for stats in sorted(astronomy.GetSearchStats().values(), key=lambda s: -s.evaluations):
+        print('{:<22s} {:6d} {:6d} {:8d} {:8.1f} {:6d} {:6d} {:6d} {:12.3g}'.format(
+            stats.api, stats.calls, stats.failures, stats.evaluations, stats.evaluations / stats.calls,
+            stats.quadraticSteps, stats.bisectionSteps, stats.newtonSteps, stats.maxWidthSeconds))
+
+
+def _FiniteDifferenceMoonDistanceSlope(direction, time):
+    """The lunar apsis search function as it was before SearchWithRate: a central difference of the distance."""
+    dt = 0.001
+    dist1 = astronomy._MoonDistance(time.AddDays(-dt/2.0))
+    dist2 = astronomy._MoonDistance(time.AddDays(+dt/2.0))
+    return direction * (dist2 - dist1) / dt
+
+
+def _FiniteDifferenceEarthShadowSlope(context, time):
+    """The lunar eclipse peak search function as it was before SearchWithRate."""
+    dt = 1.0 / 86400.0
+    shadow1 = astronomy._EarthShadow(time.AddDays(-dt))
+    shadow2 = astronomy._EarthShadow(time.AddDays(+dt))
+    return (shadow2.r - shadow1.r) / dt
+
+
+def BenchSearchWithRate():
+    """Lunar apsides and eclipse peaks: Search on finite differences vs SearchWithRate."""
+    start = Time.Make(2025, 1, 1, 0, 0, 0)
+    brackets = []
+    apsis = astronomy.SearchLunarApsis(start)
+    for _ in range(100):
+        direction = +1 if apsis.kind == astronomy.ApsisKind.Pericenter else -1
+        brackets.append(('apsis', direction, apsis.time.AddDays(-1.0), apsis.time.AddDays(+1.5)))
+        apsis = astronomy.NextLunarApsis(apsis)
+    eclipse = astronomy.SearchLunarEclipse(start)
+    for _ in range(20):
+        brackets.append(('eclipse', None, eclipse.peak.AddDays(-0.03), eclipse.peak.AddDays(+0.02)))
+        eclipse = astronomy.NextLunarEclipse(eclipse.peak)
+    _Header('Search vs SearchWithRate (100 lunar apsides, 20 lunar eclipse peaks)')
+    print('{:<10s} {:<16s} {:>8s} {:>10s} {:>14s}'.format('event', 'method', 'evals', 'seconds', 'max diff s'))
+    methods = (
+        ('Search', astronomy.Search, {'apsis': _FiniteDifferenceMoonDistanceSlope, 'eclipse': _FiniteDifferenceEarthShadowSlope}),
+        ('SearchWithRate', astronomy.SearchWithRate, {'apsis': astronomy._moon_distance_slope, 'eclipse': astronomy._EarthShadowSlope}),
+    )
+    astronomy.SetCacheSize(0, 'MoonPosition')
+    try:
+        for event in ('apsis', 'eclipse'):
+            found = []
+            for (name, search, funcs) in methods:
+                astronomy.ResetSearchStats()
+                astronomy.SetSearchStats(True)
+                begin = time.perf_counter()
+                found.append([search(funcs[event], context, t1, t2, 1.0) for (kind, context, t1, t2) in brackets if kind == event])
+                elapsed = time.perf_counter() - begin
+                astronomy.SetSearchStats(False)
+                evals = sum(stats.evaluations for stats in astronomy.GetSearchStats().values())
+                diff = max(abs(a.tt - b.tt) for (a, b) in zip(found[0], found[-1])) * 86400.0
+                print('{:<10s} {:<16s} {:8d} {:10.3f} {:14.3f}'.format(event, name, evals, elapsed, diff))
+    finally:
+        astronomy.SetCacheSize(4096, 'MoonPosition')
+
+
+def BenchStreams():
+    """Lunar and seasonal event generators vs Search/Next loops, over a century."""
+    start = Time.Make(2000, 1, 1, 0, 0, 0)
+    stop = Time.Make(2100, 1, 1, 0, 0, 0)
+    def Loop(first, follow):
+        event = first(start)
+        events = []
+        while event.time.ut <= stop.ut:
+            events.append(event)
+            event = follow(event)
+        return events
+    def SeasonsLoop():
+        events = []
+        for year in range(2000, 2100):
+            info = astronomy.Seasons(year)
+            events += [info.mar_equinox, info.jun_solstice, info.sep_equinox, info.dec_solstice]
+        return events
+    cases = (
+        ('quarters', lambda: Loop(astronomy.SearchMoonQuarter, astronomy.NextMoonQuarter), lambda: list(astronomy.MoonQuarters(start, stop))),
+        ('apsides', lambda: Loop(astronomy.SearchLunarApsis, astronomy.NextLunarApsis), lambda: list(astronomy.LunarApsides(start, stop))),
+        ('nodes', lambda: Loop(astronomy.SearchMoonNode, astronomy.NextMoonNode), lambda: list(astronomy.MoonNodes(start, stop))),
+        ('seasons', SeasonsLoop, lambda: list(astronomy.SeasonEvents(2000, 2099))),
+    )
+    _Header('Event streams, 2000-2100')
+    print('{:<10s} {:>7s} {:>10s} {:>10s} {:>8s} {:>12s}'.format('events', 'count', 'loop s', 'stream s', 'speedup', 'max diff s'))
+    for (name, loop, stream) in cases:
+        astronomy.ResetCaches()
+        begin = time.perf_counter()
+        old = loop()
+        slow = time.perf_counter() - begin
+        astronomy.ResetCaches()
+        begin = time.perf_counter()
+        new = stream()
+        fast = time.perf_counter() - begin
+        diff = max(abs(getattr(a, 'time', a).tt - b.time.tt) for (a, b) in zip(old, new)) * 86400.0
+        print('{:<10s} {:7d} {:10.3f} {:10.3f} {:7.2f}x {:12.3f}'.format(name, len(new), slow, fast, slow / fast, diff))
+
+def BenchAlmanac():
+    """Next-event lookups: live searches vs a precomputed almanac file."""
+    import almanac
+    count = 200
+    # Leave out transits: there may be none after a time in a short almanac, so the lookup falls back to a search.
+    kinds = [kind for kind in almanac.AlmanacKind if kind not in (almanac.AlmanacKind.MercuryTransit, almanac.AlmanacKind.VenusTransit)]
+    with tempfile.TemporaryDirectory() as folder:
+        filename = os.path.join(folder, 'almanac.bin')
+        begin = time.perf_counter()
+        total = almanac.BuildAlmanacFile(filename, 2020, 2029)
+        build = time.perf_counter() - begin
+        book = almanac.Almanac(filename)
+        _Header('Almanac 2020-2029: {} events in {} bytes, built in {:0.1f} s'.format(total, os.path.getsize(filename), build))
+    times = [book.startTime.AddDays(i * 13.7) for i in range(count)]
+    print('{:<12s} {:>14s}'.format('method', 'lookups/s'))
+    live = _Rate(lambda i: almanac._LiveNext(kinds[i % len(kinds)], times[i]), count, 1)
+    table = _Rate(lambda i: book.NextEvent(kinds[i % len(kinds)], times[i]), count)
+    print('{:<12s} {:14.1f}'.format('search', live))
+    print('{:<12s} {:14.1f}'.format('almanac', table))
+    # Chained lookups must step through the same events as a range query, with no repeats.
+    for kind in almanac.AlmanacKind:
+        listed = book.EventsBetween(book.startTime, book.stopTime, [kind])
+        assert all(b.time.ut - a.time.ut > 1.0 for (a, b) in zip(listed, listed[1:]))
+        for (a, b) in zip(listed, listed[1:]):
+            assert book.NextEvent(kind, a.time).time.ut == b.time.ut
+
+def BenchSynodic():
+    """Planetary conjunctions and oppositions: repeated SearchRelativeLongitude vs SynodicEvents."""
+    bodies = [Body.Mercury, Body.Venus, Body.Mars, Body.Jupiter, Body.Saturn, Body.Uranus, Body.Neptune]
+    start = Time.Make(1950, 1, 1, 0, 0, 0)
+    stop = Time.Make(2050, 1, 1, 0, 0, 0)
+    def Loop():
+        events = []
+        for body in bodies:
+            for lon in (0.0, 180.0):
+                event = astronomy.SearchRelativeLongitude(body, lon, start)
+                while event.ut < stop.ut:
+                    events.append(event)
+                    event = astronomy.SearchRelativeLongitude(body, lon, event.AddDays(1.0))
+        return sorted(events, key=lambda t: t.ut)
+    _Header('Synodic events of 7 planets, 1950-2050')
+    print('{:<16s} {:>7s} {:>10s} {:>12s}'.format('method', 'count', 'seconds', 'max diff s'))
+    begin = time.perf_counter()
+    old = Loop()
+    elapsed = time.perf_counter() - begin
+    print('{:<16s} {:7d} {:10.3f}'.format('search loop', len(old), elapsed))
+    for workers in (1, os.cpu_count()):
+        begin = time.perf_counter()
+        new = astronomy.SynodicEvents(bodies, start, stop, workers)
+        elapsed = time.perf_counter() - begin
+        diff = max(abs(a.tt - b.time.tt) for (a, b) in zip(old, new)) * 86400.0
+        print('{:<16s} {:7d} {:10.3f} {:12.3f}'.format('workers={}'.format(workers), len(new), elapsed, diff))
+
+
+def BenchExecutor():
+    """Rise, set, and culmination queries of 10 bodies for 30 days: serial vs QueryExecutor."""
+    import executor
+    observer = Observer(-23.55, -46.63, 760.0)
+    start = Time.Make(2025, 3, 1, 3, 0, 0)
+    bodies = [Body.Sun, Body.Moon, Body.Mercury, Body.Venus, Body.Mars, Body.Jupiter, Body.Saturn, Body.Uranus, Body.Neptune, Body.Pluto]
+    queries = []
+    for day in range(30):
+        time0 = start.AddDays(day)
+        for body in bodies:
+            queries.append(executor.Query('SearchRiseSet', body, observer, astronomy.Direction.Rise, time0, 1.1))
+            queries.append(executor.Query('SearchRiseSet', body, observer, astronomy.Direction.Set, time0, 1.1))
+            queries.append(executor.Query('SearchHourAngle', body, observer, 0.0, time0, 1))
+    workers = max(2, os.cpu_count() or 1)
+    _Header('{} queries, {} worker processes on {} processors'.format(len(queries), workers, os.cpu_count()))
+    print('{:<18s} {:>10s}'.format('method', 'seconds'))
+    astronomy.ResetCaches()
+    begin = time.perf_counter()
+    serial = [query.Call() for query in queries]
+    print('{:<18s} {:10.3f}'.format('serial', time.perf_counter() - begin))
+    with executor.QueryExecutor(workers, plutoRange=(start, start.AddDays(31))) as pool:
+        for label in ('pool, first run', 'pool, second run'):
+            begin = time.perf_counter()
+            results = pool.Run(queries)
+            print('{:<18s} {:10.3f}'.format(label, time.perf_counter() - begin))
+    assert all(getattr(a, 'time', a).ut == getattr(b, 'time', b).ut for (a, b) in zip(serial, results) if a is not None)
+
+
+SUITES = {
+    'memory': BenchMemory,
+    'vsop': BenchVsop,
+    'chebyshev': BenchChebyshev,
+    'tiers': BenchTiers,
+    'earth': BenchEarth,
+    'fused': BenchFused,
+    'moon': BenchMoon,
+    'mooncache': BenchMoonCache,
+    'moonstate': BenchMoonState,
+    'plutofile': BenchPlutoFile,
+    'plutodeep': BenchPlutoDeep,
+    'prewarm': BenchPrewarm,
+    'jupiter': BenchJupiterMoons,
+    'jovian': BenchJovian,
+    'searchall': BenchSearchAll,
+    'searchstats': BenchSearchStats,
+    'rate': BenchSearchWithRate,
+    'streams': BenchStreams,
+    'almanac': BenchAlmanac,
+    'synodic': BenchSynodic,
+    'executor': BenchExecutor,
+}
+
+# ----------------------------------------------------------
+
+def main():
+    names = sys.argv[1:]
+    if not names:
+        print(__doc__.strip())
+        print()
+        print('Suites:')
+        for (name, func) in SUITES.items():
+            print('    {:<10s} {}'.format(name, func.__doc__))
+        return 1
+    if names == ['all']:
+        names = list(SUITES)
+    for name in names:
+        if name not in SUITES:
+            print('Unknown suite: {}'.format(name))
+            return 1
+    for name in names:
+        SUITES[name]()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""Runs independent astronomy.py queries in a pool of worker processes.
+
+An application often needs many unrelated answers at once: the rise, set,
+and culmination times of every body, or the next aspect of every pair of
+planets. Each #Query names one public function of astronomy.py and the
+arguments to call it with. A #QueryExecutor runs a list of queries across
+worker processes, in chunks of consecutive queries, and returns their
+results in the same order as the queries.
+
+Each worker is prepared once, when it starts, so that the queries it runs
+do not pay for it again. It receives the user-defined stars, the default
+VSOP87 accuracy, the Chebyshev ephemeris, the cache sizes, and either the
+Pluto cache file or the Pluto integrator segments already built in this
+process; it also builds the constellation table. A custom Delta T function
+set with #SetDeltaTFunction is not sent to the workers.
+
+Arguments and results travel between processes by pickling. #Time and
+#Observer objects pickle as just their numbers, so the results of searches
+are cheap to send back.
+"""
+
+import concurrent.futures
+import math
+import os
+import pickle
+from typing import Any, List, Optional, Sequence, Tuple
+
+import astronomy
+from astronomy import Time
+
+# ----------------------------------------------------------
+
+class Query:
+    """A call of one astronomy.py function, to be run by a #QueryExecutor.
+
+    Parameters
+    ----------
+    function : str
+        The name of a public function of astronomy.py, such as `'SearchRiseSet'`.
+    args
+        The positional arguments of the call.
+    kwargs
+        The keyword arguments of the call.
+
+    The arguments, and the result of the call, must be picklable.
+    """
+    __slots__ = ('function', 'args', 'kwargs')
+
+    def __init__(self, function: str, *args: Any, **kwargs: Any) -> None:
+        if function.startswith('_') or not callable(getattr(astronomy, function, None)):
+            raise astronomy.Error('Unknown astronomy function: {}'.format(repr(function)))
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+
+    def __repr__(self) -> str:
+        params = [repr(arg) for arg in self.args] + ['{}={}'.format(name, repr(value)) for (name, value) in self.kwargs.items()]
+        return 'Query({})'.format(', '.join([repr(self.function)] + params))
+
+    def Call(self) -> Any:
+        """Runs the query in this process and returns its result."""
+        return getattr(astronomy, self.function)(*self.args, **self.kwargs)
+
+
+def _WorkerState() -> Tuple[Any, ...]:
+    # A snapshot of the process-wide settings of astronomy.py that workers need.
+    stars = [(index, star.ra, star.dec, star.dist) for (index, star) in enumerate(astronomy._StarTable) if star.dist > 0.0]
+    cachefile = astronomy._PlutoCacheFile
+    if cachefile is not None:
+        segments = {}
+    else:
+        segments = dict((seg_index, astronomy._PackSegment(seg)) for (seg_index, seg) in enumerate(astronomy._pluto_cache) if seg is not None)
+    sizes = dict((name, info.maxsize) for (name, info) in astronomy.GetCacheInfo().items())
+    return (
+        stars,
+        astronomy._VsopAccuracyDefault,
+        astronomy._ChebyshevEphemeris,
+        None if cachefile is None else cachefile.filename,
+        segments,
+        sizes
+    )
+
+
+def _InitWorker(state: Tuple[Any, ...]) -> None:
+    # Runs once in each worker process, before any query.
+    (stars, accuracy, ephemeris, cachefile, segments, sizes) = state
+    for (index, ra, dec, dist) in stars:
+        star = astronomy._StarTable[index]
+        (star.ra, star.dec, star.dist) = (ra, dec, dist)
+    astronomy.SetVsopAccuracy(accuracy)
+    astronomy.SetChebyshevEphemeris(ephemeris)
+    if cachefile is not None:
+        astronomy.SetPlutoCacheFile(cachefile)
+    for (seg_index, block) in segments.items():
+        astronomy._InstallSegment(seg_index, astronomy._UnpackSegment(block))
+    for (name, maxsize) in sizes.items():
+        astronomy.SetCacheSize(maxsize, name)
+    # The constellation table is built the first time it is used.
+    astronomy.Constellation(0.0, 0.0)
+
+
+def _RunQuery(query: Query) -> Tuple[bool, Any]:
+    # Returns (True, result), or (False, exception) if the query failed.
+    try:
+        return (True, query.Call())
+    except Exception as exc:
+        return (False, exc)
+
+
+def _RunWorkerQuery(query: Query) -> Tuple[bool, Any]:
+    # Like _RunQuery, but in a worker process. An exception is sent back as its
+    # class, arguments, and attributes: the exception classes of astronomy.py
+    # take different constructor arguments than the ones they keep, so they
+    # cannot be rebuilt from an ordinary pickle.
+    (ok, value) = _RunQuery(query)
+    if ok:
+        return (True, value)
+    parts = (type(value), value.args, value.__dict__)
+    try:
+        pickle.dumps(parts)
+    except Exception:
+        parts = (astronomy.Error, ('{}: {}'.format(type(value).__name__, value),), {})
+    return (False, parts)
+
+
+def _RebuildException(parts: Tuple[Any, ...]) -> BaseException:
+    (cls, args, attributes) = parts
+    exc = cls.__new__(cls, *args)
+    exc.args = args
+    exc.__dict__.update(attributes)
+    return exc
+
+
+class QueryExecutor:
+    """Runs lists of queries across a pool of worker processes.
+
+    The worker processes are started by the first call of #QueryExecutor.Run
+    that needs them, and are reused by later calls until #QueryExecutor.Close.
+    They receive the settings of astronomy.py as they are at that moment.
+    The executor can be used as a context manager, which closes it on exit.
+
+    Parameters
+    ----------
+    workers : int, optional
+        The number of worker processes. If omitted, one per processor.
+        With 1, the queries are run in this process.
+    chunksize : int, optional
+        The number of consecutive queries sent to a worker at a time.
+        If omitted, each worker receives about four chunks per run.
+        Queries for the same time are best kept together, because
+        they share the calculation caches of the worker.
+    plutoRange : (Time, Time), optional
+        A range of times in which queries need Pluto's position.
+        The Pluto integrator segments for the range are built first,
+        with #PrewarmPluto, and handed to every worker.
+    """
+    def __init__(self, workers: Optional[int] = None, chunksize: Optional[int] = None, plutoRange: Optional[Tuple[Time, Time]] = None) -> None:
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if chunksize is not None and chunksize < 1:
+            raise astronomy.Error('Invalid chunk size: {}'.format(chunksize))
+        self.workers = workers
+        self.chunksize = chunksize
+        self._pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        if plutoRange is not None:
+            astronomy.PrewarmPluto(plutoRange[0], plutoRange[1], workers)
+
+    def __enter__(self) -> "QueryExecutor":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.Close()
+
+    def Close(self) -> None:
+        """Stops the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def Run(self, queries: Sequence[Query], returnExceptions: bool = False) -> List[Any]:
+        """Runs queries and returns their results in the same order.
+
+        Parameters
+        ----------
+        queries : sequence of Query
+            The queries to run. They must not depend on each other.
+        returnExceptions : bool
+            If true, a query that raises an exception has the exception as its result.
+            If false, the first such exception, in the order of the queries, is raised
+            after all the queries have run.
+
+        Returns
+        -------
+        list
+            The result of each query.
+        """
+        queries = list(queries)
+        if self.workers <= 1 or len(queries) <= 1:
+            outcomes = [_RunQuery(query) for query in queries]
+        else:
+            if self._pool is None:
+                self._pool = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers, initializer=_InitWorker, initargs=(_WorkerState(),))
+            chunksize = self.chunksize or max(1, math.ceil(len(queries) / (4 * self.workers)))
+            outcomes = [(ok, value if ok else _RebuildException(value)) for (ok, value) in self._pool.map(_RunWorkerQuery, queries, chunksize=chunksize)]
+        results = []
+        for (ok, value) in outcomes:
+            if not (ok or returnExceptions):
+                raise value
+            results.append(value)
+        return results
+
+
+def RunQueries(queries: Sequence[Query], workers: Optional[int] = None, chunksize: Optional[int] = None, returnExceptions: bool = False) -> List[Any]:
+    """Runs queries in a temporary #QueryExecutor and returns their results in order.
+
+    See #QueryExecutor for the parameters.
+    """
+    with QueryExecutor(workers, chunksize) as executor:
+        return executor.Run(queries, returnExceptions)
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""Phenomena of Jupiter's Galilean moons.
+
+Finds the times when Io, Europa, Ganymede, and Callisto begin and end
+transits across Jupiter's disk, shadow transits, occultations behind
+Jupiter, and eclipses in Jupiter's shadow, as seen from the center of the Earth.
+
+The search works in two passes. First the geometry of all four moons is
+sampled over the whole date range with the batch functions of astronomy.py
+(#JupiterMoonsArray, #GeoVectorArray, #HelioStateArray). Then every sign change
+found by the scan is refined with #Search, using the scalar functions.
+
+Times are corrected for light travel time: the geometry is evaluated at the
+time light left the Jupiter system, and reported at the time it reaches the Earth.
+Jupiter is treated as an oblate spheroid, and its umbra as a cone.
+Contacts are for the center of each moon.
+
+This module requires the NumPy package.
+"""
+
+import enum
+import math
+from typing import Any, Iterator, List, Tuple
+
+import astronomy
+from astronomy import Body, Time, TimeArray
+
+try:
+    import numpy as _np
+except ImportError:
+    _np = None
+
+# ----------------------------------------------------------
+
+_JUPITER_EQUATORIAL_RADIUS_AU = astronomy.JUPITER_EQUATORIAL_RADIUS_KM / astronomy.KM_PER_AU
+# Equatorial radius over polar radius (not the flattening, which is 1 - polar/equatorial).
+_JUPITER_AXIS_RATIO = astronomy.JUPITER_EQUATORIAL_RADIUS_KM / astronomy.JUPITER_POLAR_RADIUS_KM
+_SUN_RADIUS_AU = astronomy._SUN_RADIUS_KM / astronomy.KM_PER_AU
+
+# Rows are the JUP axes expressed in EQJ; the z axis is Jupiter's north pole.
+_JUP_AXES = astronomy._Rotation_JUP_EQJ.rot
+
+_CHUNK_DAYS = 30.0
+
+
+@enum.unique
+class GalileanMoon(enum.Enum):
+    """The four largest moons of Jupiter, in the order #JupiterMoons reports them."""
+    Io = 0
+    Europa = 1
+    Ganymede = 2
+    Callisto = 3
+
+
+@enum.unique
+class JovianPhenomenon(enum.Enum):
+    """The kinds of events reported by #JovianEvents.
+
+    Values
+    ------
+    Transit: The moon passes in front of Jupiter's disk.
+    ShadowTransit: The moon's shadow falls on Jupiter's disk.
+    Occultation: The moon is hidden behind Jupiter's disk.
+    Eclipse: The moon is in Jupiter's shadow.
+    """
+    Transit = 0
+    ShadowTransit = 1
+    Occultation = 2
+    Eclipse = 3
+
+
+class JovianEvent:
+    """The beginning or end of a phenomenon of one of Jupiter's Galilean moons.
+
+    Attributes
+    ----------
+    time : Time
+        When the event is seen from the Earth.
+    moon : GalileanMoon
+        The moon involved in the event.
+    phenomenon : JovianPhenomenon
+        What kind of event it is.
+    begins : bool
+        `True` if the phenomenon begins at `time`, `False` if it ends.
+    """
+    def __init__(self, time: Time, moon: GalileanMoon, phenomenon: JovianPhenomenon, begins: bool) -> None:
+        self.time = time
+        self.moon = moon
+        self.phenomenon = phenomenon
+        self.begins = begins
+
+    def __repr__(self) -> str:
+        return 'JovianEvent(time={}, moon={}, phenomenon={}, begins={})'.format(
+            repr(self.time), self.moon, self.phenomenon, self.begins)
+
+
+def _ToStretched(x: Any, y: Any, z: Any) -> Tuple[Any, Any, Any]:
+    # Converts EQJ components to Jupiter's equatorial frame, stretched along the pole
+    # so that Jupiter's surface becomes a sphere of its equatorial radius.
+    return (
+        _JUP_AXES[0][0]*x + _JUP_AXES[0][1]*y + _JUP_AXES[0][2]*z,
+        _JUP_AXES[1][0]*x + _JUP_AXES[1][1]*y + _JUP_AXES[1][2]*z,
+        (_JUP_AXES[2][0]*x + _JUP_AXES[2][1]*y + _JUP_AXES[2][2]*z) * _JUPITER_AXIS_RATIO
+    )
+
+
+def _DiskGeometry(moon: Tuple[Any, Any, Any], view: Tuple[Any, Any, Any]) -> Tuple[Any, Any]:
+    # Returns the distance of the moon behind Jupiter's center along the viewing
+    # direction, and its distance from the line of sight through Jupiter's center.
+    # Works on scalars and on arrays alike.
+    (mx, my, mz) = _ToStretched(*moon)
+    (vx, vy, vz) = _ToStretched(*view)
+    vlen = (vx*vx + vy*vy + vz*vz) ** 0.5
+    (vx, vy, vz) = (vx/vlen, vy/vlen, vz/vlen)
+    along = mx*vx + my*vy + mz*vz
+    (px, py, pz) = (mx - along*vx, my - along*vy, mz - along*vz)
+    return (along, (px*px + py*py + pz*pz) ** 0.5)
+
+
+def _EarthFunction(moon: Tuple[Any, Any, Any], geo: Tuple[Any, Any, Any]) -> Tuple[Any, Any]:
+    # Negative while the moon overlaps Jupiter's disk as seen from the Earth.
+    (along, perp) = _DiskGeometry(moon, geo)
+    return (along, perp - _JUPITER_EQUATORIAL_RADIUS_AU)
+
+
+def _SunFunction(moon: Tuple[Any, Any, Any], shadow: Tuple[Any, Any, Any], distance: Any) -> Tuple[Any, Any]:
+    # Negative while the moon overlaps Jupiter's disk as seen from the Sun:
+    # in front of it, the moon casts its shadow on Jupiter;
+    # behind it, the moon is inside Jupiter's umbra, which narrows with distance.
+    (along, perp) = _DiskGeometry(moon, shadow)
+    narrowing = (_SUN_RADIUS_AU - _JUPITER_EQUATORIAL_RADIUS_AU) / distance
+    if isinstance(along, float):
+        radius = _JUPITER_EQUATORIAL_RADIUS_AU - max(along, 0.0)*narrowing
+    else:
+        radius = _JUPITER_EQUATORIAL_RADIUS_AU - _np.maximum(along, 0.0)*narrowing
+    return (along, perp - radius)
+
+
+def _ShadowAxis(jx: Any, jy: Any, jz: Any, vx: Any, vy: Any, vz: Any) -> Tuple[Tuple[Any, Any, Any], Any]:
+    # The direction of sunlight arriving at Jupiter, corrected for light travel
+    # time from the Sun and for the aberration due to Jupiter's orbital motion.
+    distance = (jx*jx + jy*jy + jz*jz) ** 0.5
+    dt = distance / astronomy.C_AUDAY
+    return ((jx - dt*vx, jy - dt*vy, jz - dt*vz), distance)
+
+
+def _Evaluate(time: Time) -> Tuple[List[Tuple[float, float]], List[Tuple[float, float]]]:
+    # Scalar form of the scan: for each moon, the (along, function) pairs as seen from the Earth and from the Sun.
+    geo = astronomy.GeoVector(Body.Jupiter, time, False)
+    emitted = time.AddDays(-geo.Length() / astronomy.C_AUDAY)
+    moons = astronomy.JupiterMoonPositions(emitted)
+    jupiter = astronomy.HelioState(Body.Jupiter, emitted)
+    (shadow, distance) = _ShadowAxis(jupiter.x, jupiter.y, jupiter.z, jupiter.vx, jupiter.vy, jupiter.vz)
+    earth = []
+    sun = []
+    for vec in (moons.io, moons.europa, moons.ganymede, moons.callisto):
+        m = (vec.x, vec.y, vec.z)
+        earth.append(_EarthFunction(m, (geo.x, geo.y, geo.z)))
+        sun.append(_SunFunction(m, shadow, distance))
+    return (earth, sun)
+
+
+def _EvaluateArray(times: TimeArray) -> Tuple[Any, Any, Any, Any]:
+    # Vectorized form of _Evaluate. Returns (4, n) arrays of the along-distances
+    # and function values as seen from the Earth, then the same as seen from the Sun.
+    geo = astronomy.GeoVectorArray(Body.Jupiter, times, False)
+    lt = geo.Length() / astronomy.C_AUDAY
+    emitted = TimeArray(times.ut - lt, times.tt - lt)
+    moons = astronomy.JupiterMoonPositionsArray(emitted)
+    jupiter = astronomy.HelioStateArray(Body.Jupiter, emitted)
+    (shadow, distance) = _ShadowAxis(jupiter.x, jupiter.y, jupiter.z, jupiter.vx, jupiter.vy, jupiter.vz)
+    n = len(times)
+    (earth_along, earth_func, sun_along, sun_func) = (_np.empty((4, n)) for _ in range(4))
+    for (k, vec) in enumerate((moons.io, moons.europa, moons.ganymede, moons.callisto)):
+        m = (vec.x, vec.y, vec.z)
+        (earth_along[k], earth_func[k]) = _EarthFunction(m, (geo.x, geo.y, geo.z))
+        (sun_along[k], sun_func[k]) = _SunFunction(m, shadow, distance)
+    return (earth_along, earth_func, sun_along, sun_func)
+
+
+def _RefineFunction(context: Tuple[int, int, float], time: Time) -> float:
+    (moon, fromSun, sign) = context
+    (earth, sun) = _Evaluate(time)
+    return sign * (sun if fromSun else earth)[moon][1]
+
+
+def _ScanChunk(ut: Any) -> List[JovianEvent]:
+    times = TimeArray(ut)
+    (earth_along, earth_func, sun_along, sun_func) = _EvaluateArray(times)
+    events = []
+    for (fromSun, along, func) in ((0, earth_along, earth_func), (1, sun_along, sun_func)):
+        inside = func < 0.0
+        for (moon, i) in zip(*_np.nonzero(inside[:, :-1] != inside[:, 1:])):
+            begins = bool(inside[moon, i+1])
+            # Search finds ascending roots, so flip the function for the beginning of a phenomenon.
+            context = (int(moon), fromSun, -1.0 if begins else +1.0)
+            time = astronomy.Search(_RefineFunction, context, times[int(i)], times[int(i)+1], 1.0)
+            if time is None:
+                continue
+            behind = along[moon, i] > 0.0
+            if fromSun:
+                phenomenon = JovianPhenomenon.Eclipse if behind else JovianPhenomenon.ShadowTransit
+            else:
+                phenomenon = JovianPhenomenon.Occultation if behind else JovianPhenomenon.Transit
+            events.append(JovianEvent(time, GalileanMoon(int(moon)), phenomenon, begins))
+    events.sort(key=lambda e: e.time.ut)
+    return events
+
+
+def JovianEvents(startTime: Time, stopTime: Time, stepMinutes: float = 10.0) -> Iterator[JovianEvent]:
+    """Generates the phenomena of Jupiter's Galilean moons in a range of time, in chronological order.
+
+    Each transit, shadow transit, occultation, and eclipse of Io, Europa,
+    Ganymede, and Callisto is reported as two events: one when it begins
+    and one when it ends. The times are when the events are seen from the
+    center of the Earth, accurate to about a second.
+
+    The range is scanned in steps of `stepMinutes`; a phenomenon that lasts
+    less than one step, such as a grazing transit, can be missed.
+    Events are generated a month at a time, so a long range can be
+    consumed without waiting for all of it to be calculated.
+
+    Parameters
+    ----------
+    startTime : Time
+        The beginning of the time range.
+    stopTime : Time
+        The end of the time range.
+    stepMinutes : float
+        The interval between samples of the coarse scan.
+
+    Returns
+    -------
+    generator of JovianEvent
+    """
+    if _np is None:
+        raise astronomy.NumpyRequiredError()
+    if stepMinutes <= 0.0:
+        raise astronomy.Error('JovianEvents step must be positive.')
+    step = stepMinutes / 1440.0
+    perChunk = max(2, int(_CHUNK_DAYS / step))
+    total = int(math.ceil((stopTime.ut - startTime.ut) / step))
+    first = 0
+    while first < total:
+        last = min(total, first + perChunk)
+        # Consecutive chunks share their boundary sample, so no sign change is lost between them.
+        ut = startTime.ut + step*_np.arange(first, last + 1, dtype=_np.float64)
+        ut[-1] = min(ut[-1], stopTime.ut)
+        for event in _ScanChunk(ut):
+            yield event
+        first = last